@@ -12,81 +12,283 @@ Prevents:
 
 import sqlite3
 import json
+import sys
 import time
 import threading
 from pathlib import Path
 from datetime import datetime
 from functools import wraps
-from collections import defaultdict
+from contextlib import contextmanager
+from collections import defaultdict, deque, OrderedDict
 from typing import Tuple, Optional
 
 # ============================================================================
 # CONNECTION POOL
 # ============================================================================
 
-class SQLiteConnectionPool:
-    """Thread-safe connection pool for SQLite database."""
+POOL_MAX_USES = 1000              # Recycle a connection after this many checkouts
+POOL_HEALTH_CHECK_IDLE = 30.0     # Ping connections idle longer than this (seconds) on acquire
+POOL_LEAK_SECONDS = 30.0          # Checkouts held longer than this are reported as leaks
+
+
+class DurationHistogram:
+    """Millisecond histogram with fixed buckets (not thread-safe; callers hold the pool lock)."""
+
+    BOUNDS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms: float):
+        i = 0
+        while i < len(self.BOUNDS_MS) and ms > self.BOUNDS_MS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.total += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def summary(self) -> dict:
+        labels = [f"<={b}ms" for b in self.BOUNDS_MS] + [f">{self.BOUNDS_MS[-1]}ms"]
+        return {
+            'count': self.total,
+            'mean_ms': round(self.sum_ms / self.total, 3) if self.total else 0.0,
+            'max_ms': round(self.max_ms, 3),
+            'buckets': dict(zip(labels, self.counts))
+        }
+
 
-    def __init__(self, db_path: str, pool_size: int = 10, timeout: float = 5.0):
+def _caller_name() -> str:
+    """module.function of the first frame outside this module and contextlib."""
+    frame = sys._getframe(1)
+    while frame and frame.f_globals.get('__name__') in (__name__, 'contextlib'):
+        frame = frame.f_back
+    if frame is None:
+        return 'unknown'
+    return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_name}"
+
+
+class SQLiteConnectionPool:
+    """
+    Thread-safe connection pool for SQLite database.
+
+    Waiters block on a Condition instead of polling. Connections are
+    recycled after max_uses checkouts or when released after an
+    sqlite3.Error, and connections that sat idle are pinged before being
+    handed out. Wait and checkout times are kept as histograms, per
+    caller, and checkouts held past leak_seconds are reported by
+    get_stats().
+
+        with pool.connection() as conn:
+            conn.execute(...)
+    """
+
+    def __init__(self, db_path: str, pool_size: int = 10, timeout: float = 5.0,
+                 max_uses: int = POOL_MAX_USES, leak_seconds: float = POOL_LEAK_SECONDS):
         self.db_path = db_path
         self.pool_size = pool_size
         self.timeout = timeout
-        self.connections = []
-        self.available = []
+        self.max_uses = max_uses
+        self.leak_seconds = leak_seconds
+
         self.lock = threading.Lock()
+        self.available_cond = threading.Condition(self.lock)
+        self.available = deque()   # (conn, last_released) - LIFO keeps hot connections hot
+        self.checked_out = {}      # id(conn) -> (conn, caller, acquired_at)
+        self.uses = {}             # id(conn) -> checkouts served
+        self.closed = False
+        self.connect_error = None  # Last reconnect failure, surfaced when nothing can be handed out
+
+        self.wait_histogram = DurationHistogram()
+        self.checkout_histogram = DurationHistogram()
+        self.callers = defaultdict(lambda: {'checkouts': 0, 'wait_ms': 0.0, 'held_ms': 0.0, 'max_held_ms': 0.0})
+        self.counters = {'timeouts': 0, 'recycled': 0, 'health_check_failures': 0, 'errors': 0}
 
         # Initialize pool
         for i in range(pool_size):
             try:
-                conn = sqlite3.connect(db_path, check_same_thread=False, timeout=timeout)
-                conn.row_factory = sqlite3.Row
-                self.connections.append(conn)
-                self.available.append(conn)
+                self.available.append((self._connect(), time.monotonic()))
             except Exception as e:
                 print(f"[POOL] Connection {i} initialization failed: {e}")
 
         print(f"[POOL] Initialized {len(self.available)}/{pool_size} connections")
 
-    def acquire(self, timeout: Optional[float] = None) -> sqlite3.Connection:
-        """Get connection from pool (waits if necessary)."""
-        timeout = timeout or self.timeout
-        start = time.time()
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=self.timeout)
+        conn.row_factory = sqlite3.Row
+        self.uses[id(conn)] = 0
+        return conn
 
-        while True:
-            with self.lock:
-                if self.available:
-                    conn = self.available.pop()
-                    return conn
+    def _discard(self, conn: sqlite3.Connection):
+        """Close conn and forget it (caller holds the lock)."""
+        self.uses.pop(id(conn), None)
+        try:
+            conn.close()
+        except:
+            pass
 
-            if time.time() - start > timeout:
-                raise TimeoutError(f"No available connections after {timeout}s")
+    def _healthy(self, conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
 
-            time.sleep(0.01)
+    def acquire(self, timeout: Optional[float] = None, caller: Optional[str] = None) -> sqlite3.Connection:
+        """Get connection from pool (waits if necessary)."""
+        timeout = timeout or self.timeout
+        caller = caller or _caller_name()
+        start = time.monotonic()
+        deadline = start + timeout
 
-    def release(self, conn: sqlite3.Connection):
-        """Return connection to pool."""
-        with self.lock:
-            if conn not in self.available:
-                self.available.append(conn)
+        with self.available_cond:
+            while True:
+                if self.closed:
+                    raise RuntimeError("Connection pool is closed")
+
+                if self.available:
+                    conn, released_at = self.available.pop()
+                    now = time.monotonic()
+                    if now - released_at > POOL_HEALTH_CHECK_IDLE and not self._healthy(conn):
+                        self.counters['health_check_failures'] += 1
+                        self._discard(conn)
+                        conn = self._replace()
+                        if conn is None:
+                            continue
+                    break
+
+                # Pool shrank after failed reconnects - grow back instead of waiting
+                if len(self.uses) < self.pool_size:
+                    conn = self._replace()
+                    if conn is not None:
+                        now = time.monotonic()
+                        break
+                    if not self.checked_out:
+                        # Nothing will ever be released to wait for
+                        raise RuntimeError(
+                            f"No connections available and reconnect failed: {self.connect_error}"
+                        ) from self.connect_error
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.counters['timeouts'] += 1
+                    leaks = self._leaks(time.monotonic())
+                    hint = f" (possible leaks: {leaks})" if leaks else ""
+                    raise TimeoutError(f"No available connections after {timeout}s{hint}")
+                self.available_cond.wait(remaining)
+
+            wait_ms = (now - start) * 1000
+            self.uses[id(conn)] += 1
+            self.checked_out[id(conn)] = (conn, caller, now)
+            self.wait_histogram.record(wait_ms)
+            metrics = self.callers[caller]
+            metrics['checkouts'] += 1
+            metrics['wait_ms'] += wait_ms
+            return conn
+
+    def _replace(self) -> Optional[sqlite3.Connection]:
+        """Open a replacement connection (caller holds the lock); None on failure."""
+        try:
+            return self._connect()
+        except Exception as e:
+            print(f"[POOL] Reconnect failed: {e}")
+            self.connect_error = e
+            return None
+
+    def release(self, conn: sqlite3.Connection, error: bool = False):
+        """Return connection to pool. Pass error=True after an sqlite3.Error to recycle it."""
+        with self.available_cond:
+            entry = self.checked_out.pop(id(conn), None)
+            if entry is None:
+                return  # Not ours, or already released
+
+            now = time.monotonic()
+            _, caller, acquired_at = entry
+            held_ms = (now - acquired_at) * 1000
+            self.checkout_histogram.record(held_ms)
+            metrics = self.callers[caller]
+            metrics['held_ms'] += held_ms
+            metrics['max_held_ms'] = max(metrics['max_held_ms'], held_ms)
+
+            if error:
+                self.counters['errors'] += 1
+
+            if self.closed:
+                self._discard(conn)
+                return
+
+            if error or self.uses.get(id(conn), 0) >= self.max_uses:
+                self.counters['recycled'] += 1
+                self._discard(conn)
+                conn = self._replace()
+                if conn is None:
+                    return
+
+            self.available.append((conn, now))
+            self.available_cond.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None, caller: Optional[str] = None):
+        """
+        Context manager: acquire, yield, release.
+
+        Any exception rolls back the open transaction; sqlite3.Error (or a
+        failed rollback) also recycles the connection.
+        """
+        conn = self.acquire(timeout, caller or _caller_name())
+        error = False
+        try:
+            yield conn
+        except BaseException as e:
+            error = isinstance(e, sqlite3.Error)
+            try:
+                conn.rollback()
+            except:
+                error = True
+            raise
+        finally:
+            self.release(conn, error=error)
+
+    def _leaks(self, now: float) -> list:
+        """Checkouts held longer than leak_seconds (caller holds the lock)."""
+        return [
+            {'caller': caller, 'held_seconds': round(now - acquired_at, 1)}
+            for _, caller, acquired_at in self.checked_out.values()
+            if now - acquired_at > self.leak_seconds
+        ]
 
     def close_all(self):
-        """Close all connections."""
-        with self.lock:
-            for conn in self.connections:
-                try:
-                    conn.close()
-                except:
-                    pass
-            self.connections.clear()
-            self.available.clear()
+        """Close all connections. Checked-out connections are closed when released."""
+        with self.available_cond:
+            self.closed = True
+            while self.available:
+                self._discard(self.available.pop()[0])
+            self.available_cond.notify_all()
 
     def get_stats(self) -> dict:
         """Get pool statistics."""
         with self.lock:
+            in_use = len(self.checked_out)
             return {
-                'total_connections': len(self.connections),
+                'total_connections': len(self.available) + in_use,
                 'available_connections': len(self.available),
-                'in_use': len(self.connections) - len(self.available)
+                'in_use': in_use,
+                **self.counters,
+                'wait_time': self.wait_histogram.summary(),
+                'checkout_duration': self.checkout_histogram.summary(),
+                'callers': {
+                    caller: {
+                        'checkouts': m['checkouts'],
+                        'mean_wait_ms': round(m['wait_ms'] / m['checkouts'], 3) if m['checkouts'] else 0.0,
+                        'mean_held_ms': round(m['held_ms'] / m['checkouts'], 3) if m['checkouts'] else 0.0,
+                        'max_held_ms': round(m['max_held_ms'], 3)
+                    }
+                    for caller, m in self.callers.items()
+                },
+                'leaks': self._leaks(time.monotonic())
             }
 
 
@@ -184,48 +386,207 @@ class RequestValidator:
 # RATE LIMITING
 # ============================================================================
 
-class RateLimiter:
-    """Rate limit API requests by client IP address."""
+RATE_LIMIT_MAX_KEYS = 100000     # Buckets kept in memory before LRU eviction
+RATE_LIMIT_PRUNE_INTERVAL = 60.0  # Seconds between sweeps for idle (refilled) buckets
+RATE_LIMIT_FAIL_OPEN = True       # Allow requests when the shared bucket DB stays locked
 
-    def __init__(self, max_requests: int = 100, window_seconds: int = 60):
-        self.max_requests = max_requests
-        self.window_seconds = window_seconds
-        self.requests = defaultdict(list)
+
+class MemoryRateLimitBackend:
+    """
+    Token buckets in process memory: key -> [tokens, updated_at].
+
+    Kept in LRU order so the map never exceeds max_keys; buckets that have
+    refilled completely carry no state and are swept out periodically.
+    """
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self.buckets = OrderedDict()
         self.lock = threading.Lock()
 
-    def is_allowed(self, ip: str) -> Tuple[bool, Optional[str]]:
-        """Check if request from IP is allowed."""
+    def take(self, key: str, capacity: float, rate: float, now: float) -> float:
+        """Refill, try to take one token; returns tokens left (negative if refused)."""
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = [capacity, now]
+                self.buckets[key] = bucket
+                if len(self.buckets) > self.max_keys:
+                    self.buckets.popitem(last=False)
+            else:
+                self.buckets.move_to_end(key)
+                bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return bucket[0]
+            return bucket[0] - 1
+
+    def peek(self, key: str, capacity: float, rate: float, now: float) -> float:
+        """Tokens currently available for key."""
         with self.lock:
-            now = time.time()
-            cutoff = now - self.window_seconds
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                return capacity
+            return min(capacity, bucket[0] + (now - bucket[1]) * rate)
 
-            # Clean old requests
-            self.requests[ip] = [t for t in self.requests[ip] if t > cutoff]
+    def prune(self, now: float, idle_seconds: float):
+        """Drop buckets untouched for idle_seconds (they would be full again)."""
+        with self.lock:
+            # LRU order: stop at the first recently used bucket
+            while self.buckets:
+                key, bucket = next(iter(self.buckets.items()))
+                if now - bucket[1] < idle_seconds:
+                    break
+                del self.buckets[key]
+
+    def size(self) -> int:
+        with self.lock:
+            return len(self.buckets)
 
-            # Check limit
-            if len(self.requests[ip]) >= self.max_requests:
-                return False, f"Rate limit exceeded ({self.max_requests}/{self.window_seconds}s)"
 
-            # Add request
-            self.requests[ip].append(now)
-            return True, None
+class SQLiteRateLimitBackend:
+    """
+    Token buckets in a shared SQLite file, so every worker process
+    (e.g. gunicorn workers) enforces one limit. Each take() is a single
+    BEGIN IMMEDIATE transaction.
+
+    If the database stays locked past the connect timeout, take() admits
+    the request when fail_open is set and refuses it otherwise, instead
+    of surfacing sqlite3.OperationalError as a server error.
+    """
+
+    def __init__(self, db_path: str, fail_open: bool = RATE_LIMIT_FAIL_OPEN):
+        self.db_path = db_path
+        self.fail_open = fail_open
+        self.lock_failures = 0
+        self.local = threading.local()
+        conn = self._conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS rate_buckets (
+                key TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated REAL NOT NULL
+            )
+        """)
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_rate_buckets_updated ON rate_buckets(updated)')
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self.local.conn = conn
+        return conn
+
+    def take(self, key: str, capacity: float, rate: float, now: float) -> float:
+        conn = self._conn()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+        except sqlite3.OperationalError:
+            return self._locked()
+        try:
+            row = conn.execute('SELECT tokens, updated FROM rate_buckets WHERE key = ?', (key,)).fetchone()
+            tokens = capacity if row is None else min(capacity, row[0] + (now - row[1]) * rate)
+            left = tokens - 1
+            if left >= 0:
+                tokens = left
+            conn.execute(
+                'INSERT OR REPLACE INTO rate_buckets (key, tokens, updated) VALUES (?, ?, ?)',
+                (key, tokens, now)
+            )
+            conn.execute('COMMIT')
+        except sqlite3.OperationalError:
+            conn.execute('ROLLBACK')
+            return self._locked()
+        except:
+            conn.execute('ROLLBACK')
+            raise
+        return left
+
+    def _locked(self) -> float:
+        """take() result when the bucket DB could not be locked in time."""
+        self.lock_failures += 1
+        return 0.0 if self.fail_open else -1.0
+
+    def peek(self, key: str, capacity: float, rate: float, now: float) -> float:
+        row = self._conn().execute('SELECT tokens, updated FROM rate_buckets WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return capacity
+        return min(capacity, row[0] + (now - row[1]) * rate)
+
+    def prune(self, now: float, idle_seconds: float):
+        try:
+            self._conn().execute('DELETE FROM rate_buckets WHERE updated < ?', (now - idle_seconds,))
+        except sqlite3.OperationalError:
+            pass  # Locked - the next sweep gets them
+
+    def size(self) -> int:
+        return self._conn().execute('SELECT COUNT(*) FROM rate_buckets').fetchone()[0]
 
-    def get_stats(self, ip: str) -> dict:
-        """Get rate limit stats for IP."""
+
+class RateLimiter:
+    """
+    Rate limit API requests by client IP address (token bucket, O(1) per check).
+
+    Each IP gets one bucket of max_requests tokens refilled at
+    max_requests per window_seconds, shared by every route. Routes listed
+    in route_limits get their own (ip, route) bucket with those
+    (max_requests, window_seconds) instead. Pass backend=
+    SQLiteRateLimitBackend(path) to share buckets across processes.
+    """
+
+    def __init__(self, max_requests: int = 100, window_seconds: int = 60,
+                 route_limits: Optional[dict] = None, backend=None):
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.route_limits = route_limits or {}
+        self.backend = backend or MemoryRateLimitBackend()
+        self.lock = threading.Lock()
+        self.last_prune = time.time()
+
+    def _limits(self, route: Optional[str]) -> Tuple[int, int]:
+        return self.route_limits.get(route, (self.max_requests, self.window_seconds))
+
+    def _key(self, ip: str, route: Optional[str]) -> str:
+        return f"{ip}|{route}" if route in self.route_limits else ip
+
+    def _maybe_prune(self, now: float):
         with self.lock:
-            now = time.time()
-            cutoff = now - self.window_seconds
-            count = sum(1 for t in self.requests[ip] if t > cutoff)
-            remaining = max(0, self.max_requests - count)
-            reset_in = self.window_seconds - (now % self.window_seconds)
+            if now - self.last_prune < RATE_LIMIT_PRUNE_INTERVAL:
+                return
+            self.last_prune = now
+        # A bucket idle for its longest window has refilled - nothing to remember
+        longest = max([self.window_seconds] + [w for _, w in self.route_limits.values()])
+        self.backend.prune(now, longest)
+
+    def is_allowed(self, ip: str, route: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+        """Check if request from IP (to route) is allowed."""
+        now = time.time()
+        self._maybe_prune(now)
+
+        max_requests, window = self._limits(route)
+        left = self.backend.take(self._key(ip, route), max_requests, max_requests / window, now)
+        if left < 0:
+            return False, f"Rate limit exceeded ({max_requests}/{window}s)"
+        return True, None
 
-            return {
-                'requests': count,
-                'max_requests': self.max_requests,
-                'remaining': remaining,
-                'window_seconds': self.window_seconds,
-                'reset_in': int(reset_in)
-            }
+    def get_stats(self, ip: str, route: Optional[str] = None) -> dict:
+        """Get rate limit stats for IP (and route)."""
+        max_requests, window = self._limits(route)
+        rate = max_requests / window
+        tokens = self.backend.peek(self._key(ip, route), max_requests, rate, time.time())
+        remaining = max(0, int(tokens))
+
+        return {
+            'requests': max_requests - remaining,
+            'max_requests': max_requests,
+            'remaining': remaining,
+            'window_seconds': window,
+            'reset_in': int((max_requests - tokens) / rate + 0.999)
+        }
 
 
 # ============================================================================
@@ -242,8 +603,9 @@ def require_validation(f):
         # Get client IP
         ip = request.remote_addr or '127.0.0.1'
 
-        # Check rate limit
-        allowed, error = _rate_limiter.is_allowed(ip)
+        # Check rate limit (routes with an override get their own bucket)
+        route = request.endpoint or request.path
+        allowed, error = _rate_limiter.is_allowed(ip, route)
         if not allowed:
             return {
                 'error': error,
@@ -251,7 +613,7 @@ def require_validation(f):
             }, 429
 
         # Get rate limit stats for response headers
-        stats = _rate_limiter.get_stats(ip)
+        stats = _rate_limiter.get_stats(ip, route)
 
         # Call decorated function
         response = f(*args, **kwargs)
@@ -285,6 +647,12 @@ def require_validation(f):
 _pool = None
 _rate_limiter = None
 
+# Per-route overrides: endpoint name -> (max_requests, window_seconds)
+RATE_LIMIT_ROUTES = {}
+
+# SQLite file shared by all workers; None keeps buckets in process memory
+RATE_LIMIT_DB = None
+
 
 def init_api_infrastructure(app=None):
     """Initialize API infrastructure (call once at startup)."""
@@ -295,12 +663,15 @@ def init_api_infrastructure(app=None):
     # Initialize connection pool
     _pool = SQLiteConnectionPool(db_path, pool_size=10, timeout=5.0)
 
-    # Initialize rate limiter (100 requests per 60 seconds)
-    _rate_limiter = RateLimiter(max_requests=100, window_seconds=60)
+    # Initialize rate limiter (100 requests per 60 seconds, shared across
+    # worker processes when RATE_LIMIT_DB is set)
+    backend = SQLiteRateLimitBackend(RATE_LIMIT_DB) if RATE_LIMIT_DB else None
+    _rate_limiter = RateLimiter(max_requests=100, window_seconds=60,
+                                route_limits=RATE_LIMIT_ROUTES, backend=backend)
 
     print("\n[API] Infrastructure Initialized")
     print(f"  - Connection pool size: 10")
-    print(f"  - Rate limit: 100 requests/60s")
+    print(f"  - Rate limit: 100 requests/60s ({'shared: ' + RATE_LIMIT_DB if RATE_LIMIT_DB else 'per process'})")
     print(f"  - Request validation: ENABLED")
     print(f"  - Connection pooling: ENABLED\n")
 
@@ -326,11 +697,11 @@ def get_pool_stats() -> dict:
     return _pool.get_stats()
 
 
-def get_rate_limiter_stats(ip: str) -> dict:
-    """Get rate limiter stats for IP."""
+def get_rate_limiter_stats(ip: str, route: Optional[str] = None) -> dict:
+    """Get rate limiter stats for IP (and route)."""
     if _rate_limiter is None:
         return {}
-    return _rate_limiter.get_stats(ip)
+    return _rate_limiter.get_stats(ip, route)
 
 
 # ============================================================================
@@ -4,9 +4,9 @@ MULTILAYER CACHING SYSTEM - CYCLOTRON ATOMS
 Cache-then-DB pattern for 4,392 knowledge graph atoms.
 
 Architecture:
-- Layer 1: In-Memory Cache (LRU, 256 hot atoms) - 10ms response
-- Layer 2: Filesystem Cache (JSON, 1000 warm atoms) - 50ms response
-- Layer 3: Database (SQLite, all 4,392 atoms) - 500ms response
+- Layer 1: In-Memory Cache (lock-striped LRU, 16MB, 1 hour TTL) - 10ms response
+- Layer 2: Filesystem Cache (single SQLite file, 1000 warm atoms / 64MB, LRU) - 50ms response
+- Layer 3: Database (SQLite via SQLiteConnectionPool, all 4,392 atoms) - 500ms response
 
 Expected Performance:
 - Hit rates: Memory 60% → Filesystem 25% → Database 15%
@@ -15,45 +15,412 @@ Expected Performance:
 """
 
 import json
+import re
 import sqlite3
 import time
-import hashlib
 from pathlib import Path
 from collections import OrderedDict
+from concurrent.futures import Future
 from datetime import datetime, timedelta
 from threading import Lock
 
+from API_INFRASTRUCTURE import SQLiteConnectionPool
+
 # Configuration
 CACHE_DIR = Path("C:/Users/dwrek/.consciousness/cache")
 CACHE_DIR.mkdir(exist_ok=True)
 
-MEMORY_CACHE_SIZE = 256
+MEMORY_CACHE_MAX_BYTES = 16 * 1024 * 1024  # JSON size of cached atoms
+MEMORY_CACHE_SHARDS = 16
 FILESYSTEM_CACHE_SIZE = 1000
+FILESYSTEM_CACHE_MAX_BYTES = 64 * 1024 * 1024
 CACHE_TTL_SECONDS = 3600  # 1 hour
 
+WARM_CACHE_DB = CACHE_DIR / "atoms_warm.db"
+SQLITE_MAX_VARIABLES = 500  # IN (...) chunk size, well under SQLite's limit
+
 DB_PATH = "C:/Users/dwrek/.consciousness/cyclotron_core/atoms.db"
+DB_POOL_SIZE = 4
+SEARCH_CACHE_MAX_BYTES = 8 * 1024 * 1024
+
+# FTS5 index over atoms.content/tags plus a generation counter; the same
+# triggers keep both current, so cached search results are invalidated by
+# any write to atoms.
+ATOM_SEARCH_SCHEMA = '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS atoms_fts USING fts5(
+        content, tags,
+        content='atoms',
+        tokenize='unicode61'
+    );
+
+    CREATE TABLE IF NOT EXISTS atoms_generation (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        generation INTEGER NOT NULL
+    );
+    INSERT OR IGNORE INTO atoms_generation (id, generation) VALUES (1, 0);
+
+    CREATE TRIGGER IF NOT EXISTS atoms_fts_insert AFTER INSERT ON atoms BEGIN
+        INSERT INTO atoms_fts (rowid, content, tags) VALUES (NEW.rowid, NEW.content, NEW.tags);
+        UPDATE atoms_generation SET generation = generation + 1 WHERE id = 1;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS atoms_fts_delete AFTER DELETE ON atoms BEGIN
+        INSERT INTO atoms_fts (atoms_fts, rowid, content, tags) VALUES ('delete', OLD.rowid, OLD.content, OLD.tags);
+        UPDATE atoms_generation SET generation = generation + 1 WHERE id = 1;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS atoms_fts_update AFTER UPDATE ON atoms BEGIN
+        INSERT INTO atoms_fts (atoms_fts, rowid, content, tags) VALUES ('delete', OLD.rowid, OLD.content, OLD.tags);
+        INSERT INTO atoms_fts (rowid, content, tags) VALUES (NEW.rowid, NEW.content, NEW.tags);
+        UPDATE atoms_generation SET generation = generation + 1 WHERE id = 1;
+    END;
+'''
+
+
+class MemoryShard:
+    """One lock-protected LRU segment of MemoryCache."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.lock = Lock()
+        self.entries = OrderedDict()  # atom_id -> (atom, size, expires_at)
+        self.bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, atom_id: str, now: float):
+        with self.lock:
+            entry = self.entries.get(atom_id)
+            if entry is None:
+                return None
+            if entry[2] <= now:
+                del self.entries[atom_id]
+                self.bytes -= entry[1]
+                self.expirations += 1
+                return None
+            self.entries.move_to_end(atom_id)
+            return entry[0]
+
+    def put(self, atom_id: str, atom: dict, size: int, expires_at: float):
+        with self.lock:
+            old = self.entries.pop(atom_id, None)
+            if old is not None:
+                self.bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self.entries[atom_id] = (atom, size, expires_at)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.bytes -= evicted[1]
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+
+class MemoryCache:
+    """
+    Layer 1: lock-striped in-memory LRU with per-entry TTL.
+
+    Atom ids hash to one of MEMORY_CACHE_SHARDS shards, each with its own
+    lock, so concurrent request threads only contend when they touch the
+    same shard. Each shard is bounded by its share of max_bytes (measured
+    as the atom's JSON size) and drops entries older than ttl on read.
+    """
+
+    def __init__(self, max_bytes: int = MEMORY_CACHE_MAX_BYTES,
+                 ttl: float = CACHE_TTL_SECONDS, shards: int = MEMORY_CACHE_SHARDS):
+        self.ttl = ttl
+        self.shards = [MemoryShard(max_bytes // shards) for _ in range(shards)]
+
+    def _shard(self, atom_id: str) -> MemoryShard:
+        return self.shards[hash(atom_id) % len(self.shards)]
+
+    def get(self, atom_id: str):
+        """Return the cached atom, or None if absent or expired."""
+        return self._shard(atom_id).get(atom_id, time.time())
+
+    def put(self, atom_id: str, atom: dict):
+        size = len(json.dumps(atom, separators=(',', ':')))
+        self._shard(atom_id).put(atom_id, atom, size, time.time() + self.ttl)
+
+    def clear(self):
+        for shard in self.shards:
+            shard.clear()
+
+    def get_stats(self) -> dict:
+        entries = size = evictions = expirations = 0
+        for shard in self.shards:
+            with shard.lock:
+                entries += len(shard.entries)
+                size += shard.bytes
+                evictions += shard.evictions
+                expirations += shard.expirations
+        return {
+            'entries': entries,
+            'bytes': size,
+            'evictions': evictions,
+            'expirations': expirations
+        }
+
+
+class WarmStore:
+    """
+    Layer 2: single-file SQLite key/value store for warm atoms.
+
+    One table instead of one JSON file per atom. Entry count and byte
+    total are tracked in memory, so stats are O(1). Once either
+    FILESYSTEM_CACHE_SIZE or FILESYSTEM_CACHE_MAX_BYTES is exceeded,
+    the least recently read entries are evicted. Reads do not write:
+    access times are buffered and flushed with the next put.
+    """
+
+    def __init__(self, db_path: Path = WARM_CACHE_DB,
+                 max_entries: int = FILESYSTEM_CACHE_SIZE,
+                 max_bytes: int = FILESYSTEM_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.lock = Lock()
+        self.pending_touch = {}
+        self.evictions = 0
+
+        self.conn = sqlite3.connect(str(db_path), check_same_thread=False, timeout=5)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS warm_atoms (
+                atom_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                accessed REAL NOT NULL
+            )
+        """)
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_warm_atoms_accessed ON warm_atoms(accessed)')
+        self.conn.commit()
+
+        # One scan at startup; kept current on every put/evict afterwards
+        self.count, self.bytes = self.conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM warm_atoms'
+        ).fetchone()
+
+    def get(self, atom_id: str):
+        """Return the cached atom or None."""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT data FROM warm_atoms WHERE atom_id = ?', (atom_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.pending_touch[atom_id] = time.time()
+        return json.loads(row[0])
+
+    def get_many(self, atom_ids: list) -> dict:
+        """Return {atom_id: atom} for the ids present, in chunked IN queries."""
+        found = {}
+        with self.lock:
+            for i in range(0, len(atom_ids), SQLITE_MAX_VARIABLES):
+                chunk = atom_ids[i:i + SQLITE_MAX_VARIABLES]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT atom_id, data FROM warm_atoms WHERE atom_id IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                found.update(rows)
+            now = time.time()
+            for atom_id in found:
+                self.pending_touch[atom_id] = now
+        return {atom_id: json.loads(data) for atom_id, data in found.items()}
+
+    def put(self, atom_id: str, atom: dict):
+        """Insert or replace one atom."""
+        self.put_many([(atom_id, atom)])
+
+    def put_many(self, items: list):
+        """Insert or replace (atom_id, atom) pairs in one transaction, then evict."""
+        if not items:
+            return
+        now = time.time()
+        rows = {}
+        for atom_id, atom in items:
+            data = json.dumps(atom, separators=(',', ':'))
+            rows[atom_id] = (atom_id, data, len(data.encode('utf-8')), now)
+
+        with self.lock:
+            ids = list(rows)
+            for i in range(0, len(ids), SQLITE_MAX_VARIABLES):
+                chunk = ids[i:i + SQLITE_MAX_VARIABLES]
+                placeholders = ','.join('?' * len(chunk))
+                for _, size in self.conn.execute(
+                    f"SELECT atom_id, size FROM warm_atoms WHERE atom_id IN ({placeholders})",
+                    chunk
+                ):
+                    self.count -= 1
+                    self.bytes -= size
+
+            self._flush_touches()
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO warm_atoms (atom_id, data, size, accessed) VALUES (?, ?, ?, ?)',
+                rows.values()
+            )
+            self.count += len(rows)
+            self.bytes += sum(row[2] for row in rows.values())
+            self._evict()
+            self.conn.commit()
+
+    def _flush_touches(self):
+        """Write buffered access times (caller holds the lock)."""
+        if self.pending_touch:
+            self.conn.executemany(
+                'UPDATE warm_atoms SET accessed = ? WHERE atom_id = ?',
+                [(t, atom_id) for atom_id, t in self.pending_touch.items()]
+            )
+            self.pending_touch.clear()
+
+    def _evict(self):
+        """Drop least recently read entries once over either bound (caller holds the lock)."""
+        if self.count <= self.max_entries and self.bytes <= self.max_bytes:
+            return
+
+        # Evict down to 90% of both bounds so a full store doesn't evict on every put
+        target_entries = self.max_entries * 9 // 10
+        target_bytes = self.max_bytes * 9 // 10
+        victims = []
+        freed = 0
+        cursor = self.conn.execute('SELECT atom_id, size FROM warm_atoms ORDER BY accessed')
+        for atom_id, size in cursor:
+            if self.count - len(victims) <= target_entries and self.bytes - freed <= target_bytes:
+                break
+            victims.append((atom_id,))
+            freed += size
+        cursor.close()
+
+        self.conn.executemany('DELETE FROM warm_atoms WHERE atom_id = ?', victims)
+        self.count -= len(victims)
+        self.bytes -= freed
+        self.evictions += len(victims)
+
+    def clear(self):
+        """Remove every entry."""
+        with self.lock:
+            self.conn.execute('DELETE FROM warm_atoms')
+            self.conn.commit()
+            self.pending_touch.clear()
+            self.count, self.bytes = 0, 0
+
+    def get_stats(self) -> dict:
+        """O(1) size statistics."""
+        with self.lock:
+            return {
+                'entries': self.count,
+                'bytes': self.bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions
+            }
+
+
+class SearchCache:
+    """
+    In-memory search results keyed by (query, limit), LRU-bounded by JSON
+    size. Each entry remembers the atoms generation it was computed at and
+    is discarded once the generation moves on.
+    """
+
+    def __init__(self, max_bytes: int = SEARCH_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.lock = Lock()
+        self.entries = OrderedDict()  # key -> (generation, results, size)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: tuple, generation: int):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] != generation:
+                del self.entries[key]
+                self.bytes -= entry[2]
+                self.invalidations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: tuple, generation: int, results: list):
+        size = len(json.dumps(results, separators=(',', ':')))
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[2]
+            if size > self.max_bytes:
+                return
+            self.entries[key] = (generation, results, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.bytes -= evicted[2]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'size_mb': round(self.bytes / (1024*1024), 2),
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations
+            }
 
 
 class AtomCache:
     """Three-layer caching system for Cyclotron atoms."""
 
     def __init__(self):
-        self.memory_cache = OrderedDict()  # Layer 1: Memory (LRU)
-        self.filesystem_cache_dir = CACHE_DIR / "atoms_warm"
-        self.filesystem_cache_dir.mkdir(exist_ok=True)
-
+        self.memory_cache = MemoryCache()  # Layer 1: Memory (sharded LRU + TTL)
+        self.warm_store = WarmStore()       # Layer 2: Filesystem (single SQLite file)
+        self.db_pool = SQLiteConnectionPool(DB_PATH, pool_size=DB_POOL_SIZE, timeout=5.0)  # Layer 3
+        self.search_cache = SearchCache()
+        self.fts_enabled = self._ensure_search_index()
+        self._purge_search_files()
+
+        # Guards stats and in-flight database fetches
         self.lock = Lock()
-        self.stats = {
+        self.inflight = {}  # atom_id -> Future for the fetch in progress
+        self.stats = self._new_stats()
+
+        self._load_metadata()
+        print(f"[CACHE] Initialized: Memory({MEMORY_CACHE_MAX_BYTES // (1024*1024)}MB) + "
+              f"Filesystem({FILESYSTEM_CACHE_SIZE}) + Database")
+
+    @staticmethod
+    def _new_stats() -> dict:
+        return {
             'memory_hits': 0,
             'filesystem_hits': 0,
             'database_hits': 0,
             'misses': 0,
             'total_requests': 0,
+            'database_fetches': 0,
+            'coalesced_fetches': 0,
             'started': datetime.now().isoformat()
         }
 
-        self._load_metadata()
-        print("[CACHE] Initialized: Memory(256) + Filesystem(1000) + Database")
+    def _record(self, **counts):
+        """Atomically add to stats counters."""
+        with self.lock:
+            for key, n in counts.items():
+                self.stats[key] += n
 
     def _load_metadata(self):
         """Load cache metadata on startup."""
@@ -69,66 +436,78 @@ class AtomCache:
 
     def get(self, atom_id: str) -> dict:
         """Get atom from cache (3-layer lookup)."""
-        with self.lock:
-            self.stats['total_requests'] += 1
-
         # Layer 1: Memory (fastest - 10ms)
-        if atom_id in self.memory_cache:
-            atom = self.memory_cache.pop(atom_id)
-            self.memory_cache[atom_id] = atom  # LRU refresh
-            self.stats['memory_hits'] += 1
+        atom = self.memory_cache.get(atom_id)
+        if atom is not None:
+            self._record(total_requests=1, memory_hits=1)
             return atom
 
         # Layer 2: Filesystem (warm - 50ms)
-        fs_path = self.filesystem_cache_dir / f"{atom_id}.json"
-        if fs_path.exists():
-            try:
-                with open(fs_path) as f:
-                    atom = json.load(f)
-                self._add_to_memory(atom_id, atom)
-                self.stats['filesystem_hits'] += 1
-                return atom
-            except:
-                pass
+        try:
+            atom = self.warm_store.get(atom_id)
+        except Exception as e:
+            print(f"[CACHE] Filesystem read error: {e}")
+            atom = None
+        if atom is not None:
+            self.memory_cache.put(atom_id, atom)
+            self._record(total_requests=1, filesystem_hits=1)
+            return atom
 
         # Layer 3: Database (cold - 500ms)
-        atom = self._fetch_from_database(atom_id)
+        atom = self._load_single_flight(atom_id)
         if atom:
-            self._add_to_memory(atom_id, atom)
-            self._add_to_filesystem(atom_id, atom)
-            self.stats['database_hits'] += 1
+            self._record(total_requests=1, database_hits=1)
             return atom
 
-        self.stats['misses'] += 1
+        self._record(total_requests=1, misses=1)
         return None
 
-    def _add_to_memory(self, atom_id: str, atom: dict):
-        """Add to memory cache with LRU eviction."""
+    def _load_single_flight(self, atom_id: str) -> dict:
+        """
+        Fetch atom_id from the database, at most once at a time.
+
+        Threads that miss on an id already being fetched wait for that
+        fetch instead of issuing their own query.
+        """
         with self.lock:
-            if len(self.memory_cache) >= MEMORY_CACHE_SIZE:
-                # Evict oldest (least recently used)
-                self.memory_cache.popitem(last=False)
-            self.memory_cache[atom_id] = atom
+            future = self.inflight.get(atom_id)
+            leader = future is None
+            if leader:
+                future = Future()
+                self.inflight[atom_id] = future
+                self.stats['database_fetches'] += 1
+            else:
+                self.stats['coalesced_fetches'] += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            atom = self._fetch_from_database(atom_id)
+            if atom:
+                self.memory_cache.put(atom_id, atom)
+                self._add_to_filesystem(atom_id, atom)
+            future.set_result(atom)
+            return atom
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                del self.inflight[atom_id]
 
     def _add_to_filesystem(self, atom_id: str, atom: dict):
         """Add to filesystem warm cache."""
         try:
-            fs_path = self.filesystem_cache_dir / f"{atom_id}.json"
-            with open(fs_path, 'w') as f:
-                json.dump(atom, f, separators=(',', ':'))
+            self.warm_store.put(atom_id, atom)
         except Exception as e:
             print(f"[CACHE] Filesystem write error: {e}")
 
     def _fetch_from_database(self, atom_id: str) -> dict:
         """Fetch from SQLite database."""
         try:
-            conn = sqlite3.connect(DB_PATH, timeout=5)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-
-            cursor.execute("SELECT * FROM atoms WHERE id = ?", (atom_id,))
-            row = cursor.fetchone()
-            conn.close()
+            with self.db_pool.connection() as conn:
+                row = conn.execute("SELECT * FROM atoms WHERE id = ?", (atom_id,)).fetchone()
 
             if row:
                 return dict(row)
@@ -138,105 +517,145 @@ class AtomCache:
             return None
 
     def batch_get(self, atom_ids: list) -> list:
-        """Get multiple atoms efficiently (batch query)."""
-        results = []
-        db_hits = []
-
-        # Try memory and filesystem first
-        for atom_id in atom_ids:
-            if atom_id in self.memory_cache:
-                atom = self.memory_cache[atom_id]
-                self.memory_cache.move_to_end(atom_id)  # LRU
-                results.append(atom)
-                self.stats['memory_hits'] += 1
-            elif (self.filesystem_cache_dir / f"{atom_id}.json").exists():
-                try:
-                    fs_path = self.filesystem_cache_dir / f"{atom_id}.json"
-                    with open(fs_path) as f:
-                        atom = json.load(f)
-                    results.append(atom)
-                    self._add_to_memory(atom_id, atom)  # Promote
-                    self.stats['filesystem_hits'] += 1
-                except:
-                    db_hits.append(atom_id)
+        """Get multiple atoms efficiently (batch query), in request order."""
+        found = {}
+        warm_misses = []
+
+        # Try memory first
+        for atom_id in dict.fromkeys(atom_ids):
+            atom = self.memory_cache.get(atom_id)
+            if atom is not None:
+                found[atom_id] = atom
             else:
-                db_hits.append(atom_id)
+                warm_misses.append(atom_id)
+        memory_hits = len(found)
+
+        # One batched read from the warm store
+        db_hits = warm_misses
+        if warm_misses:
+            try:
+                warm = self.warm_store.get_many(warm_misses)
+            except Exception as e:
+                print(f"[CACHE] Filesystem read error: {e}")
+                warm = {}
+            for atom_id, atom in warm.items():
+                found[atom_id] = atom
+                self.memory_cache.put(atom_id, atom)  # Promote
+            db_hits = [atom_id for atom_id in warm_misses if atom_id not in warm]
 
         # Batch fetch from database
+        atoms = []
         if db_hits:
             atoms = self._batch_fetch_database(db_hits)
             for atom in atoms:
-                results.append(atom)
-                self._add_to_memory(atom['id'], atom)
-                self._add_to_filesystem(atom['id'], atom)
-            self.stats['database_hits'] += len(atoms)
-
-        self.stats['total_requests'] += len(atom_ids)
-        return results
+                found[atom['id']] = atom
+                self.memory_cache.put(atom['id'], atom)
+            try:
+                self.warm_store.put_many([(atom['id'], atom) for atom in atoms])
+            except Exception as e:
+                print(f"[CACHE] Filesystem write error: {e}")
+
+        unique = memory_hits + len(warm_misses)
+        self._record(
+            total_requests=unique,
+            memory_hits=memory_hits,
+            filesystem_hits=len(warm_misses) - len(db_hits),
+            database_hits=len(atoms),
+            misses=len(db_hits) - len(atoms),
+            database_fetches=1 if db_hits else 0
+        )
+        return [found[atom_id] for atom_id in atom_ids if atom_id in found]
 
     def _batch_fetch_database(self, atom_ids: list) -> list:
-        """Batch fetch from database (100x faster than individual queries)."""
+        """
+        Batch fetch from database (100x faster than individual queries).
+
+        IN lists are chunked to stay under SQLite's variable limit; rows
+        come back in atom_ids order.
+        """
         if not atom_ids:
             return []
 
         try:
-            conn = sqlite3.connect(DB_PATH, timeout=5)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-
-            placeholders = ','.join('?' * len(atom_ids))
-            cursor.execute(
-                f"SELECT * FROM atoms WHERE id IN ({placeholders})",
-                atom_ids
-            )
-            rows = cursor.fetchall()
-            conn.close()
-
-            return [dict(row) for row in rows]
+            by_id = {}
+            with self.db_pool.connection() as conn:
+                for i in range(0, len(atom_ids), SQLITE_MAX_VARIABLES):
+                    chunk = atom_ids[i:i + SQLITE_MAX_VARIABLES]
+                    placeholders = ','.join('?' * len(chunk))
+                    for row in conn.execute(f"SELECT * FROM atoms WHERE id IN ({placeholders})", chunk):
+                        by_id[row['id']] = dict(row)
+
+            return [by_id[atom_id] for atom_id in dict.fromkeys(atom_ids) if atom_id in by_id]
         except Exception as e:
             print(f"[CACHE] Batch fetch error: {e}")
             return []
 
-    def search(self, query: str, limit: int = 10) -> list:
-        """Search atoms with caching."""
-        # Check if we have recent search results cached
-        search_cache_file = CACHE_DIR / f"search_{hashlib.md5(query.encode()).hexdigest()}.json"
-
-        if search_cache_file.exists():
-            try:
-                with open(search_cache_file) as f:
-                    cached = json.load(f)
-                    if cached['cached_at'] > (time.time() - 3600):  # Cache 1 hour
-                        return cached['results']
-            except:
-                pass
-
-        # Search database
+    def _ensure_search_index(self) -> bool:
+        """Create atoms_fts + triggers (building the index once); False if unavailable."""
         try:
-            conn = sqlite3.connect(DB_PATH, timeout=5)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                SELECT * FROM atoms
-                WHERE content LIKE ? OR tags LIKE ?
-                LIMIT ?
-            """, (f"%{query}%", f"%{query}%", limit))
-
-            results = [dict(row) for row in cursor.fetchall()]
-            conn.close()
+            with self.db_pool.connection() as conn:
+                # Last object the schema script creates
+                exists = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'atoms_fts_update'"
+                ).fetchone()
+                conn.executescript(ATOM_SEARCH_SCHEMA)
+                if not exists:
+                    conn.execute("INSERT INTO atoms_fts (atoms_fts) VALUES ('rebuild')")
+                conn.commit()
+            return True
+        except Exception as e:
+            print(f"[CACHE] Search index unavailable, using LIKE scan: {e}")
+            return False
 
-            # Cache search results
+    def _purge_search_files(self):
+        """Remove per-query JSON files left by the old on-disk search cache."""
+        for f in CACHE_DIR.glob("search_*.json"):
             try:
-                with open(search_cache_file, 'w') as f:
-                    json.dump({
-                        'query': query,
-                        'results': results,
-                        'cached_at': time.time()
-                    }, f)
+                f.unlink()
             except:
                 pass
 
+    @staticmethod
+    def _match_expression(query: str) -> str:
+        """Quote query terms as one FTS5 phrase; the last term matches as a prefix."""
+        terms = re.findall(r'\w+', query)
+        if not terms:
+            return ''
+        return '"' + ' '.join(terms) + '"*'
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """Search atoms (FTS5 ranked) with a generation-invalidated result cache."""
+        try:
+            with self.db_pool.connection() as conn:
+                if not self.fts_enabled:
+                    cursor = conn.execute("""
+                        SELECT * FROM atoms
+                        WHERE content LIKE ? OR tags LIKE ?
+                        LIMIT ?
+                    """, (f"%{query}%", f"%{query}%", limit))
+                    return [dict(row) for row in cursor.fetchall()]
+
+                generation = conn.execute(
+                    "SELECT generation FROM atoms_generation WHERE id = 1"
+                ).fetchone()[0]
+                key = (query, limit)
+                results = self.search_cache.get(key, generation)
+                if results is not None:
+                    return results
+
+                match = self._match_expression(query)
+                if not match:
+                    return []
+                cursor = conn.execute("""
+                    SELECT atoms.* FROM atoms_fts
+                    JOIN atoms ON atoms.rowid = atoms_fts.rowid
+                    WHERE atoms_fts MATCH ?
+                    ORDER BY rank
+                    LIMIT ?
+                """, (match, limit))
+                results = [dict(row) for row in cursor.fetchall()]
+
+            self.search_cache.put(key, generation, results)
             return results
         except Exception as e:
             print(f"[CACHE] Search error: {e}")
@@ -244,48 +663,49 @@ class AtomCache:
 
     def get_stats(self) -> dict:
         """Get cache statistics."""
-        total = self.stats['total_requests']
+        with self.lock:
+            stats = dict(self.stats)
+        memory = self.memory_cache.get_stats()
+        warm = self.warm_store.get_stats()
+
+        total = stats['total_requests']
         if total == 0:
             hit_rate = 0
         else:
-            hits = (self.stats['memory_hits'] +
-                   self.stats['filesystem_hits'] +
-                   self.stats['database_hits'])
+            hits = (stats['memory_hits'] +
+                   stats['filesystem_hits'] +
+                   stats['database_hits'])
             hit_rate = round(hits / total * 100, 1)
 
-        with self.lock:
-            return {
-                'memory_hits': self.stats['memory_hits'],
-                'filesystem_hits': self.stats['filesystem_hits'],
-                'database_hits': self.stats['database_hits'],
-                'misses': self.stats['misses'],
-                'total_requests': total,
-                'hit_rate': hit_rate,
-                'memory_size': len(self.memory_cache),
-                'filesystem_cache_files': len(list(self.filesystem_cache_dir.glob("*.json"))),
-                'memory_cache_size_mb': round(sum(
-                    len(json.dumps(v)) for v in self.memory_cache.values()
-                ) / (1024*1024), 2),
-                'timestamp': datetime.now().isoformat()
-            }
+        return {
+            'memory_hits': stats['memory_hits'],
+            'filesystem_hits': stats['filesystem_hits'],
+            'database_hits': stats['database_hits'],
+            'misses': stats['misses'],
+            'total_requests': total,
+            'hit_rate': hit_rate,
+            'database_fetches': stats['database_fetches'],
+            'coalesced_fetches': stats['coalesced_fetches'],
+            'memory_size': memory['entries'],
+            'memory_cache_size_mb': round(memory['bytes'] / (1024*1024), 2),
+            'memory_evictions': memory['evictions'],
+            'memory_expirations': memory['expirations'],
+            'filesystem_cache_files': warm['entries'],
+            'filesystem_cache_size_mb': round(warm['bytes'] / (1024*1024), 2),
+            'filesystem_evictions': warm['evictions'],
+            'database_pool': self.db_pool.get_stats(),
+            'search_cache': self.search_cache.get_stats(),
+            'timestamp': datetime.now().isoformat()
+        }
 
     def clear_cache(self):
         """Clear all cache layers."""
+        self.memory_cache.clear()
+        self.warm_store.clear()
+        self.search_cache.clear()
+        self._purge_search_files()
         with self.lock:
-            self.memory_cache.clear()
-            for f in self.filesystem_cache_dir.glob("*.json"):
-                try:
-                    f.unlink()
-                except:
-                    pass
-            self.stats = {
-                'memory_hits': 0,
-                'filesystem_hits': 0,
-                'database_hits': 0,
-                'misses': 0,
-                'total_requests': 0,
-                'started': datetime.now().isoformat()
-            }
+            self.stats = self._new_stats()
         print("[CACHE] All caches cleared")
 
     def save_stats(self):
@@ -337,8 +757,8 @@ if __name__ == "__main__":
     print(f"  Filesystem Hits: {stats['filesystem_hits']} ({round(stats['filesystem_hits']/stats['total_requests']*100, 1)}%)")
     print(f"  Database Hits: {stats['database_hits']} ({round(stats['database_hits']/stats['total_requests']*100, 1)}%)")
     print(f"  Overall Hit Rate: {stats['hit_rate']}%")
-    print(f"  Memory Size: {len(cache.memory_cache)} atoms")
-    print(f"  Filesystem Cache: {stats['filesystem_cache_files']} files")
+    print(f"  Memory Size: {stats['memory_size']} atoms ({stats['memory_cache_size_mb']} MB)")
+    print(f"  Filesystem Cache: {stats['filesystem_cache_files']} atoms ({stats['filesystem_cache_size_mb']} MB)")
 
     cache.save_stats()
     print(f"\nStats saved to: {CACHE_DIR / 'cache_stats.json'}")
@@ -7,15 +7,26 @@ VACUUM: Sucks in all content from everywhere
 COMPRESSED: Makes it instantly searchable
 
 Uses SQLite FTS5 for lightning-fast full-text search with ranking.
+
+Usage:
+    python CYCLOTRON_CONTENT_INDEXER.py          # Incremental vacuum
+    python CYCLOTRON_CONTENT_INDEXER.py --full   # Force full rebuild
+    Options: --workers=N (reader threads), --batch-size=N (rows per insert batch)
 """
 
 import os
+import sys
+import time
 import sqlite3
 import json
 import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+from CYCLOTRON_SCHEMA import ensure_schema, read_stats, NEW_DOCUMENT_INSERT, FILE_STATE_UPSERT_BY_PATH
+
 # Directories to vacuum
 VACUUM_DIRS = [
     "C:/Users/dwrek/100X_DEPLOYMENT",
@@ -28,37 +39,26 @@ VACUUM_DIRS = [
 # File types to index
 INDEX_EXTENSIONS = ['.md', '.txt', '.py', '.js', '.html', '.json']
 
+# Vacuum pipeline tuning: reader threads and rows per executemany batch
+EXTRACT_WORKERS = min(8, os.cpu_count() or 4)
+INSERT_BATCH_SIZE = 500
+
 # Database location
 DB_PATH = Path("C:/Users/dwrek/100X_DEPLOYMENT/.cyclotron_atoms/cyclotron.db")
 
 def init_database():
-    """Initialize SQLite database with FTS5 virtual table"""
+    """Initialize SQLite database (documents table + FTS5 index)"""
     DB_PATH.parent.mkdir(exist_ok=True)
 
     conn = sqlite3.connect(str(DB_PATH))
-    cursor = conn.cursor()
 
-    # Create FTS5 virtual table for full-text search
-    cursor.execute('''
-        CREATE VIRTUAL TABLE IF NOT EXISTS knowledge USING fts5(
-            path,
-            name,
-            type,
-            content,
-            preview,
-            modified,
-            hash,
-            tokenize='porter unicode61'
-        )
-    ''')
-
-    # Create metadata table for tracking
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS index_meta (
-            key TEXT PRIMARY KEY,
-            value TEXT
-        )
-    ''')
+    # WAL lets the search APIs keep reading while we write
+    conn.execute('PRAGMA journal_mode=WAL')
+
+    # documents + external-content knowledge_fts index, index_meta,
+    # file_state (per-file stat/hash + documents id) and trigger-maintained
+    # index_stats - shared with CYCLOTRON_DAEMON
+    ensure_schema(conn)
 
     conn.commit()
     return conn
@@ -76,16 +76,8 @@ def get_file_hash(content):
     """Generate hash of content for change detection"""
     return hashlib.md5(content.encode()).hexdigest()
 
-def vacuum_knowledge(conn):
-    """Vacuum up all knowledge from directories"""
-    cursor = conn.cursor()
-
-    # Clear existing index for fresh rebuild
-    cursor.execute('DELETE FROM knowledge')
-
-    indexed_count = 0
-    total_chars = 0
-
+def iter_vacuum_files():
+    """Yield (filepath, filename, ext) for every indexable file under VACUUM_DIRS"""
     for vacuum_dir in VACUUM_DIRS:
         if not os.path.exists(vacuum_dir):
             print(f"⚠️  Directory not found: {vacuum_dir}")
@@ -104,40 +96,10 @@ def vacuum_knowledge(conn):
                 if ext not in INDEX_EXTENSIONS:
                     continue
 
-                filepath = os.path.join(root, file)
-
-                try:
-                    # Extract content
-                    content = extract_content(filepath)
-                    if not content:
-                        continue
-
-                    # Get metadata
-                    stat = os.stat(filepath)
-                    file_hash = get_file_hash(content)
-                    preview = content[:500].replace('\n', ' ')
-
-                    # Insert into FTS5 table
-                    cursor.execute('''
-                        INSERT INTO knowledge (path, name, type, content, preview, modified, hash)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        filepath,
-                        file,
-                        ext[1:],  # Remove the dot
-                        content,
-                        preview,
-                        int(stat.st_mtime),
-                        file_hash
-                    ))
-
-                    indexed_count += 1
-                    total_chars += len(content)
-
-                except Exception as e:
-                    print(f"  ❌ Error indexing {filepath}: {e}")
-
-    # Update metadata
+                yield os.path.join(root, file), file, ext
+
+def update_meta(cursor, indexed_count, total_chars):
+    """Record last_indexed, total_files and total_chars in index_meta"""
     cursor.execute('''
         INSERT OR REPLACE INTO index_meta (key, value)
         VALUES ('last_indexed', ?)
@@ -153,9 +115,278 @@ def vacuum_knowledge(conn):
         VALUES ('total_chars', ?)
     ''', (str(total_chars),))
 
+def load_file(filepath):
+    """Worker: read, decode and hash one file. Returns (content, hash)."""
+    content = extract_content(filepath)
+    if not content:
+        return None, None
+    return content, get_file_hash(content)
+
+def parallel_load(jobs, workers=EXTRACT_WORKERS):
+    """
+    Run load_file over jobs on a thread pool.
+
+    jobs yields tuples whose first element is the filepath. Yields
+    (job, content, hash, error) in submission order, keeping at most
+    workers * 4 files in flight so memory stays bounded.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+
+        def resolve(job, future):
+            try:
+                content, file_hash = future.result()
+                return job, content, file_hash, None
+            except Exception as e:
+                return job, None, None, e
+
+        for job in jobs:
+            pending.append((job, pool.submit(load_file, job[0])))
+            if len(pending) >= workers * 4:
+                yield resolve(*pending.popleft())
+
+        while pending:
+            yield resolve(*pending.popleft())
+
+class BatchWriter:
+    """
+    Single writer that buffers documents/file_state changes and flushes
+    them with executemany. SQLite assigns document ids; file_state picks
+    up each new id by path (FILE_STATE_UPSERT_BY_PATH), so concurrent
+    writers such as the daemon can never collide on an id.
+    The caller owns the transaction and commits once at the end.
+    """
+
+    def __init__(self, cursor, batch_size=INSERT_BATCH_SIZE):
+        self.cursor = cursor
+        self.batch_size = batch_size
+        self.deletes = []
+        self.docs = []
+        self.states = []
+        self.touches = []
+        self.modified = []
+        self.removed_paths = []
+        self.files = 0
+        self.bytes = 0
+
+    def put(self, filepath, file, ext, content, stat, file_hash, old_doc_id=None):
+        """Queue a new or replacement document"""
+        if old_doc_id is not None:
+            self.deletes.append((old_doc_id,))
+
+        self.docs.append((
+            filepath,
+            file,
+            ext[1:],  # Remove the dot
+            content,
+            content[:500].replace('\n', ' '),
+            datetime.fromtimestamp(stat.st_mtime).isoformat(),
+            file_hash
+        ))
+        self.states.append((stat.st_mtime_ns, stat.st_size, file_hash, len(content), ext[1:], filepath))
+        self.files += 1
+        self.bytes += stat.st_size
+        self._maybe_flush()
+
+    def touch(self, filepath, stat, doc_id):
+        """Queue a stat and modified-time refresh for a file whose content did not change"""
+        self.touches.append((stat.st_mtime_ns, stat.st_size, filepath))
+        self.modified.append((datetime.fromtimestamp(stat.st_mtime).isoformat(), doc_id))
+        self._maybe_flush()
+
+    def remove(self, filepath, doc_id):
+        """Queue deletion of a vanished file"""
+        self.deletes.append((doc_id,))
+        self.removed_paths.append((filepath,))
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if len(self.docs) + len(self.touches) + len(self.removed_paths) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered rows"""
+        cursor = self.cursor
+        if self.deletes:
+            cursor.executemany('DELETE FROM documents WHERE id = ?', self.deletes)
+        if self.removed_paths:
+            cursor.executemany('DELETE FROM file_state WHERE path = ?', self.removed_paths)
+        if self.docs:
+            cursor.executemany(NEW_DOCUMENT_INSERT, self.docs)
+        if self.states:
+            cursor.executemany(FILE_STATE_UPSERT_BY_PATH, self.states)
+        if self.touches:
+            cursor.executemany(
+                'UPDATE file_state SET mtime_ns = ?, size = ? WHERE path = ?',
+                self.touches
+            )
+        if self.modified:
+            # Keeps "recent" ordering right; not an FTS column, so no reindex
+            cursor.executemany('UPDATE documents SET modified = ? WHERE id = ?', self.modified)
+
+        self.deletes = []
+        self.docs = []
+        self.states = []
+        self.touches = []
+        self.modified = []
+        self.removed_paths = []
+
+def throughput(files, nbytes, elapsed):
+    """Throughput figures for a vacuum run"""
+    elapsed = max(elapsed, 1e-9)
+    return {
+        'elapsed': round(elapsed, 3),
+        'files_per_sec': round(files / elapsed, 1),
+        'mb_per_sec': round(nbytes / elapsed / 1_000_000, 2)
+    }
+
+def print_throughput(files, stats):
+    print(f"⚡ {files} files indexed in {stats['elapsed']:.2f}s "
+          f"({stats['files_per_sec']} files/sec, {stats['mb_per_sec']} MB/sec)")
+
+def vacuum_knowledge(conn, workers=EXTRACT_WORKERS, batch_size=INSERT_BATCH_SIZE):
+    """Vacuum up all knowledge from directories (full rebuild)"""
+    start = time.time()
+    cursor = conn.cursor()
+
+    # Clear existing index for fresh rebuild
+    cursor.execute('DELETE FROM documents')
+    cursor.execute('DELETE FROM file_state')
+
+    writer = BatchWriter(cursor, batch_size)
+    total_chars = 0
+
+    def jobs():
+        for filepath, file, ext in iter_vacuum_files():
+            try:
+                yield filepath, file, ext, os.stat(filepath)
+            except OSError as e:
+                print(f"  ❌ Error indexing {filepath}: {e}")
+
+    for (filepath, file, ext, stat), content, file_hash, error in parallel_load(jobs(), workers):
+        if error:
+            print(f"  ❌ Error indexing {filepath}: {error}")
+            continue
+        if not content:
+            continue
+
+        writer.put(filepath, file, ext, content, stat, file_hash)
+        total_chars += len(content)
+
+    writer.flush()
+    update_meta(cursor, writer.files, total_chars)
     conn.commit()
 
-    return indexed_count, total_chars
+    print_throughput(writer.files, throughput(writer.files, writer.bytes, time.time() - start))
+
+    return writer.files, total_chars
+
+def vacuum_incremental(conn, workers=EXTRACT_WORKERS, batch_size=INSERT_BATCH_SIZE):
+    """
+    Re-index only what changed since the last vacuum.
+
+    Files whose (mtime, size) match file_state are skipped without being
+    read. Changed files are read and hashed on a thread pool and only
+    replaced if the hash differs. Rows for vanished paths are deleted by
+    rowid. All writes go through one BatchWriter in a single transaction.
+
+    Falls back to a full rebuild if documents and file_state are out of
+    sync (e.g. a database created before file_state existed).
+
+    Returns a dict of added/updated/removed/skipped counts, totals and
+    throughput.
+    """
+    start = time.time()
+    cursor = conn.cursor()
+
+    cursor.execute('SELECT COUNT(*) FROM documents')
+    document_rows = cursor.fetchone()[0]
+    cursor.execute('SELECT COUNT(*) FROM file_state')
+    state_rows = cursor.fetchone()[0]
+
+    if document_rows != state_rows:
+        print(f"⚠️  Index out of sync ({document_rows} docs, {state_rows} tracked) - full rebuild")
+        indexed_count, total_chars = vacuum_knowledge(conn, workers, batch_size)
+        return {
+            'added': indexed_count, 'updated': 0, 'removed': 0, 'skipped': 0,
+            'total_files': indexed_count, 'total_chars': total_chars,
+            'full_rebuild': True,
+            **throughput(indexed_count, 0, time.time() - start)
+        }
+
+    cursor.execute('SELECT path, mtime_ns, size, hash, doc_id FROM file_state')
+    state = {row[0]: row[1:] for row in cursor.fetchall()}
+
+    counts = {'added': 0, 'updated': 0, 'removed': 0, 'skipped': 0}
+    seen = set()
+    writer = BatchWriter(cursor, batch_size)
+
+    def changed_files():
+        for filepath, file, ext in iter_vacuum_files():
+            try:
+                stat = os.stat(filepath)
+            except OSError as e:
+                print(f"  ❌ Error indexing {filepath}: {e}")
+                continue
+
+            existing = state.get(filepath)
+            if existing and existing[0] == stat.st_mtime_ns and existing[1] == stat.st_size:
+                seen.add(filepath)
+                counts['skipped'] += 1
+                continue
+
+            yield filepath, file, ext, stat
+
+    for (filepath, file, ext, stat), content, file_hash, error in parallel_load(changed_files(), workers):
+        existing = state.get(filepath)
+
+        if error:
+            print(f"  ❌ Error indexing {filepath}: {error}")
+            if existing:
+                seen.add(filepath)  # Keep the last good copy
+            continue
+
+        if not content:
+            continue  # Treated as vanished below
+
+        seen.add(filepath)
+
+        if existing and existing[2] == file_hash:
+            # Touched but unchanged - just refresh the stat tuple and modified time
+            writer.touch(filepath, stat, existing[3])
+            counts['skipped'] += 1
+            continue
+
+        if existing:
+            counts['updated'] += 1
+            writer.put(filepath, file, ext, content, stat, file_hash, old_doc_id=existing[3])
+        else:
+            counts['added'] += 1
+            writer.put(filepath, file, ext, content, stat, file_hash)
+
+    for filepath, (_, _, _, doc_id) in state.items():
+        if filepath not in seen:
+            writer.remove(filepath, doc_id)
+            counts['removed'] += 1
+
+    writer.flush()
+
+    cursor.execute('SELECT COUNT(*), COALESCE(SUM(chars), 0) FROM file_state')
+    total_files, total_chars = cursor.fetchone()
+
+    update_meta(cursor, total_files, total_chars)
+    conn.commit()
+
+    rates = throughput(writer.files, writer.bytes, time.time() - start)
+    print_throughput(writer.files, rates)
+
+    return {
+        **counts,
+        'total_files': total_files,
+        'total_chars': total_chars,
+        'full_rebuild': False,
+        **rates
+    }
 
 def search(conn, query, limit=20):
     """Search the knowledge base"""
@@ -164,14 +395,15 @@ def search(conn, query, limit=20):
     # FTS5 search with BM25 ranking
     cursor.execute('''
         SELECT
-            path,
-            name,
-            type,
-            preview,
-            modified,
-            bm25(knowledge) as score
-        FROM knowledge
-        WHERE knowledge MATCH ?
+            d.path,
+            d.name,
+            d.type,
+            d.preview,
+            d.modified,
+            bm25(knowledge_fts) as score
+        FROM knowledge_fts
+        JOIN documents d ON d.id = knowledge_fts.rowid
+        WHERE knowledge_fts MATCH ?
         ORDER BY score
         LIMIT ?
     ''', (query, limit))
@@ -194,36 +426,25 @@ def get_snippet(conn, query, filepath):
     cursor = conn.cursor()
 
     cursor.execute('''
-        SELECT snippet(knowledge, 3, '>>>>', '<<<<', '...', 50)
-        FROM knowledge
-        WHERE knowledge MATCH ? AND path = ?
+        SELECT snippet(knowledge_fts, 2, '>>>>', '<<<<', '...', 50)
+        FROM knowledge_fts
+        WHERE knowledge_fts MATCH ?
+          AND rowid = (SELECT id FROM documents WHERE path = ?)
     ''', (query, filepath))
 
     row = cursor.fetchone()
     return row[0] if row else None
 
 def get_stats(conn):
-    """Get index statistics"""
-    cursor = conn.cursor()
-
-    # Get metadata
-    cursor.execute('SELECT key, value FROM index_meta')
-    meta = dict(cursor.fetchall())
-
-    # Get type breakdown
-    cursor.execute('''
-        SELECT type, COUNT(*)
-        FROM knowledge
-        GROUP BY type
-        ORDER BY COUNT(*) DESC
-    ''')
-    types = dict(cursor.fetchall())
+    """Get index statistics (O(types) read of index_stats)"""
+    stats = read_stats(conn)
 
     return {
-        'last_indexed': meta.get('last_indexed', 'Never'),
-        'total_files': int(meta.get('total_files', 0)),
-        'total_chars': int(meta.get('total_chars', 0)),
-        'types': types
+        'last_indexed': stats['last_indexed'],
+        'total_files': stats['total_files'],
+        'total_chars': stats['total_chars'],
+        'total_bytes': stats['total_bytes'],
+        'types': stats['types']
     }
 
 if __name__ == "__main__":
@@ -237,18 +458,35 @@ if __name__ == "__main__":
     print("📦 Initializing database...")
     conn = init_database()
 
-    # Vacuum all knowledge
+    # Vacuum all knowledge (incremental unless --full)
+    full = '--full' in sys.argv
+    workers = EXTRACT_WORKERS
+    batch_size = INSERT_BATCH_SIZE
+    for arg in sys.argv[1:]:
+        if arg.startswith('--workers='):
+            workers = int(arg.split('=', 1)[1])
+        elif arg.startswith('--batch-size='):
+            batch_size = int(arg.split('=', 1)[1])
     print()
-    print("🔄 Starting vacuum cycle...")
+    print("🔄 Starting full vacuum cycle..." if full else "🔄 Starting incremental vacuum cycle...")
     print()
 
-    indexed, chars = vacuum_knowledge(conn)
-
-    print()
-    print("=" * 60)
-    print(f"✅ VACUUM COMPLETE")
-    print(f"   Files indexed: {indexed}")
-    print(f"   Characters: {chars:,}")
+    if full:
+        indexed, chars = vacuum_knowledge(conn, workers, batch_size)
+        print()
+        print("=" * 60)
+        print(f"✅ VACUUM COMPLETE")
+        print(f"   Files indexed: {indexed}")
+        print(f"   Characters: {chars:,}")
+    else:
+        result = vacuum_incremental(conn, workers, batch_size)
+        print()
+        print("=" * 60)
+        print(f"✅ VACUUM COMPLETE{' (full rebuild)' if result['full_rebuild'] else ''}")
+        print(f"   Added: {result['added']}  Updated: {result['updated']}  "
+              f"Removed: {result['removed']}  Skipped: {result['skipped']}")
+        print(f"   Files indexed: {result['total_files']}")
+        print(f"   Characters: {result['total_chars']:,}")
     print(f"   Database: {DB_PATH}")
     print("=" * 60)
     print()
@@ -21,11 +21,16 @@ import sqlite3
 import hashlib
 import json
 import logging
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+from CYCLOTRON_SCHEMA import ensure_schema, read_stats, NEW_DOCUMENT_INSERT, FILE_STATE_UPSERT, FILE_STATE_UPSERT_BY_PATH
+
 # Configuration
 VACUUM_DIRS = [
     "C:/Users/dwrek/100X_DEPLOYMENT",
@@ -40,6 +45,19 @@ DB_PATH = Path("C:/Users/dwrek/100X_DEPLOYMENT/.cyclotron_atoms/cyclotron.db")
 STATUS_FILE = Path("C:/Users/dwrek/100X_DEPLOYMENT/.cyclotron_atoms/daemon_status.json")
 LOG_FILE = Path("C:/Users/dwrek/100X_DEPLOYMENT/.cyclotron_atoms/daemon.log")
 
+# Vacuum pipeline tuning: reader threads and rows per write transaction
+VACUUM_WORKERS = min(8, os.cpu_count() or 4)
+VACUUM_BATCH_SIZE = 500
+
+# Watcher event queue: quiet period before a path is processed, and max paths per transaction
+DEBOUNCE_SECONDS = 1.0
+QUEUE_BATCH_SIZE = 500
+
+# Failed batches (e.g. database locked by a vacuum) are requeued and retried with backoff
+RETRY_BACKOFF_SECONDS = 1.0
+RETRY_BACKOFF_MAX_SECONDS = 60.0
+SHUTDOWN_RETRIES = 3  # Attempts per batch when flushing the queue on stop
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -54,8 +72,11 @@ logger = logging.getLogger(__name__)
 class CyclotronIndexer:
     """Handles all indexing operations"""
 
-    def __init__(self):
+    def __init__(self, workers=VACUUM_WORKERS, batch_size=VACUUM_BATCH_SIZE):
         self.conn = None
+        self.workers = workers
+        self.batch_size = batch_size
+        self.lock = threading.RLock()  # Serializes writers sharing self.conn
         self.stats = {
             'files_indexed': 0,
             'files_updated': 0,
@@ -72,15 +93,35 @@ class CyclotronIndexer:
         self.conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
         cursor = self.conn.cursor()
 
-        # Create FTS5 table if not exists
+        # WAL lets the search APIs keep reading while we write
+        self.conn.execute('PRAGMA journal_mode=WAL')
+
+        # documents + external-content knowledge_fts, index_meta (last_indexed
+        # tells readers the index changed), the file_state B-tree shadow table
+        # (path -> hash, documents id) and trigger-maintained index_stats -
+        # shared with CYCLOTRON_CONTENT_INDEXER. Change checks are indexed
+        # point lookups and replacements delete by id.
+        ensure_schema(self.conn)
+
+        # Backfill documents that have no file_state row - the whole index on
+        # databases built before file_state existed, or rows left behind by a
+        # writer that skipped it
         cursor.execute('''
-            CREATE VIRTUAL TABLE IF NOT EXISTS knowledge USING fts5(
-                path, name, type, content, preview, modified, hash,
-                tokenize='porter unicode61'
-            )
+            INSERT OR IGNORE INTO file_state (path, size, hash, chars, doc_id, type)
+            SELECT path, LENGTH(CAST(content AS BLOB)), hash, LENGTH(content), id, type FROM documents
+            WHERE path NOT IN (SELECT path FROM file_state)
         ''')
         self.conn.commit()
 
+    def commit(self):
+        """Commit and bump index_meta.last_indexed so search caches invalidate"""
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO index_meta (key, value) VALUES ('last_indexed', ?)",
+                (datetime.now().isoformat(),)
+            )
+            self.conn.commit()
+
     def should_index(self, path):
         """Check if file should be indexed"""
         p = Path(path)
@@ -111,73 +152,108 @@ class CyclotronIndexer:
         except:
             return None
 
-    def index_file(self, path):
-        """Index a single file"""
+    def decode(self, data):
+        """Decode raw bytes like a text-mode read with universal newlines"""
+        return data.decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+
+    def read_file(self, path):
+        """
+        Read a file once and return (content, hash, stat).
+
+        The hash is over the raw bytes (same as get_file_hash).
+        """
+        with open(path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            data = f.read()
+        return self.decode(data), hashlib.md5(data).hexdigest(), st
+
+    def index_file(self, path, commit=True):
+        """
+        Index a single file. Pass commit=False to batch several calls in one transaction.
+
+        The file is read once as bytes and hashed; it is only decoded and
+        re-inserted when the hash differs from file_state.
+        """
         if not self.should_index(path):
             return False
 
         try:
             p = Path(path)
 
-            # Read content
+            # Read raw bytes once
             try:
-                with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
+                with open(path, 'rb') as f:
+                    st = os.fstat(f.fileno())
+                    data = f.read()
             except:
                 return False
 
-            # Get metadata
-            file_hash = self.get_file_hash(path)
-            modified = datetime.fromtimestamp(p.stat().st_mtime).isoformat()
-            preview = content[:500].replace('\n', ' ').strip()
+            file_hash = hashlib.md5(data).hexdigest()
 
-            # Check if already indexed with same hash
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT hash FROM knowledge WHERE path = ?', (str(path),))
-            existing = cursor.fetchone()
+            with self.lock:
+                # Indexed point lookup on the shadow table
+                cursor = self.conn.cursor()
+                cursor.execute('SELECT hash, doc_id FROM file_state WHERE path = ?', (str(path),))
+                existing = cursor.fetchone()
 
-            if existing and existing[0] == file_hash:
-                return False  # No change
+                if existing and existing[0] == file_hash:
+                    return False  # No change
 
-            # Delete old entry if exists
-            if existing:
-                cursor.execute('DELETE FROM knowledge WHERE path = ?', (str(path),))
-                self.stats['files_updated'] += 1
-            else:
-                self.stats['files_indexed'] += 1
+                content = self.decode(data)
+                modified = datetime.fromtimestamp(st.st_mtime).isoformat()
+                preview = content[:500].replace('\n', ' ').strip()
 
-            # Insert new entry
-            cursor.execute('''
-                INSERT INTO knowledge (path, name, type, content, preview, modified, hash)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (str(path), p.name, p.suffix, content, preview, modified, file_hash))
+                # Replace old entry by id
+                if existing:
+                    cursor.execute('DELETE FROM documents WHERE id = ?', (existing[1],))
+                    self.stats['files_updated'] += 1
+                else:
+                    self.stats['files_indexed'] += 1
 
-            self.conn.commit()
+                cursor.execute('''
+                    INSERT INTO documents (path, name, type, content, preview, modified, hash)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (str(path), p.name, p.suffix, content, preview, modified, file_hash))
+
+                cursor.execute(FILE_STATE_UPSERT, (
+                    str(path), st.st_mtime_ns, st.st_size, file_hash, len(content), cursor.lastrowid, p.suffix
+                ))
+
+                if commit:
+                    self.commit()
             return True
 
         except Exception as e:
+            if not commit and isinstance(e, sqlite3.Error):
+                raise  # Batched caller (IndexWorker) rolls back and retries
             logger.error(f"Error indexing {path}: {e}")
             self.stats['errors'] += 1
             return False
 
-    def delete_file(self, path):
-        """Remove file from index"""
+    def delete_file(self, path, commit=True):
+        """Remove file from index. Pass commit=False to batch several calls in one transaction."""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('DELETE FROM knowledge WHERE path = ?', (str(path),))
-            if cursor.rowcount > 0:
+            with self.lock:
+                cursor = self.conn.cursor()
+                cursor.execute('SELECT doc_id FROM file_state WHERE path = ?', (str(path),))
+                existing = cursor.fetchone()
+                if not existing:
+                    return False
+
+                cursor.execute('DELETE FROM documents WHERE id = ?', (existing[0],))
+                cursor.execute('DELETE FROM file_state WHERE path = ?', (str(path),))
                 self.stats['files_deleted'] += 1
-                self.conn.commit()
+                if commit:
+                    self.commit()
                 return True
         except Exception as e:
+            if not commit and isinstance(e, sqlite3.Error):
+                raise  # Batched caller (IndexWorker) rolls back and retries
             logger.error(f"Error deleting {path}: {e}")
         return False
 
-    def vacuum(self):
-        """Full re-index of all directories"""
-        logger.info("Starting full vacuum...")
-        start_time = time.time()
-
+    def _iter_vacuum_paths(self):
+        """Yield every indexable path under VACUUM_DIRS"""
         for directory in VACUUM_DIRS:
             if not os.path.exists(directory):
                 continue
@@ -188,79 +264,400 @@ class CyclotronIndexer:
 
                 for file in files:
                     path = os.path.join(root, file)
-                    self.index_file(path)
+                    if self.should_index(path):
+                        yield path
+
+    def _parallel_read(self, paths):
+        """
+        Read and hash paths on a thread pool, yielding (path, result, error)
+        in order with a bounded number of files in flight.
+        """
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = deque()
+
+            def resolve(path, future):
+                try:
+                    return path, future.result(), None
+                except Exception as e:
+                    return path, None, e
+
+            for path in paths:
+                pending.append((path, pool.submit(self.read_file, path)))
+                if len(pending) >= self.workers * 4:
+                    yield resolve(*pending.popleft())
+
+            while pending:
+                yield resolve(*pending.popleft())
+
+    def _write_batch(self, deletes, rows):
+        """
+        Apply one batch of replacements in a single transaction.
+
+        rows are (path, name, type, content, preview, modified, hash, st).
+        SQLite assigns the document ids and file_state looks each one up
+        by path, so a concurrent vacuum_incremental can't collide on ids.
+        """
+        with self.lock:
+            cursor = self.conn.cursor()
+            if deletes:
+                cursor.executemany('DELETE FROM documents WHERE id = ?', deletes)
+            if rows:
+                cursor.executemany(NEW_DOCUMENT_INSERT, [row[:7] for row in rows])
+                cursor.executemany(FILE_STATE_UPSERT_BY_PATH, [
+                    (row[7].st_mtime_ns, row[7].st_size, row[6], len(row[3]), row[2], row[0])
+                    for row in rows
+                ])
+            self.commit()
+
+    def vacuum(self):
+        """
+        Full re-index of all directories.
+
+        Reader threads read and hash files; this thread is the single
+        writer and applies changes with executemany, one transaction per
+        batch_size files. Unchanged files (same hash) are skipped.
+        """
+        logger.info(f"Starting full vacuum ({self.workers} workers, batch {self.batch_size})...")
+        start_time = time.time()
+
+        # One pass over the shadow table instead of a lookup per file
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT path, hash, doc_id FROM file_state')
+            existing = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+
+        deletes = []
+        rows = []
+        files_read = 0
+        bytes_read = 0
+
+        for path, result, error in self._parallel_read(self._iter_vacuum_paths()):
+            if error:
+                logger.error(f"Error indexing {path}: {error}")
+                self.stats['errors'] += 1
+                continue
+
+            content, file_hash, st = result
+            files_read += 1
+            bytes_read += st.st_size
+
+            previous = existing.get(str(path))
+            if previous and previous[0] == file_hash:
+                continue  # No change
+
+            if previous:
+                deletes.append((previous[1],))
+                self.stats['files_updated'] += 1
+            else:
+                self.stats['files_indexed'] += 1
+
+            p = Path(path)
+            rows.append((
+                str(path),
+                p.name,
+                p.suffix,
+                content,
+                content[:500].replace('\n', ' ').strip(),
+                datetime.fromtimestamp(st.st_mtime).isoformat(),
+                file_hash,
+                st
+            ))
+
+            if len(rows) >= self.batch_size:
+                self._write_batch(deletes, rows)
+                deletes, rows = [], []
+
+        self._write_batch(deletes, rows)
 
         elapsed = time.time() - start_time
         self.stats['last_vacuum'] = datetime.now().isoformat()
-        logger.info(f"Vacuum complete in {elapsed:.2f}s - {self.stats['files_indexed']} indexed, {self.stats['files_updated']} updated")
+        self.stats['last_vacuum_seconds'] = round(elapsed, 2)
+        self.stats['last_vacuum_files_per_sec'] = round(files_read / max(elapsed, 1e-9), 1)
+        self.stats['last_vacuum_mb_per_sec'] = round(bytes_read / max(elapsed, 1e-9) / 1_000_000, 2)
+        logger.info(
+            f"Vacuum complete in {elapsed:.2f}s - {self.stats['files_indexed']} indexed, "
+            f"{self.stats['files_updated']} updated "
+            f"({self.stats['last_vacuum_files_per_sec']} files/sec, "
+            f"{self.stats['last_vacuum_mb_per_sec']} MB/sec)"
+        )
 
         return self.stats
 
     def get_stats(self):
         """Get current statistics"""
-        cursor = self.conn.cursor()
-        cursor.execute('SELECT COUNT(*) FROM knowledge')
-        total = cursor.fetchone()[0]
-
-        cursor.execute('SELECT SUM(LENGTH(content)) FROM knowledge')
-        total_chars = cursor.fetchone()[0] or 0
+        with self.lock:
+            index = read_stats(self.conn)
 
         return {
             **self.stats,
-            'total_files': total,
-            'total_characters': total_chars,
+            'total_files': index['total_files'],
+            'total_characters': index['total_chars'],
+            'total_bytes': index['total_bytes'],
+            'files_by_type': index['types'],
             'db_path': str(DB_PATH)
         }
 
 
-class CyclotronHandler(FileSystemEventHandler):
-    """Watchdog event handler for file changes"""
+class EventQueue:
+    """
+    Coalescing queue of pending index actions keyed by path.
 
-    def __init__(self, indexer):
-        self.indexer = indexer
-        self.last_event = {}
-        self.debounce_seconds = 1
+    Each path holds only its final action ('index' or 'delete'), so a
+    create/modify/move/delete storm on one file collapses to one entry.
+    A path becomes ready once it has been quiet for debounce_seconds.
+    Entries are kept in last-event order, so ready paths are always a
+    prefix of the queue.
+    """
 
-    def _should_process(self, path):
-        """Debounce rapid events on same file"""
+    def __init__(self, debounce_seconds=DEBOUNCE_SECONDS):
+        self.debounce_seconds = debounce_seconds
+        self.cond = threading.Condition()
+        self.pending = OrderedDict()  # path -> [action, first_seen, last_seen]
+        self.stats = {
+            'events_received': 0,
+            'events_coalesced': 0,
+            'batches_applied': 0,
+            'batches_failed': 0,
+            'events_dropped': 0,
+            'last_batch_size': 0,
+            'last_batch_lag_seconds': 0.0
+        }
+
+    def push(self, path, action):
+        """Record the latest action for path"""
         now = time.time()
-        last = self.last_event.get(path, 0)
-        if now - last < self.debounce_seconds:
-            return False
-        self.last_event[path] = now
+        with self.cond:
+            self.stats['events_received'] += 1
+            entry = self.pending.get(path)
+            if entry:
+                entry[0] = action
+                entry[2] = now
+                self.pending.move_to_end(path)
+                self.stats['events_coalesced'] += 1
+            else:
+                self.pending[path] = [action, now, now]
+            self.cond.notify()
+
+    def take_ready(self, max_items=QUEUE_BATCH_SIZE, timeout=None):
+        """
+        Block until at least one path is past its debounce window (or
+        timeout expires), then remove and return up to max_items
+        (path, action, first_seen) tuples, least recently touched first.
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+
+        with self.cond:
+            while True:
+                now = time.time()
+                ready = []
+                for path, entry in self.pending.items():
+                    if now - entry[2] < self.debounce_seconds or len(ready) >= max_items:
+                        break
+                    ready.append((path, entry[0], entry[1]))
+
+                if ready:
+                    for path, _, _ in ready:
+                        del self.pending[path]
+                    return ready
+
+                if deadline is not None and now >= deadline:
+                    return []
+
+                if self.pending:
+                    oldest = next(iter(self.pending.values()))
+                    wait = self.debounce_seconds - (now - oldest[2])
+                else:
+                    wait = self.debounce_seconds
+                if deadline is not None:
+                    wait = min(wait, deadline - now)
+                self.cond.wait(max(wait, 0.01))
+
+    def requeue(self, batch):
+        """
+        Put a failed batch back. Paths that got a newer event meanwhile
+        keep that action; the rest are debounced again from now.
+        """
+        now = time.time()
+        with self.cond:
+            for path, action, first_seen in batch:
+                entry = self.pending.get(path)
+                if entry:
+                    entry[1] = min(entry[1], first_seen)
+                else:
+                    self.pending[path] = [action, first_seen, now]
+            self.cond.notify()
+
+    def drain(self, max_items=QUEUE_BATCH_SIZE):
+        """Remove and return up to max_items entries, ignoring the debounce window (shutdown)"""
+        with self.cond:
+            batch = []
+            while self.pending and len(batch) < max_items:
+                path, entry = self.pending.popitem(last=False)
+                batch.append((path, entry[0], entry[1]))
+            return batch
+
+    def get_stats(self):
+        """Queue depth, lag of the oldest pending event and counters"""
+        with self.cond:
+            oldest = min((e[1] for e in self.pending.values()), default=None)
+            return {
+                **self.stats,
+                'queue_depth': len(self.pending),
+                'queue_lag_seconds': round(time.time() - oldest, 3) if oldest else 0.0
+            }
+
+
+class IndexWorker(threading.Thread):
+    """
+    Background thread that drains EventQueue in batched transactions.
+
+    A batch that fails with sqlite3.OperationalError (e.g. database locked
+    while a vacuum holds the write lock) is rolled back, requeued and
+    retried after an exponential backoff. Any other error would fail the
+    same way again, so the batch is re-applied one path at a time and the
+    paths that still fail are logged and dropped. On stop, everything
+    still queued is flushed before exit.
+    """
+
+    def __init__(self, indexer, queue, batch_size=QUEUE_BATCH_SIZE):
+        super().__init__(daemon=True, name='cyclotron-index-worker')
+        self.indexer = indexer
+        self.queue = queue
+        self.batch_size = batch_size
+        self.stopping = threading.Event()
+        self.backoff = 0.0
+
+    def run(self):
+        while not self.stopping.is_set():
+            batch = self.queue.take_ready(self.batch_size, timeout=1.0)
+            if not batch:
+                continue
+            if self.try_apply(batch):
+                self.backoff = 0.0
+            else:
+                self.queue.requeue(batch)
+                self.backoff = min(max(self.backoff * 2, RETRY_BACKOFF_SECONDS), RETRY_BACKOFF_MAX_SECONDS)
+                self.stopping.wait(self.backoff)
+
+        self.flush()
+
+    def flush(self):
+        """Apply everything still queued, debounced or not (called on stop)"""
+        while True:
+            batch = self.queue.drain(self.batch_size)
+            if not batch:
+                return
+            for attempt in range(SHUTDOWN_RETRIES):
+                if self.try_apply(batch):
+                    break
+                time.sleep(RETRY_BACKOFF_SECONDS * (attempt + 1))
+            else:
+                logger.error(f"Dropping {len(batch)} queued events after {SHUTDOWN_RETRIES} failed attempts")
+
+    def try_apply(self, batch):
+        """
+        apply() a batch. Returns False if it was rolled back on a
+        retryable error (the caller requeues it), True once every path was
+        applied or dropped.
+        """
+        try:
+            self.apply(batch)
+            return True
+        except Exception as e:
+            self.rollback()
+            with self.queue.cond:
+                self.queue.stats['batches_failed'] += 1
+            if isinstance(e, sqlite3.OperationalError):
+                logger.error(f"Failed to apply {len(batch)} queued events (will retry): {e}")
+                return False
+            if len(batch) == 1:
+                path, action, _ = batch[0]
+                with self.queue.cond:
+                    self.queue.stats['events_dropped'] += 1
+                logger.error(f"Dropping queued {action} of {path}: {e}")
+                return True
+            logger.error(f"Failed to apply {len(batch)} queued events, retrying one path at a time: {e}")
+
+        for entry in batch:
+            # Paths applied before a retryable failure are no-ops on retry
+            if not self.try_apply([entry]):
+                return False
         return True
 
+    def rollback(self):
+        """Discard the failed batch's uncommitted writes"""
+        with self.indexer.lock:
+            try:
+                self.indexer.conn.rollback()
+            except sqlite3.Error:
+                pass
+
+    def apply(self, batch):
+        """
+        Apply one batch of final actions and commit once. A batch that
+        changed nothing (touches, deletes of unindexed paths) is rolled
+        back so last_indexed - and every search cache - is left alone.
+        """
+        changed = 0
+        with self.indexer.lock:
+            for path, action, _ in batch:
+                if action == 'delete':
+                    if self.indexer.delete_file(path, commit=False):
+                        changed += 1
+                elif self.indexer.index_file(path, commit=False):
+                    changed += 1
+            if changed:
+                self.indexer.commit()
+            else:
+                self.indexer.conn.rollback()
+
+        now = time.time()
+        with self.queue.cond:
+            self.queue.stats['batches_applied'] += 1
+            self.queue.stats['last_batch_size'] = len(batch)
+            self.queue.stats['last_batch_lag_seconds'] = round(now - batch[0][2], 3)
+
+        if changed:
+            logger.info(f"Applied {len(batch)} queued events ({changed} index changes)")
+
+    def stop(self):
+        """Stop after flushing the queue (join() to wait for it)"""
+        self.stopping.set()
+
+
+class CyclotronHandler(FileSystemEventHandler):
+    """Watchdog event handler - enqueues changes, never touches the DB"""
+
+    def __init__(self, queue):
+        self.queue = queue
+
     def on_created(self, event):
         if event.is_directory:
             return
-        if self._should_process(event.src_path):
-            if self.indexer.index_file(event.src_path):
-                logger.info(f"Indexed new file: {event.src_path}")
+        self.queue.push(event.src_path, 'index')
 
     def on_modified(self, event):
         if event.is_directory:
             return
-        if self._should_process(event.src_path):
-            if self.indexer.index_file(event.src_path):
-                logger.info(f"Re-indexed modified file: {event.src_path}")
+        self.queue.push(event.src_path, 'index')
 
     def on_deleted(self, event):
         if event.is_directory:
             return
-        if self.indexer.delete_file(event.src_path):
-            logger.info(f"Removed deleted file: {event.src_path}")
+        self.queue.push(event.src_path, 'delete')
 
     def on_moved(self, event):
         if event.is_directory:
             return
-        self.indexer.delete_file(event.src_path)
-        if self.indexer.index_file(event.dest_path):
-            logger.info(f"Moved file: {event.src_path} -> {event.dest_path}")
+        self.queue.push(event.src_path, 'delete')
+        self.queue.push(event.dest_path, 'index')
 
 
-def save_status(indexer, running=True):
+def save_status(indexer, running=True, queue=None):
     """Save daemon status to file"""
     status = indexer.get_stats()
+    if queue is not None:
+        status.update(queue.get_stats())
     status['running'] = running
     status['pid'] = os.getpid()
     status['updated'] = datetime.now().isoformat()
@@ -287,7 +684,15 @@ def show_status():
     print(f"Files Updated: {status.get('files_updated', 0)}")
     print(f"Files Deleted: {status.get('files_deleted', 0)}")
     print(f"Errors: {status.get('errors', 0)}")
+    if 'queue_depth' in status:
+        print(f"Queue Depth: {status['queue_depth']} (lag {status['queue_lag_seconds']}s)")
+        print(f"Events: {status['events_received']} received, {status['events_coalesced']} coalesced, "
+              f"{status['batches_applied']} batches ({status.get('batches_failed', 0)} failed, "
+              f"{status.get('events_dropped', 0)} events dropped)")
     print(f"Last Vacuum: {status.get('last_vacuum', 'Never')}")
+    if 'last_vacuum_seconds' in status:
+        print(f"Vacuum Throughput: {status['last_vacuum_files_per_sec']} files/sec, "
+              f"{status['last_vacuum_mb_per_sec']} MB/sec ({status['last_vacuum_seconds']}s)")
     print(f"Last Update: {status.get('updated', 'N/A')}")
     print(f"Database: {status.get('db_path', 'N/A')}")
     print("=" * 32)
@@ -304,8 +709,12 @@ def run_daemon():
     logger.info("Performing initial vacuum...")
     indexer.vacuum()
 
-    # Setup watchdog
-    handler = CyclotronHandler(indexer)
+    # Setup event queue, background worker and watchdog
+    queue = EventQueue()
+    worker = IndexWorker(indexer, queue)
+    worker.start()
+
+    handler = CyclotronHandler(queue)
     observer = Observer()
 
     # Watch all directories
@@ -320,15 +729,17 @@ def run_daemon():
 
     try:
         while True:
-            save_status(indexer, running=True)
+            save_status(indexer, running=True, queue=queue)
             time.sleep(30)  # Update status every 30 seconds
 
     except KeyboardInterrupt:
         logger.info("Stopping daemon...")
         observer.stop()
-        save_status(indexer, running=False)
 
     observer.join()
+    worker.stop()
+    worker.join()
+    save_status(indexer, running=False, queue=queue)
     logger.info("Daemon stopped")
 
 
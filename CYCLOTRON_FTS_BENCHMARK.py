@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+CYCLOTRON FTS BENCHMARK - Legacy vs documents + external-content FTS5
+=====================================================================
+
+Builds the same corpus into two throwaway databases:
+
+- legacy:    single `knowledge` FTS5 table, every column tokenized
+- documents: CYCLOTRON_SCHEMA (documents table + knowledge_fts index)
+
+and compares DB size, index time and query latency for full-text search,
+"recent files" and path lookups.
+
+Usage:
+    python CYCLOTRON_FTS_BENCHMARK.py                # Synthetic corpus
+    python CYCLOTRON_FTS_BENCHMARK.py <directory>    # Index a real directory
+    Options: --files=N (synthetic corpus size), --runs=N (query repetitions)
+"""
+
+import os
+import sys
+import time
+import random
+import sqlite3
+import hashlib
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from CYCLOTRON_SCHEMA import ensure_schema, DOCUMENT_INSERT
+
+SYNTHETIC_FILES = 5000
+QUERY_RUNS = 200
+INDEX_EXTENSIONS = ['.md', '.txt', '.py', '.js', '.html', '.json']
+MAX_FILE_SIZE = 1024 * 1024
+
+SEARCH_TERMS = ['consciousness', 'pattern', 'trinity', 'cyclotron', 'index']
+
+WORDS = (
+    'consciousness pattern trinity cyclotron index vacuum knowledge search '
+    'daemon query brain agent signal manipulation truth domain builder '
+    'kaizen jidoka kanban atom harmonic network session memory dashboard'
+).split()
+
+LEGACY_DDL = '''
+    CREATE VIRTUAL TABLE knowledge USING fts5(
+        path, name, type, content, preview, modified, hash,
+        tokenize='porter unicode61'
+    )
+'''
+
+
+def synthetic_corpus(n, seed=42):
+    """Yield (path, name, type, content, modified) for n fake files"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    for i in range(n):
+        ext = rng.choice(INDEX_EXTENSIONS)
+        name = f"{rng.choice(WORDS).upper()}_{i}{ext}"
+        path = f"C:/Users/dwrek/100X_DEPLOYMENT/{rng.choice(WORDS)}/{name}"
+        content = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(50, 2000)))
+        modified = start + timedelta(minutes=rng.randint(0, 60 * 24 * 600))
+        yield path, name, ext[1:], content, modified.isoformat()
+
+
+def directory_corpus(root):
+    """Yield (path, name, type, content, modified) for files under root"""
+    for dirpath, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv']]
+        for file in files:
+            ext = Path(file).suffix.lower()
+            if ext not in INDEX_EXTENSIONS:
+                continue
+            path = os.path.join(dirpath, file)
+            try:
+                st = os.stat(path)
+                if st.st_size > MAX_FILE_SIZE:
+                    continue
+                with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                    content = f.read()
+            except OSError:
+                continue
+            yield path, file, ext[1:], content, datetime.fromtimestamp(st.st_mtime).isoformat()
+
+
+def to_rows(corpus):
+    """Corpus entries -> (id, path, name, type, content, preview, modified, hash)"""
+    rows = []
+    for i, (path, name, file_type, content, modified) in enumerate(corpus, 1):
+        preview = content[:500].replace('\n', ' ').strip()
+        file_hash = hashlib.md5(content.encode('utf-8', errors='ignore')).hexdigest()
+        rows.append((i, path, name, file_type, content, preview, modified, file_hash))
+    return rows
+
+
+def build_legacy(db_path, rows):
+    """Index rows into the old all-columns FTS5 table; returns seconds"""
+    conn = sqlite3.connect(db_path)
+    conn.execute(LEGACY_DDL)
+    start = time.perf_counter()
+    conn.executemany('''
+        INSERT INTO knowledge (rowid, path, name, type, content, preview, modified, hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    conn.commit()
+    elapsed = time.perf_counter() - start
+    conn.execute('VACUUM')
+    conn.close()
+    return elapsed
+
+
+def build_documents(db_path, rows):
+    """Index rows into documents + knowledge_fts; returns seconds"""
+    conn = sqlite3.connect(db_path)
+    ensure_schema(conn)
+    start = time.perf_counter()
+    conn.executemany(DOCUMENT_INSERT, rows)
+    conn.commit()
+    elapsed = time.perf_counter() - start
+    conn.execute('VACUUM')
+    conn.close()
+    return elapsed
+
+
+LEGACY_QUERIES = {
+    'search': '''
+        SELECT path, name, snippet(knowledge, 3, '**', '**', '...', 64), bm25(knowledge) AS score
+        FROM knowledge WHERE knowledge MATCH ? ORDER BY score LIMIT 20
+    ''',
+    'recent': '''
+        SELECT path, name, type, preview, modified
+        FROM knowledge ORDER BY modified DESC LIMIT 20
+    ''',
+    'path': 'SELECT name, type, content, modified FROM knowledge WHERE path = ?',
+}
+
+DOCUMENT_QUERIES = {
+    'search': '''
+        SELECT d.path, d.name, snippet(knowledge_fts, 2, '**', '**', '...', 64), bm25(knowledge_fts) AS score
+        FROM knowledge_fts JOIN documents d ON d.id = knowledge_fts.rowid
+        WHERE knowledge_fts MATCH ? ORDER BY score LIMIT 20
+    ''',
+    'recent': '''
+        SELECT path, name, type, preview, modified
+        FROM documents ORDER BY modified DESC LIMIT 20
+    ''',
+    'path': 'SELECT name, type, content, modified FROM documents WHERE path = ?',
+}
+
+
+def time_queries(db_path, queries, paths, runs):
+    """Median/p95 milliseconds per query kind"""
+    conn = sqlite3.connect(db_path)
+    rng = random.Random(7)
+    results = {}
+    for kind, sql in queries.items():
+        samples = []
+        for i in range(runs):
+            if kind == 'search':
+                params = (SEARCH_TERMS[i % len(SEARCH_TERMS)],)
+            elif kind == 'path':
+                params = (rng.choice(paths),)
+            else:
+                params = ()
+            start = time.perf_counter()
+            conn.execute(sql, params).fetchall()
+            samples.append((time.perf_counter() - start) * 1000)
+        samples.sort()
+        results[kind] = (samples[len(samples) // 2], samples[int(len(samples) * 0.95) - 1])
+    conn.close()
+    return results
+
+
+def main():
+    files = SYNTHETIC_FILES
+    runs = QUERY_RUNS
+    source = None
+    for arg in sys.argv[1:]:
+        if arg.startswith('--files='):
+            files = int(arg.split('=', 1)[1])
+        elif arg.startswith('--runs='):
+            runs = int(arg.split('=', 1)[1])
+        else:
+            source = arg
+
+    print("=" * 60)
+    print("🌀 CYCLOTRON FTS BENCHMARK")
+    print("   legacy knowledge FTS5 vs documents + knowledge_fts")
+    print("=" * 60)
+    print()
+
+    if source:
+        print(f"📂 Reading corpus from {source}...")
+        rows = to_rows(directory_corpus(source))
+    else:
+        print(f"🧪 Generating synthetic corpus ({files} files)...")
+        rows = to_rows(synthetic_corpus(files))
+
+    if not rows:
+        print("❌ No files to index")
+        return
+
+    total_chars = sum(len(row[4]) for row in rows)
+    print(f"   {len(rows)} files, {total_chars:,} characters")
+    print()
+
+    paths = [row[1] for row in rows]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = os.path.join(tmp, 'legacy.db')
+        documents_db = os.path.join(tmp, 'documents.db')
+
+        print("📦 Building legacy schema...")
+        legacy_seconds = build_legacy(legacy_db, rows)
+        print("📦 Building documents schema...")
+        documents_seconds = build_documents(documents_db, rows)
+        print()
+
+        legacy_size = os.path.getsize(legacy_db)
+        documents_size = os.path.getsize(documents_db)
+
+        print(f"⏱️  Timing queries ({runs} runs each)...")
+        legacy_latency = time_queries(legacy_db, LEGACY_QUERIES, paths, runs)
+        documents_latency = time_queries(documents_db, DOCUMENT_QUERIES, paths, runs)
+        print()
+
+    def change(before, after):
+        return f"{(after - before) / before * 100:+.1f}%" if before else 'n/a'
+
+    print(f"{'':24}{'legacy':>14}{'documents':>14}{'change':>10}")
+    print("-" * 62)
+    print(f"{'DB size (MB)':24}{legacy_size / 1024 / 1024:>14.2f}"
+          f"{documents_size / 1024 / 1024:>14.2f}{change(legacy_size, documents_size):>10}")
+    print(f"{'Index time (s)':24}{legacy_seconds:>14.2f}"
+          f"{documents_seconds:>14.2f}{change(legacy_seconds, documents_seconds):>10}")
+    for kind in LEGACY_QUERIES:
+        for label, index in (('p50', 0), ('p95', 1)):
+            before = legacy_latency[kind][index]
+            after = documents_latency[kind][index]
+            print(f"{kind + ' ' + label + ' (ms)':24}{before:>14.3f}{after:>14.3f}{change(before, after):>10}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
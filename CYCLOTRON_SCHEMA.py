@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+CYCLOTRON SCHEMA - Shared schema for the Cyclotron knowledge DB
+================================================================
+
+Both writers (CYCLOTRON_CONTENT_INDEXER and CYCLOTRON_DAEMON) call
+ensure_schema(); the search APIs read the same tables.
+
+- documents:     one row per file (path, name, type, content, preview,
+                 modified, hash) with B-tree indexes on path, type and
+                 modified
+- knowledge_fts: external-content FTS5 index (content=documents) over the
+                 searchable columns only - path, name, content - kept in
+                 sync by triggers on documents
+- index_meta:    key/value metadata (last_indexed, ...)
+- file_state:    one row per indexed file - stat tuple, hash, size, type
+                 and the documents id
+- index_stats:   per-type file/char/byte totals, kept current by triggers
+                 on file_state so stats are an O(types) read
+
+Databases built with the old all-columns `knowledge` FTS5 table are
+migrated in place; `knowledge` is then recreated as a read-only view over
+documents for plain SELECT readers.
+
+Full-text queries join the index back to documents:
+
+    SELECT d.path, snippet(knowledge_fts, 2, ...), bm25(knowledge_fts)
+    FROM knowledge_fts JOIN documents d ON d.id = knowledge_fts.rowid
+    WHERE knowledge_fts MATCH ?
+
+Writers must use FILE_STATE_UPSERT (not INSERT OR REPLACE) so the UPDATE
+trigger fires and index_stats stays exact.
+
+Batch writers insert with NEW_DOCUMENT_INSERT, letting SQLite assign the
+ids, then record file_state with FILE_STATE_UPSERT_BY_PATH, which looks
+each new id up by path. Ids are never precomputed from MAX(id): another
+writer can insert between that read and the flush.
+"""
+
+import sqlite3
+
+# knowledge_fts column holding file content (for snippet())
+FTS_CONTENT_COLUMN = 2
+
+DOCUMENT_INSERT = '''
+    INSERT INTO documents (id, path, name, type, content, preview, modified, hash)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+NEW_DOCUMENT_INSERT = '''
+    INSERT INTO documents (path, name, type, content, preview, modified, hash)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+_FILE_STATE_CONFLICT = '''
+    ON CONFLICT(path) DO UPDATE SET
+        mtime_ns = excluded.mtime_ns,
+        size = excluded.size,
+        hash = excluded.hash,
+        chars = excluded.chars,
+        doc_id = excluded.doc_id,
+        type = excluded.type
+'''
+
+FILE_STATE_UPSERT = '''
+    INSERT INTO file_state (path, mtime_ns, size, hash, chars, doc_id, type)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+''' + _FILE_STATE_CONFLICT
+
+# Parameters: (mtime_ns, size, hash, chars, type, path) - doc_id comes from documents
+FILE_STATE_UPSERT_BY_PATH = '''
+    INSERT INTO file_state (path, mtime_ns, size, hash, chars, doc_id, type)
+    SELECT path, ?, ?, ?, ?, id, ? FROM documents WHERE path = ?
+''' + _FILE_STATE_CONFLICT
+
+_DOCUMENT_TRIGGERS = '''
+    CREATE TRIGGER IF NOT EXISTS documents_fts_insert AFTER INSERT ON documents BEGIN
+        INSERT INTO knowledge_fts (rowid, path, name, content)
+        VALUES (NEW.id, NEW.path, NEW.name, NEW.content);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS documents_fts_delete AFTER DELETE ON documents BEGIN
+        INSERT INTO knowledge_fts (knowledge_fts, rowid, path, name, content)
+        VALUES ('delete', OLD.id, OLD.path, OLD.name, OLD.content);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS documents_fts_update
+    AFTER UPDATE OF path, name, content ON documents BEGIN
+        INSERT INTO knowledge_fts (knowledge_fts, rowid, path, name, content)
+        VALUES ('delete', OLD.id, OLD.path, OLD.name, OLD.content);
+        INSERT INTO knowledge_fts (rowid, path, name, content)
+        VALUES (NEW.id, NEW.path, NEW.name, NEW.content);
+    END;
+'''
+
+_STATS_TRIGGERS = '''
+    CREATE TRIGGER IF NOT EXISTS file_state_stats_insert AFTER INSERT ON file_state BEGIN
+        INSERT INTO index_stats (type, files, chars, bytes)
+        VALUES (COALESCE(NEW.type, ''), 1, COALESCE(NEW.chars, 0), COALESCE(NEW.size, 0))
+        ON CONFLICT(type) DO UPDATE SET
+            files = files + 1,
+            chars = chars + excluded.chars,
+            bytes = bytes + excluded.bytes;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS file_state_stats_delete AFTER DELETE ON file_state BEGIN
+        UPDATE index_stats SET
+            files = files - 1,
+            chars = chars - COALESCE(OLD.chars, 0),
+            bytes = bytes - COALESCE(OLD.size, 0)
+        WHERE type = COALESCE(OLD.type, '');
+        DELETE FROM index_stats WHERE files <= 0;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS file_state_stats_update
+    AFTER UPDATE OF size, chars, type ON file_state BEGIN
+        UPDATE index_stats SET
+            files = files - 1,
+            chars = chars - COALESCE(OLD.chars, 0),
+            bytes = bytes - COALESCE(OLD.size, 0)
+        WHERE type = COALESCE(OLD.type, '');
+        INSERT INTO index_stats (type, files, chars, bytes)
+        VALUES (COALESCE(NEW.type, ''), 1, COALESCE(NEW.chars, 0), COALESCE(NEW.size, 0))
+        ON CONFLICT(type) DO UPDATE SET
+            files = files + 1,
+            chars = chars + excluded.chars,
+            bytes = bytes + excluded.bytes;
+        DELETE FROM index_stats WHERE files <= 0;
+    END;
+'''
+
+
+def ensure_schema(conn):
+    """Create/migrate documents, knowledge_fts and the side tables (idempotent)"""
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS documents (
+            id INTEGER PRIMARY KEY,
+            path TEXT NOT NULL UNIQUE,
+            name TEXT,
+            type TEXT,
+            content TEXT,
+            preview TEXT,
+            modified TEXT,
+            hash TEXT
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_documents_type ON documents(type)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_documents_modified ON documents(modified)')
+
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS knowledge_fts USING fts5(
+            path, name, content,
+            content='documents',
+            content_rowid='id',
+            tokenize='porter unicode61'
+        )
+    ''')
+    cursor.executescript(_DOCUMENT_TRIGGERS)
+
+    migrate_legacy_knowledge(cursor)
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS index_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    ''')
+
+    # Per-file record; doc_id is the documents id
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS file_state (
+            path TEXT PRIMARY KEY,
+            mtime_ns INTEGER,
+            size INTEGER,
+            hash TEXT,
+            chars INTEGER,
+            doc_id INTEGER,
+            type TEXT
+        )
+    ''')
+
+    # file_state from before per-type stats has no type column
+    columns = [row[1] for row in cursor.execute('PRAGMA table_info(file_state)')]
+    if 'type' not in columns:
+        cursor.execute('ALTER TABLE file_state ADD COLUMN type TEXT')
+        cursor.execute('''
+            UPDATE file_state
+            SET type = (SELECT type FROM documents WHERE documents.id = file_state.doc_id)
+        ''')
+        cursor.execute('DROP TABLE IF EXISTS index_stats')
+
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'index_stats'")
+    fresh_stats = cursor.fetchone() is None
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS index_stats (
+            type TEXT PRIMARY KEY,
+            files INTEGER NOT NULL,
+            chars INTEGER NOT NULL,
+            bytes INTEGER NOT NULL
+        )
+    ''')
+    cursor.executescript(_STATS_TRIGGERS)
+
+    if fresh_stats:
+        rebuild_stats(cursor)
+
+    conn.commit()
+
+
+def migrate_legacy_knowledge(cursor):
+    """
+    Move rows out of the old all-columns `knowledge` FTS5 table into
+    documents (keeping rowids, so file_state.doc_id stays valid), drop it,
+    and leave a `knowledge` view behind. Integer epoch `modified` values
+    become ISO strings so the modified index sorts chronologically.
+    """
+    cursor.execute("SELECT type FROM sqlite_master WHERE name = 'knowledge'")
+    row = cursor.fetchone()
+
+    if row and row[0] == 'table':
+        print("Migrating knowledge FTS5 table to documents + knowledge_fts...")
+        cursor.execute('''
+            INSERT OR IGNORE INTO documents (id, path, name, type, content, preview, modified, hash)
+            SELECT rowid, path, name, type, content, preview,
+                   CASE WHEN typeof(modified) = 'integer'
+                        THEN strftime('%Y-%m-%dT%H:%M:%S', modified, 'unixepoch', 'localtime')
+                        ELSE modified END,
+                   hash
+            FROM knowledge
+        ''')
+        cursor.execute('DROP TABLE knowledge')
+
+        # Duplicate legacy paths collapsed to one document
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'file_state'")
+        if cursor.fetchone():
+            cursor.execute('''
+                UPDATE file_state
+                SET doc_id = (SELECT id FROM documents WHERE documents.path = file_state.path)
+            ''')
+            cursor.execute('DELETE FROM file_state WHERE doc_id IS NULL')
+        row = None
+
+    if row is None:
+        cursor.execute('''
+            CREATE VIEW IF NOT EXISTS knowledge AS
+            SELECT path, name, type, content, preview, modified, hash FROM documents
+        ''')
+
+
+def rebuild_stats(cursor):
+    """Recompute index_stats from file_state (used on first migration)"""
+    cursor.execute('DELETE FROM index_stats')
+    cursor.execute('''
+        INSERT INTO index_stats (type, files, chars, bytes)
+        SELECT COALESCE(type, ''), COUNT(*), COALESCE(SUM(chars), 0), COALESCE(SUM(size), 0)
+        FROM file_state
+        GROUP BY COALESCE(type, '')
+    ''')
+
+
+def read_stats(conn):
+    """
+    Index totals from index_stats/index_meta - an O(types) read.
+
+    Returns None if the database predates index_stats.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute('SELECT type, files, chars, bytes FROM index_stats ORDER BY files DESC')
+        rows = cursor.fetchall()
+        cursor.execute('SELECT key, value FROM index_meta')
+        meta = dict(cursor.fetchall())
+    except sqlite3.OperationalError:
+        return None
+
+    return {
+        'last_indexed': meta.get('last_indexed', 'Never'),
+        'total_files': sum(row[1] for row in rows),
+        'total_chars': sum(row[2] for row in rows),
+        'total_bytes': sum(row[3] for row in rows),
+        'types': {row[0]: row[1] for row in rows},
+        'bytes_by_type': {row[0]: row[3] for row in rows}
+    }
@@ -5,6 +5,8 @@ Cyclotron Search API - Query the knowledge base
 
 import json
 import re
+import threading
+from collections import defaultdict
 from pathlib import Path
 from flask import Flask, request, jsonify
 from flask_cors import CORS
@@ -14,47 +16,139 @@ CORS(app)
 
 ATOMS_DIR = Path.home() / '100X_DEPLOYMENT' / '.cyclotron_atoms'
 
+NGRAM_SIZE = 3
+
+
+class AtomSnapshot:
+    """Immutable parsed index.json plus precomputed lookup structures"""
+
+    def __init__(self, data):
+        self.data = data
+        self.atoms = data.get('atoms', [])
+        self.haystacks = []
+        self.by_type = defaultdict(list)
+        postings = defaultdict(set)
+
+        for i, atom in enumerate(self.atoms):
+            name = atom.get('name', '').lower()
+            path = atom.get('path', '').lower()
+            self.haystacks.append((name, path))
+            self.by_type[atom.get('type')].append(i)
+
+            for text in (name, path):
+                for j in range(len(text) - NGRAM_SIZE + 1):
+                    postings[text[j:j + NGRAM_SIZE]].add(i)
+
+        self.postings = dict(postings)
+        self.by_recent = sorted(
+            range(len(self.atoms)),
+            key=lambda i: self.atoms[i].get('modified', 0),
+            reverse=True
+        )
+
+    def _candidates(self, query_lower, atom_type):
+        """Atom positions that may contain query_lower, in index order"""
+        scope = self.by_type.get(atom_type, []) if atom_type else None
+
+        if len(query_lower) < NGRAM_SIZE:
+            return scope if scope is not None else range(len(self.atoms))
+
+        grams = {query_lower[j:j + NGRAM_SIZE] for j in range(len(query_lower) - NGRAM_SIZE + 1)}
+        sets = []
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if not posting:
+                return []
+            sets.append(posting)
+
+        sets.sort(key=len)
+        candidates = set(sets[0])
+        for posting in sets[1:]:
+            candidates &= posting
+            if not candidates:
+                return []
+
+        if scope is not None:
+            candidates.intersection_update(scope)
+        return sorted(candidates)
+
+    def search(self, query, atom_type=None, limit=50):
+        """Substring search over name and path, same results as a linear scan"""
+        query_lower = query.lower()
+        results = []
+
+        for i in self._candidates(query_lower, atom_type):
+            name, path = self.haystacks[i]
+            if query_lower in name or query_lower in path:
+                atom = self.atoms[i]
+                results.append({
+                    'name': atom.get('name'),
+                    'path': atom.get('path'),
+                    'type': atom.get('type'),
+                    'size': atom.get('size'),
+                    'modified': atom.get('modified')
+                })
+
+                if len(results) >= limit:
+                    break
+
+        return results
+
+    def recent(self, limit=20):
+        """Most recently modified atoms, using the precomputed order"""
+        return [self.atoms[i] for i in self.by_recent[:limit]]
+
+
+class AtomIndex:
+    """
+    Resident index that loads index.json once and reloads it only when
+    the file's mtime or size changes. Requests share the current
+    AtomSnapshot; a reload swaps in a new one atomically.
+    """
+
+    def __init__(self, index_file):
+        self.index_file = index_file
+        self.lock = threading.Lock()
+        self.signature = None
+        self.snapshot = None
+
+    def _stat_signature(self):
+        try:
+            st = self.index_file.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def get(self):
+        """Current snapshot, reloading if the file changed. None if missing."""
+        signature = self._stat_signature()
+        if signature is None:
+            return None
+
+        if signature != self.signature:
+            with self.lock:
+                if signature != self.signature:
+                    with open(self.index_file) as f:
+                        self.snapshot = AtomSnapshot(json.load(f))
+                    self.signature = signature
+
+        return self.snapshot
+
+
+atom_index = AtomIndex(ATOMS_DIR / 'index.json')
+
+
 def load_index():
-    """Load the current index"""
-    index_file = ATOMS_DIR / 'index.json'
-    if not index_file.exists():
-        return None
-    with open(index_file) as f:
-        return json.load(f)
+    """Load the current index (cached until index.json changes)"""
+    snapshot = atom_index.get()
+    return snapshot.data if snapshot else None
 
 def search_atoms(query, atom_type=None, limit=50):
     """Search atoms by query string"""
-    index = load_index()
-    if not index:
+    snapshot = atom_index.get()
+    if not snapshot:
         return []
-
-    atoms = index.get('atoms', [])
-    results = []
-
-    query_lower = query.lower()
-
-    for atom in atoms:
-        # Search in name and path
-        name = atom.get('name', '').lower()
-        path = atom.get('path', '').lower()
-
-        if query_lower in name or query_lower in path:
-            # Filter by type if specified
-            if atom_type and atom.get('type') != atom_type:
-                continue
-
-            results.append({
-                'name': atom.get('name'),
-                'path': atom.get('path'),
-                'type': atom.get('type'),
-                'size': atom.get('size'),
-                'modified': atom.get('modified')
-            })
-
-            if len(results) >= limit:
-                break
-
-    return results
+    return snapshot.search(query, atom_type, limit)
 
 @app.route('/api/search', methods=['GET'])
 def api_search():
@@ -101,15 +195,11 @@ def api_types():
 def api_recent():
     """Get most recently modified atoms"""
     limit = int(request.args.get('limit', 20))
-    index = load_index()
-    if not index:
+    snapshot = atom_index.get()
+    if not snapshot:
         return jsonify({'error': 'Index not found'}), 404
 
-    atoms = sorted(
-        index.get('atoms', []),
-        key=lambda x: x.get('modified', 0),
-        reverse=True
-    )[:limit]
+    atoms = snapshot.recent(limit)
 
     return jsonify({
         'count': len(atoms),
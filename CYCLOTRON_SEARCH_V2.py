@@ -8,20 +8,249 @@ Returns relevant passages with context.
 """
 
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g
 from flask_cors import CORS
 
+from CYCLOTRON_SCHEMA import read_stats
+
 app = Flask(__name__)
 CORS(app)
 
 DB_PATH = Path.home() / '100X_DEPLOYMENT' / '.cyclotron_atoms' / 'cyclotron.db'
 
+# Read connection tuning
+MMAP_SIZE = 256 * 1024 * 1024   # Bytes of the DB mapped into memory
+CACHE_SIZE_KB = 64 * 1024       # Page cache per connection
+RESULT_CACHE_SIZE = 512         # MATCH queries kept in the result LRU
+READ_POOL_SIZE = 8              # Read-only connections kept open across requests
+READ_POOL_WAIT = 2.0            # Seconds to wait for a pooled connection before opening a spare
+
+
+class ReadPool:
+    """
+    Bounded pool of read-only connections shared by all request threads.
+
+    The threaded dev server starts a thread per request, so connections
+    are kept here rather than per thread: each request checks one out
+    (get_db) and the teardown handler returns it. When all size
+    connections are busy for longer than wait_seconds, a spare is opened
+    and closed again on release, so a burst never blocks a request.
+
+    The indexers put the database in WAL mode, so these readers never
+    block (or are blocked by) the writer.
+    """
+
+    def __init__(self, size=READ_POOL_SIZE, wait_seconds=READ_POOL_WAIT):
+        self.size = size
+        self.wait_seconds = wait_seconds
+        self.cond = threading.Condition()
+        self.idle = []      # LIFO keeps the hottest connections in use
+        self.pooled = set()  # id() of connections owned by the pool
+        self.stats = {'checkouts': 0, 'reused': 0, 'opened': 0, 'spares': 0}
+
+    def _open(self):
+        conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True, check_same_thread=False)
+        conn.execute(f'PRAGMA mmap_size = {MMAP_SIZE}')
+        conn.execute(f'PRAGMA cache_size = -{CACHE_SIZE_KB}')
+        conn.execute('PRAGMA query_only = 1')
+        return conn
+
+    def acquire(self):
+        """A connection (return it with release), or None if there is no database yet"""
+        if not DB_PATH.exists():
+            return None
+
+        deadline = time.monotonic() + self.wait_seconds
+        with self.cond:
+            self.stats['checkouts'] += 1
+            while not self.idle and len(self.pooled) >= self.size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats['spares'] += 1
+                    break
+                self.cond.wait(remaining)
+
+            if self.idle:
+                self.stats['reused'] += 1
+                return self.idle.pop()
+            spare = len(self.pooled) >= self.size
+
+        conn = self._open()
+        with self.cond:
+            self.stats['opened'] += 1
+            if not spare:
+                self.pooled.add(id(conn))
+        return conn
+
+    def release(self, conn):
+        with self.cond:
+            if id(conn) in self.pooled:
+                self.idle.append(conn)
+                self.cond.notify()
+                return
+        conn.close()
+
+    def get_stats(self):
+        with self.cond:
+            checkouts = self.stats['checkouts']
+            return {
+                **self.stats,
+                'open': len(self.pooled),
+                'idle': len(self.idle),
+                'reuse_rate': round(self.stats['reused'] / checkouts, 3) if checkouts else 0.0
+            }
+
+
+read_pool = ReadPool()
+
+
 def get_db():
-    """Get database connection"""
-    if not DB_PATH.exists():
-        return None
-    return sqlite3.connect(str(DB_PATH))
+    """The request's read-only connection, checked out of read_pool on first use"""
+    if 'db_conn' not in g:
+        g.db_conn = read_pool.acquire()
+    return g.db_conn
+
+
+@app.teardown_appcontext
+def _release_db(exc):
+    conn = g.pop('db_conn', None)
+    if conn is not None:
+        read_pool.release(conn)
+
+
+class ResultCache:
+    """
+    LRU of MATCH query results, keyed by endpoint + normalized query.
+
+    The whole cache is dropped whenever index_meta.last_indexed changes,
+    so results never outlive the index they were computed from. get()
+    returns the generation it saw; put() drops the result if the index
+    moved on while the query ran.
+    """
+
+    def __init__(self, max_entries=RESULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.generation = None
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _sync(self, conn):
+        try:
+            row = conn.execute("SELECT value FROM index_meta WHERE key = 'last_indexed'").fetchone()
+        except sqlite3.OperationalError:
+            row = None  # No index_meta yet
+        generation = row[0] if row else None
+        if generation != self.generation:
+            self.entries.clear()
+            self.generation = generation
+
+    def get(self, conn, key):
+        """Returns (result or None, generation the lookup was made against)"""
+        with self.lock:
+            self._sync(conn)
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key], self.generation
+            self.misses += 1
+            return None, self.generation
+
+    def put(self, key, value, generation):
+        with self.lock:
+            if generation != self.generation:
+                return  # Computed against an index that has since been replaced
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def get_stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'generation': self.generation
+            }
+
+
+def normalize_match(query):
+    """Collapse whitespace; case is kept because FTS5 operators (OR, NOT) are case-sensitive"""
+    return ' '.join(query.split())
+
+
+class LatencyHistogram:
+    """Fixed log-scale latency buckets (0.05ms .. ~100s) with percentile estimates"""
+
+    BOUNDS_MS = [0.05 * (1.5 ** i) for i in range(36)]
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms):
+        i = 0
+        while i < len(self.BOUNDS_MS) and ms > self.BOUNDS_MS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.total += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, p):
+        """Upper bound of the bucket containing the p-th percentile (max for the overflow bucket)"""
+        if not self.total:
+            return 0.0
+        target = p / 100 * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                if i < len(self.BOUNDS_MS):
+                    return min(round(self.BOUNDS_MS[i], 3), round(self.max_ms, 3))
+                return round(self.max_ms, 3)
+        return round(self.max_ms, 3)
+
+    def summary(self):
+        return {
+            'count': self.total,
+            'mean_ms': round(self.sum_ms / self.total, 3) if self.total else 0.0,
+            'p50_ms': self.percentile(50),
+            'p99_ms': self.percentile(99),
+            'max_ms': round(self.max_ms, 3)
+        }
+
+
+result_cache = ResultCache()
+latency = {}
+latency_lock = threading.Lock()
+
+
+@app.before_request
+def _start_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def _record_latency(response):
+    start = getattr(g, 'request_start', None)
+    if start is not None:
+        ms = (time.perf_counter() - start) * 1000
+        endpoint = request.endpoint or 'unknown'
+        with latency_lock:
+            latency.setdefault(endpoint, LatencyHistogram()).record(ms)
+    return response
+
 
 @app.route('/api/search', methods=['GET'])
 def api_search():
@@ -47,32 +276,43 @@ def api_search():
     cursor = conn.cursor()
 
     try:
+        cache_key = ('search', normalize_match(query), file_type, limit)
+        results, generation = result_cache.get(conn, cache_key)
+        if results is not None:
+            return jsonify({
+                'query': query,
+                'count': len(results),
+                'results': results
+            })
+
         # Build query with optional type filter
         if file_type:
             cursor.execute('''
                 SELECT
-                    path,
-                    name,
-                    type,
-                    snippet(knowledge, 3, '**', '**', '...', 64) as snippet,
-                    modified,
-                    bm25(knowledge) as score
-                FROM knowledge
-                WHERE knowledge MATCH ? AND type = ?
+                    d.path,
+                    d.name,
+                    d.type,
+                    snippet(knowledge_fts, 2, '**', '**', '...', 64) as snippet,
+                    d.modified,
+                    bm25(knowledge_fts) as score
+                FROM knowledge_fts
+                JOIN documents d ON d.id = knowledge_fts.rowid
+                WHERE knowledge_fts MATCH ? AND d.type = ?
                 ORDER BY score
                 LIMIT ?
             ''', (query, file_type, limit))
         else:
             cursor.execute('''
                 SELECT
-                    path,
-                    name,
-                    type,
-                    snippet(knowledge, 3, '**', '**', '...', 64) as snippet,
-                    modified,
-                    bm25(knowledge) as score
-                FROM knowledge
-                WHERE knowledge MATCH ?
+                    d.path,
+                    d.name,
+                    d.type,
+                    snippet(knowledge_fts, 2, '**', '**', '...', 64) as snippet,
+                    d.modified,
+                    bm25(knowledge_fts) as score
+                FROM knowledge_fts
+                JOIN documents d ON d.id = knowledge_fts.rowid
+                WHERE knowledge_fts MATCH ?
                 ORDER BY score
                 LIMIT ?
             ''', (query, limit))
@@ -87,6 +327,7 @@ def api_search():
                 'modified': row[4],
                 'score': round(abs(row[5]), 3)
             })
+        result_cache.put(cache_key, results, generation)
 
         return jsonify({
             'query': query,
@@ -96,8 +337,6 @@ def api_search():
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 @app.route('/api/ask', methods=['GET'])
 def api_ask():
@@ -125,14 +364,24 @@ def api_ask():
         terms = [w for w in question.lower().split() if w not in stopwords and len(w) > 2]
         search_query = ' OR '.join(terms) if terms else question
 
+        cache_key = ('ask', normalize_match(search_query), limit)
+        results, generation = result_cache.get(conn, cache_key)
+        if results is not None:
+            return jsonify({
+                'question': question,
+                'search_terms': terms,
+                'answers': results
+            })
+
         cursor.execute('''
             SELECT
-                path,
-                name,
-                snippet(knowledge, 3, '>>>', '<<<', '...', 100) as snippet,
-                bm25(knowledge) as score
-            FROM knowledge
-            WHERE knowledge MATCH ?
+                d.path,
+                d.name,
+                snippet(knowledge_fts, 2, '>>>', '<<<', '...', 100) as snippet,
+                bm25(knowledge_fts) as score
+            FROM knowledge_fts
+            JOIN documents d ON d.id = knowledge_fts.rowid
+            WHERE knowledge_fts MATCH ?
             ORDER BY score
             LIMIT ?
         ''', (search_query, limit))
@@ -145,6 +394,7 @@ def api_ask():
                 'answer': row[2],
                 'relevance': round(abs(row[3]), 3)
             })
+        result_cache.put(cache_key, results, generation)
 
         return jsonify({
             'question': question,
@@ -154,8 +404,6 @@ def api_ask():
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 @app.route('/api/stats', methods=['GET'])
 def api_stats():
@@ -167,7 +415,20 @@ def api_stats():
     cursor = conn.cursor()
 
     try:
-        # Get metadata
+        # O(types) read of the trigger-maintained summary table
+        stats = read_stats(conn)
+        if stats is not None:
+            return jsonify({
+                'status': 'operational',
+                'last_indexed': stats['last_indexed'],
+                'total_files': stats['total_files'],
+                'total_characters': stats['total_chars'],
+                'total_bytes': stats['total_bytes'],
+                'files_by_type': stats['types']
+            })
+
+        # Databases that predate index_stats are still on the legacy
+        # `knowledge` FTS table (the read-only connection can't migrate them)
         cursor.execute('SELECT key, value FROM index_meta')
         meta = dict(cursor.fetchall())
 
@@ -190,8 +451,6 @@ def api_stats():
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 @app.route('/api/recent', methods=['GET'])
 def api_recent():
@@ -207,7 +466,7 @@ def api_recent():
     try:
         cursor.execute('''
             SELECT path, name, type, preview, modified
-            FROM knowledge
+            FROM documents
             ORDER BY modified DESC
             LIMIT ?
         ''', (limit,))
@@ -229,8 +488,6 @@ def api_recent():
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 @app.route('/api/file', methods=['GET'])
 def api_file():
@@ -249,7 +506,7 @@ def api_file():
     try:
         cursor.execute('''
             SELECT name, type, content, modified
-            FROM knowledge
+            FROM documents
             WHERE path = ?
         ''', (filepath,))
 
@@ -266,16 +523,11 @@ def api_file():
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 @app.route('/api/health', methods=['GET'])
 def api_health():
     """Health check"""
-    conn = get_db()
-    db_exists = conn is not None
-    if conn:
-        conn.close()
+    db_exists = get_db() is not None
 
     return jsonify({
         'status': 'healthy' if db_exists else 'no database',
@@ -283,6 +535,18 @@ def api_health():
         'database_exists': db_exists
     })
 
+@app.route('/api/metrics', methods=['GET'])
+def api_metrics():
+    """Per-endpoint latency percentiles, result cache and read pool stats"""
+    with latency_lock:
+        endpoints = {name: hist.summary() for name, hist in latency.items()}
+
+    return jsonify({
+        'endpoints': endpoints,
+        'result_cache': result_cache.get_stats(),
+        'read_pool': read_pool.get_stats()
+    })
+
 if __name__ == '__main__':
     print("=" * 60)
     print("🌀 CYCLOTRON SEARCH V2 - Full Content Search")
@@ -295,6 +559,7 @@ if __name__ == '__main__':
     print("  /api/recent               - Recently modified")
     print("  /api/file?path=<path>     - Get file content")
     print("  /api/health               - Health check")
+    print("  /api/metrics              - Latency p50/p99 + cache/pool stats")
     print()
     print("Examples:")
     print("  /api/search?q=manipulation+immunity")
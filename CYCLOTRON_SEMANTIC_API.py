@@ -10,46 +10,230 @@ Endpoints:
 - GET /api/similar?path=/path/to/file - Find similar files
 - GET /api/clusters?n=7 - Get concept clusters
 - GET /api/stats - Engine statistics
+- GET /api/hybrid?q=query - BM25 + vector search fused with RRF
+- POST /api/reload - Retry a failed engine warm-up now
 - GET /health - Health check
 
+The engine (model + Chroma) loads in a background thread once the server
+has bound its port. Until it is ready, /health and /api/stats report
+"warming" and /api/semantic and /api/ask fall back to FTS5 keyword results.
+A failed warm-up stays in "error" (still serving the fallback) and is only
+retried after WARMUP_RETRY_SECONDS, or at once via POST /api/reload.
+
 Usage:
     python CYCLOTRON_SEMANTIC_API.py
 """
 
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+from werkzeug.serving import make_server
+import re
 import sys
 import os
+import time
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 # Add parent to path
 sys.path.insert(0, os.path.dirname(__file__))
 
-from SEMANTIC_VECTOR_ENGINE import SemanticVectorEngine
+from SEMANTIC_VECTOR_ENGINE import SemanticVectorEngine, CYCLOTRON_DB, MODEL_NAME
 
 app = Flask(__name__)
 CORS(app)
 
-# Initialize engine on startup
+# Engine is built in the background; requests never wait on it
 print("Initializing Semantic API...")
 engine = None
+engine_state = {'status': 'cold', 'error': None, 'started': None, 'ready_seconds': None, 'retry_at': None}
+engine_lock = threading.Lock()
 
-def get_engine():
+# After a failed warm-up, requests don't restart it (and re-run
+# load_dependencies' pip fallback) until this many seconds have passed
+WARMUP_RETRY_SECONDS = 600
+
+# Hybrid search runs its BM25 and vector legs side by side. Each leg has
+# its own pool, so slow vector legs dropped over budget (still running)
+# can't hold up the FTS legs of later requests
+HYBRID_FTS_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='hybrid-fts')
+HYBRID_VECTOR_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='hybrid-vector')
+RRF_K = 60                 # Reciprocal rank fusion damping constant
+HYBRID_BUDGET_MS = 500     # Default latency budget before the slower leg is dropped
+
+
+def _warm_engine():
+    """Background thread: import heavy libraries, load the model, open Chroma"""
     global engine
+    try:
+        eng = SemanticVectorEngine()
+        eng.warm_up()
+        engine = eng
+        engine_state['ready_seconds'] = round(time.time() - engine_state['started'], 2)
+        engine_state['status'] = 'ready'
+        print(f"Semantic engine ready in {engine_state['ready_seconds']}s")
+    except Exception as e:
+        engine_state['retry_at'] = time.time() + WARMUP_RETRY_SECONDS
+        engine_state['error'] = str(e)
+        engine_state['status'] = 'error'
+        print(f"Semantic engine failed to start: {e} (retry in {WARMUP_RETRY_SECONDS}s or POST /api/reload)")
+
+
+def start_warmup(force=False):
+    """
+    Start loading the engine in the background (idempotent).
+
+    After a failure nothing happens until engine_state['retry_at'],
+    unless force is set (POST /api/reload).
+    """
+    with engine_lock:
+        if engine_state['status'] in ('warming', 'ready'):
+            return False
+        if engine_state['status'] == 'error' and not force and time.time() < engine_state['retry_at']:
+            return False
+        engine_state['status'] = 'warming'
+        engine_state['error'] = None
+        engine_state['retry_at'] = None
+        engine_state['started'] = time.time()
+        threading.Thread(target=_warm_engine, daemon=True, name='semantic-warmup').start()
+        return True
+
+
+def retry_in():
+    """Seconds until a failed warm-up may be retried automatically (None unless failed)"""
+    retry_at = engine_state['retry_at']
+    return max(0, round(retry_at - time.time())) if retry_at else None
+
+
+def get_engine():
+    """The engine if it is ready, else None (kicks off warm-up on first call)"""
     if engine is None:
-        engine = SemanticVectorEngine()
+        start_warmup()
     return engine
 
 
+def warming_response():
+    """503 body for endpoints that need vectors"""
+    return jsonify({
+        'status': engine_state['status'],
+        'error': engine_state['error'],
+        'retry_in': retry_in(),
+        'hint': 'Semantic engine is loading - retry shortly'
+    }), 503
+
+
+def fts_search(query, limit=10):
+    """
+    Keyword fallback over the Cyclotron FTS5 table while the engine warms.
+    Results have the same shape as SemanticVectorEngine.search, with a
+    bm25-derived score in place of cosine similarity.
+    """
+    terms = re.findall(r'\w+', query)
+    if not terms or not CYCLOTRON_DB.exists():
+        return []
+
+    match = ' OR '.join(f'"{t}"' for t in terms)
+    conn = sqlite3.connect(f"file:{CYCLOTRON_DB}?mode=ro", uri=True)
+    try:
+        rows = conn.execute('''
+            SELECT d.path, d.name, snippet(knowledge_fts, 2, '', '', '...', 48), bm25(knowledge_fts) AS score
+            FROM knowledge_fts
+            JOIN documents d ON d.id = knowledge_fts.rowid
+            WHERE knowledge_fts MATCH ?
+            ORDER BY score
+            LIMIT ?
+        ''', (match, limit)).fetchall()
+    finally:
+        conn.close()
+
+    return [{
+        'path': path,
+        'name': name,
+        'preview': snippet,
+        'similarity': None,
+        'score': round(abs(score), 3),
+        'chunk': None
+    } for path, name, snippet, score in rows]
+
+
+def _timed(fn, *args, **kwargs):
+    """Run fn and return (result, elapsed_ms)"""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, round((time.perf_counter() - start) * 1000, 2)
+
+
+def fuse_results(fts_results, vector_results, limit, method='rrf', w_fts=0.5, w_vector=0.5):
+    """
+    Merge BM25 and vector result lists into one ranking, deduplicated by path.
+
+    rrf:      score = sum(weight / (RRF_K + rank)) over the lists a path appears in
+    weighted: score = w_fts * min-max normalized bm25 + w_vector * cosine similarity
+    """
+    fused = {}
+
+    def entry(r):
+        return fused.setdefault(r['path'], {
+            'path': r['path'],
+            'name': r['name'],
+            'snippet': r['preview'],
+            'score': 0.0,
+            'fts_rank': None,
+            'vector_rank': None,
+            'similarity': None
+        })
+
+    if method == 'weighted':
+        bm25 = [r['score'] for r in fts_results]
+        lo, hi = (min(bm25), max(bm25)) if bm25 else (0, 0)
+        for rank, r in enumerate(fts_results, 1):
+            e = entry(r)
+            e['fts_rank'] = rank
+            e['score'] += w_fts * ((r['score'] - lo) / (hi - lo) if hi > lo else 1.0)
+        for rank, r in enumerate(vector_results, 1):
+            e = entry(r)
+            e['vector_rank'] = rank
+            e['similarity'] = r['similarity']
+            e['score'] += w_vector * r['similarity']
+    else:
+        for rank, r in enumerate(fts_results, 1):
+            e = entry(r)
+            e['fts_rank'] = rank
+            e['score'] += w_fts / (RRF_K + rank)
+        for rank, r in enumerate(vector_results, 1):
+            e = entry(r)
+            e['vector_rank'] = rank
+            e['similarity'] = r['similarity']
+            e['score'] += w_vector / (RRF_K + rank)
+            if e['fts_rank'] is None:
+                e['snippet'] = r['preview']
+
+    ranked = sorted(fused.values(), key=lambda e: e['score'], reverse=True)[:limit]
+    for e in ranked:
+        e['score'] = round(e['score'], 6)
+    return ranked
+
+
 @app.route('/health', methods=['GET'])
 def health():
-    """Health check"""
+    """Health check - never blocks on the model"""
+    eng = get_engine()
+    if eng is None:
+        return jsonify({
+            'status': engine_state['status'],
+            'model': MODEL_NAME,
+            'fallback': 'fts',
+            'error': engine_state['error'],
+            'retry_in': retry_in()
+        })
+
     try:
-        eng = get_engine()
         stats = eng.get_stats()
         return jsonify({
             'status': 'healthy',
             'vector_chunks': stats['vector_chunks'],
-            'model': stats['model']
+            'model': stats['model'],
+            'ready_seconds': engine_state['ready_seconds']
         })
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
@@ -66,10 +250,17 @@ def semantic_search():
 
     try:
         eng = get_engine()
-        results = eng.search(query, n_results=limit)
+        if eng is None:
+            results = fts_search(query, limit)
+            mode = 'fts'
+        else:
+            results = eng.search(query, n_results=limit)
+            mode = 'semantic'
 
         return jsonify({
             'query': query,
+            'mode': mode,
+            'engine_status': engine_state['status'],
             'results': results,
             'count': len(results)
         })
@@ -77,6 +268,90 @@ def semantic_search():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/hybrid', methods=['GET'])
+def hybrid_search():
+    """
+    Hybrid retrieval - FTS5 bm25 and vector search run concurrently, then fused.
+
+    Query params:
+      q: search query (required)
+      limit: max results (default 10)
+      method: rrf (default) or weighted
+      w_fts, w_vector: leg weights (default 0.5 each)
+      budget_ms: latency budget; once it expires, a leg still running is dropped
+                 (if neither has finished, the first to finish within a second
+                 budget is kept; past that the request fails with 504)
+    """
+    query = request.args.get('q', '')
+    method = request.args.get('method', 'rrf')
+
+    if not query:
+        return jsonify({'error': 'Query parameter q is required'}), 400
+
+    try:
+        limit = int(request.args.get('limit', 10))
+        w_fts = float(request.args.get('w_fts', 0.5))
+        w_vector = float(request.args.get('w_vector', 0.5))
+        budget_ms = float(request.args.get('budget_ms', HYBRID_BUDGET_MS))
+    except ValueError:
+        return jsonify({'error': 'limit, w_fts, w_vector and budget_ms must be numbers'}), 400
+    if not 0 < budget_ms < float('inf'):
+        return jsonify({'error': 'budget_ms must be a positive number'}), 400
+
+    start = time.perf_counter()
+    depth = limit * 3
+    timing = {}
+    dropped = []
+
+    legs = {'fts': HYBRID_FTS_POOL.submit(_timed, fts_search, query, depth)}
+    eng = get_engine()
+    if eng is not None:
+        legs['vector'] = HYBRID_VECTOR_POOL.submit(_timed, eng.search, query, n_results=depth)
+    else:
+        dropped.append({'leg': 'vector', 'reason': engine_state['status']})
+
+    # Past the budget, keep whichever leg finishes first (within one more
+    # budget) and drop the other
+    done, _ = wait(legs.values(), timeout=budget_ms / 1000.0)
+    if not done:
+        done, _ = wait(legs.values(), timeout=budget_ms / 1000.0, return_when=FIRST_COMPLETED)
+
+    results = {'fts': [], 'vector': []}
+    for leg, future in legs.items():
+        if not future.done():
+            future.cancel()  # Frees the pool slot if it never started
+            dropped.append({'leg': leg, 'reason': 'over budget'})
+            continue
+        try:
+            results[leg], timing[f'{leg}_ms'] = future.result()
+        except Exception as e:
+            dropped.append({'leg': leg, 'reason': str(e)})
+
+    if not done:
+        return jsonify({
+            'error': f'No search leg finished within {2 * budget_ms:g}ms',
+            'query': query,
+            'budget_ms': budget_ms,
+            'dropped': dropped
+        }), 504
+
+    fusion_start = time.perf_counter()
+    fused = fuse_results(results['fts'], results['vector'], limit, method, w_fts, w_vector)
+    timing['fusion_ms'] = round((time.perf_counter() - fusion_start) * 1000, 2)
+    timing['total_ms'] = round((time.perf_counter() - start) * 1000, 2)
+
+    return jsonify({
+        'query': query,
+        'method': method,
+        'engine_status': engine_state['status'],
+        'budget_ms': budget_ms,
+        'timing': timing,
+        'dropped': dropped,
+        'results': fused,
+        'count': len(fused)
+    })
+
+
 @app.route('/api/similar', methods=['GET'])
 def find_similar():
     """Find files similar to a given file"""
@@ -86,8 +361,11 @@ def find_similar():
     if not path:
         return jsonify({'error': 'Parameter path is required'}), 400
 
+    eng = get_engine()
+    if eng is None:
+        return warming_response()
+
     try:
-        eng = get_engine()
         results = eng.find_similar(path, n_results=limit)
 
         return jsonify({
@@ -104,8 +382,11 @@ def get_clusters():
     """Get concept clusters (maps to Seven Domains)"""
     n = int(request.args.get('n', 7))
 
+    eng = get_engine()
+    if eng is None:
+        return warming_response()
+
     try:
-        eng = get_engine()
         clusters = eng.cluster_concepts(n_clusters=n)
 
         # Format for API response
@@ -128,14 +409,28 @@ def get_clusters():
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get engine statistics"""
+    eng = get_engine()
+    if eng is None:
+        return jsonify({
+            'status': engine_state['status'],
+            'model': MODEL_NAME,
+            'error': engine_state['error']
+        })
+
     try:
-        eng = get_engine()
         stats = eng.get_stats()
         return jsonify(stats)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/reload', methods=['POST'])
+def reload_engine():
+    """Retry a failed warm-up immediately (no-op while warming or ready)"""
+    started = start_warmup(force=True)
+    return jsonify({'started': started, 'status': engine_state['status']})
+
+
 @app.route('/api/ask', methods=['GET'])
 def ask_semantic():
     """Natural language question - semantic version"""
@@ -147,7 +442,12 @@ def ask_semantic():
 
     try:
         eng = get_engine()
-        results = eng.search(question, n_results=limit)
+        if eng is None:
+            results = fts_search(question, limit)
+            mode = 'fts'
+        else:
+            results = eng.search(question, n_results=limit)
+            mode = 'semantic'
 
         # Format as answers
         answers = []
@@ -156,11 +456,13 @@ def ask_semantic():
                 'source': r['name'],
                 'path': r['path'],
                 'answer': r['preview'],
-                'relevance': f"{r['similarity']:.1%}"
+                'relevance': f"{r['similarity']:.1%}" if r['similarity'] is not None else r['score']
             })
 
         return jsonify({
             'question': question,
+            'mode': mode,
+            'engine_status': engine_state['status'],
             'answers': answers
         })
     except Exception as e:
@@ -175,6 +477,11 @@ if __name__ == '__main__':
     print("  GET /api/clusters?n=7      - Concept clusters")
     print("  GET /api/stats             - Engine stats")
     print("  GET /api/ask?q=question    - Natural language")
+    print("  GET /api/hybrid?q=query    - BM25 + vector (RRF)")
+    print("  POST /api/reload           - Retry failed engine load")
     print()
 
-    app.run(host='0.0.0.0', port=6670, debug=False)
+    # Bind first so /health answers immediately, then load the model
+    server = make_server('0.0.0.0', 6670, app, threaded=True)
+    start_warmup()
+    server.serve_forever()
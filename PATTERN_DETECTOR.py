@@ -3,14 +3,30 @@
 PATTERN DETECTOR
 Analyzes text for manipulation patterns across the 7 domains.
 Core consciousness tool for manipulation immunity.
+
+Indicators are compiled once per detector. analyze() scans the text once
+with a combined regex (indicators grouped by first character) to find
+every position where some indicator matches, then matches only the
+indicators that can start there, so findings are attributed back to
+their pattern and domain. Results are the same as running re.findall
+for every indicator.
 """
 
 import re
 import json
+from collections import defaultdict, deque
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
 
+DETECTION_HISTORY_SIZE = 100  # Most recent analyze() results kept
+
+# Characters a lowercased text can contain that still match an ASCII
+# indicator under re.IGNORECASE (dotless i, long s). Without them the
+# lowercased text can be scanned case-sensitively, which lets the regex
+# engine skip ahead on literal prefixes.
+CASE_FOLD_CHARS = ("\u0131", "\u017f")
+
 # Pattern definitions by domain
 MANIPULATION_PATTERNS = {
     "gaslighting": {
@@ -147,12 +163,116 @@ MANIPULATION_PATTERNS = {
     }
 }
 
+def _literal_first_char(source: str) -> Optional[str]:
+    """First character if the indicator always starts with it, else None."""
+    if not source[:1].isalnum() or source[1:2] in ("?", "*", "+", "{"):
+        return None
+
+    # A top-level "|" means other branches may start differently
+    depth = 0
+    escaped = False
+    for char in source:
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return None
+    return source[0]
+
 class PatternDetector:
     """Detect manipulation patterns in text."""
 
     def __init__(self):
         self.patterns = MANIPULATION_PATTERNS
-        self.detection_history = []
+        self.detection_history = deque(maxlen=DETECTION_HISTORY_SIZE)
+        self._compile()
+
+    def _compile(self):
+        """Compile every indicator and the combined scanner (once)."""
+        # (pattern_name, indicator regex), in MANIPULATION_PATTERNS order
+        self.indicators = []
+        self.folded_indicators = []
+        # First character -> indicators starting with that literal
+        self.by_first_char = defaultdict(list)
+        # Indicators that start with a group (tried at every candidate)
+        self.other_indicators = []
+
+        branches = defaultdict(list)
+        other_branches = []
+
+        for pattern_name, pattern_data in self.patterns.items():
+            for indicator in pattern_data["indicators"]:
+                index = len(self.indicators)
+                self.indicators.append((pattern_name, re.compile(indicator)))
+                self.folded_indicators.append((pattern_name, re.compile(indicator, re.IGNORECASE)))
+
+                # The scanner only needs positions, so drop capture groups
+                source = re.sub(r"(?<!\\)\((?!\?)", "(?:", indicator)
+                first = _literal_first_char(source)
+                if first:
+                    self.by_first_char[first].append(index)
+                    branches[first].append(source[1:])
+                else:
+                    self.other_indicators.append(index)
+                    other_branches.append(source)
+
+        scanner = other_branches + [
+            f"{first}(?:{'|'.join(rests)})" for first, rests in branches.items()
+        ]
+        self.scanner = re.compile("|".join(scanner))
+        self.folded_scanner = re.compile("|".join(scanner), re.IGNORECASE)
+
+    def _find_matches(self, text_lower: str) -> list:
+        """
+        Single-pass equivalent of re.findall for every indicator.
+
+        Returns:
+            One list of findings per indicator (in self.indicators order)
+        """
+        found = [[] for _ in self.indicators]
+        next_start = [0] * len(self.indicators)
+
+        folded = any(c in text_lower for c in CASE_FOLD_CHARS)
+        if folded:
+            indicators = self.folded_indicators
+            scanner = self.folded_scanner
+        else:
+            indicators = self.indicators
+            scanner = self.scanner
+
+        pos = 0
+        while True:
+            hit = scanner.search(text_lower, pos)
+            if not hit:
+                break
+            pos = hit.start()
+
+            if folded:
+                candidates = range(len(indicators))
+            else:
+                candidates = self.by_first_char.get(text_lower[pos], []) + self.other_indicators
+
+            for index in candidates:
+                # findall never overlaps matches of the same indicator
+                if pos < next_start[index]:
+                    continue
+                match = indicators[index][1].match(text_lower, pos)
+                if match:
+                    groups = match.groups(default="")
+                    if not groups:
+                        found[index].append(match.group(0))
+                    else:
+                        found[index].append(groups[0] if len(groups) == 1 else groups)
+                    next_start[index] = match.end()
+
+            pos += 1
+
+        return found
 
     def analyze(self, text: str) -> dict:
         """
@@ -167,14 +287,14 @@ class PatternDetector:
             "media", "relationships", "finance", "authority", "self", "groups", "digital"
         ]}
 
+        # One scan for all indicators, grouped back by pattern
+        pattern_matches = {pattern_name: [] for pattern_name in self.patterns}
+        for (pattern_name, _), found in zip(self.indicators, self._find_matches(text_lower)):
+            pattern_matches[pattern_name].extend(found)
+
         # Check each pattern
         for pattern_name, pattern_data in self.patterns.items():
-            matches = []
-
-            for indicator in pattern_data["indicators"]:
-                found = re.findall(indicator, text_lower, re.IGNORECASE)
-                if found:
-                    matches.extend(found)
+            matches = pattern_matches[pattern_name]
 
             if matches:
                 severity_scores = {"low": 1, "medium": 2, "high": 3}
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+PATTERN DETECTOR BENCHMARK - Per-indicator findall vs single-pass scan
+======================================================================
+
+Times PatternDetector.analyze two ways:
+
+- findall: what analyze used to do - re.findall(indicator, text_lower,
+           re.IGNORECASE) with the uncompiled string of every indicator
+- scan:    the detector's precompiled indicators and combined scanner
+
+Both are checked to produce the same detections before timing.
+
+Usage:
+    python PATTERN_DETECTOR_BENCHMARK.py                # Synthetic 1KB/10KB/100KB inputs
+    python PATTERN_DETECTOR_BENCHMARK.py <file>         # Benchmark a real text file
+    Options: --sizes=1000,100000 (synthetic sizes), --runs=N (repetitions)
+"""
+
+import re
+import sys
+import time
+import random
+from pathlib import Path
+
+from PATTERN_DETECTOR import PatternDetector, MANIPULATION_PATTERNS
+
+SIZES = [1000, 10000, 100000]
+RUNS = 20
+
+FILLER = (
+    "the team will review the plan and share results with everyone by friday "
+    "we looked at the numbers and the budget looks fine for this quarter "
+    "please send the updated draft when you have a moment "
+).split()
+
+PHRASES = [
+    "you're overreacting", "that never happened", "you owe me", "act now",
+    "only 3 left", "experts agree", "before it's too late", "poor me",
+    "i promise i'll", "next time", "whatever", "you're so selfish",
+    "everyone thinks", "limited time", "because i said so", "just wait"
+]
+
+
+def findall_matches(text):
+    """Matches per pattern the way analyze used to collect them"""
+    text_lower = text.lower()
+    matches = {}
+    for pattern_name, pattern_data in MANIPULATION_PATTERNS.items():
+        found = []
+        for indicator in pattern_data["indicators"]:
+            found.extend(re.findall(indicator, text_lower, re.IGNORECASE))
+        matches[pattern_name] = found
+    return matches
+
+
+def scan_matches(detector, text):
+    """Matches per pattern from the single-pass scan"""
+    matches = {pattern_name: [] for pattern_name in MANIPULATION_PATTERNS}
+    for (pattern_name, _), found in zip(detector.indicators, detector._find_matches(text.lower())):
+        matches[pattern_name].extend(found)
+    return matches
+
+
+def synthetic_text(size, seed=42):
+    """About `size` characters of filler sprinkled with indicator phrases"""
+    rng = random.Random(seed)
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(PHRASES) if rng.random() < 0.02 else rng.choice(FILLER)
+        words.append(word)
+        length += len(word) + 1
+    return ' '.join(words)[:size].capitalize()
+
+
+def time_ms(fn, runs):
+    """Median milliseconds per call"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main():
+    sizes = SIZES
+    runs = RUNS
+    source = None
+    for arg in sys.argv[1:]:
+        if arg.startswith('--sizes='):
+            sizes = [int(s) for s in arg.split('=', 1)[1].split(',')]
+        elif arg.startswith('--runs='):
+            runs = int(arg.split('=', 1)[1])
+        else:
+            source = arg
+
+    print("=" * 60)
+    print("🔍 PATTERN DETECTOR BENCHMARK")
+    print("   per-indicator re.findall vs precompiled single-pass scan")
+    print("=" * 60)
+    print()
+
+    if source:
+        with open(source, 'r', encoding='utf-8', errors='ignore') as f:
+            texts = [(Path(source).name, f.read())]
+    else:
+        texts = [(f"{size:,} chars", synthetic_text(size)) for size in sizes]
+
+    detector = PatternDetector()
+    print(f"   {len(MANIPULATION_PATTERNS)} patterns, {len(detector.indicators)} indicators")
+    print()
+
+    print(f"{'input':>16}{'findall (ms)':>15}{'scan (ms)':>12}{'speedup':>10}{'analyze (ms)':>15}")
+    print("-" * 68)
+    for label, text in texts:
+        if findall_matches(text) != scan_matches(detector, text):
+            print(f"❌ Matches differ for {label}")
+            return
+
+        legacy = time_ms(lambda: findall_matches(text), runs)
+        single = time_ms(lambda: scan_matches(detector, text), runs)
+        analyze = time_ms(lambda: detector.analyze(text), runs)
+        print(f"{label:>16}{legacy:>15.3f}{single:>12.3f}{legacy / single:>9.1f}x{analyze:>15.3f}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
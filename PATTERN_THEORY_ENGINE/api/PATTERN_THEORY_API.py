@@ -8,23 +8,50 @@ Endpoints:
 - score_consciousness(pr, pa, ns) → Consciousness level
 - analyze_situation(situation, context) → Full analysis
 - seven_domains_check(domain, input) → Domain-specific analysis
+- stream_batch(items) → Full analysis of many texts across worker processes
+- analyze_stream(chunks) → analyze() for very long text, in constant memory
 
 Created: 2025-11-22
 Trinity Build: C1 × C2 × C3
 """
 
+import os
 import sys
 import json
+import time
+import threading
+import multiprocessing
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
 
-# Add core to path
+# Add core and projection to path
 CORE_DIR = Path(__file__).parent.parent / "core"
+PROJECTION_DIR = Path(__file__).parent.parent / "projection"
 sys.path.insert(0, str(CORE_DIR))
+sys.path.insert(0, str(PROJECTION_DIR))
 
-from PATTERN_THEORY_ENGINE import PatternTheoryEngine, analyze_situation
+from PATTERN_THEORY_ENGINE import PatternTheoryEngine, analyze_situation, STREAM_WINDOW_CHARS
 from CONSCIOUSNESS_SCORER import ConsciousnessScorer, score_consciousness
+from SEVEN_DOMAINS_ANALYZER import SevenDomainsAnalyzer
+from RESULT_CACHE import ResultCache
+
+# Batch mode
+BATCH_MAX_ITEMS = 50000
+BATCH_MAX_BYTES = 64 * 1024 * 1024  # UTF-8 size of all item texts and contexts
+BATCH_CHUNK_SIZE = 200  # Items per worker task
+BATCH_WORKERS = os.cpu_count() or 1
+BATCH_INFLIGHT_PER_WORKER = 2  # Chunks queued per worker while streaming
+# Batch processes are never forked from the (threaded) server process: a
+# fork can copy a lock another thread holds and deadlock the child
+BATCH_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+class BatchLimitError(ValueError):
+    """Batch exceeds BATCH_MAX_ITEMS or BATCH_MAX_BYTES."""
+
 
 class PatternTheoryAPI:
     """
@@ -44,66 +71,164 @@ class PatternTheoryAPI:
         7: "Transparency/Trust"
     }
 
-    def __init__(self):
+    def __init__(self, cache_db: Optional[str] = None):
         self.pattern_engine = PatternTheoryEngine()
         self.consciousness_scorer = ConsciousnessScorer()
+        self.domains_analyzer = SevenDomainsAnalyzer()
         self.call_count = 0
 
-    def analyze(self, text: str, context: Optional[str] = None) -> Dict[str, Any]:
+        # Results by content hash; cache_db adds a SQLite tier shared across processes
+        self.result_cache = ResultCache(cache_db)
+
+        # Worker processes for stream_batch (created on first use)
+        self.batch_pool = None
+        self.batch_pool_workers = 0
+        self.batch_pool_users = {}  # pool -> batches streaming from it
+        self.batch_pool_lock = threading.Lock()
+
+    def analyze(self, text: str, context: Optional[str] = None, use_cache: bool = True) -> Dict[str, Any]:
         """
         Primary analysis endpoint.
 
         Args:
             text: Text to analyze
             context: Optional context
+            use_cache: False to recompute (the fresh result is still cached)
 
         Returns:
             Complete analysis with truth/deceit scores, patterns, recommendations
         """
         self.call_count += 1
 
+        analysis, source = self.result_cache.get_or_compute(
+            "analyze", text, context, lambda: self._analysis(text, context), bypass=not use_cache
+        )
+
+        return {
+            "success": True,
+            "timestamp": datetime.now().isoformat(),
+            "api_version": "1.0.0",
+            "analysis": analysis,
+            "metadata": {
+                "call_count": self.call_count,
+                "input_length": len(text),
+                "cache": source
+            }
+        }
+
+    def _analysis(self, text: str, context: Optional[str]) -> Dict[str, Any]:
+        """Pattern and consciousness sections of analyze()."""
         # Get pattern analysis
         pattern_result = self.pattern_engine.analyze(text, context)
 
         # Get consciousness indicators from text
         consciousness_result = self.consciousness_scorer.score_from_text(text)
 
+        return self._sections(pattern_result, consciousness_result)
+
+    def _sections(self, pattern_result, consciousness_result) -> Dict[str, Any]:
+        """analysis["pattern"] and analysis["consciousness"] from the analyzer results."""
         return {
+            "pattern": {
+                "algorithm": pattern_result.algorithm,
+                "truth_score": pattern_result.truth_score,
+                "deceit_score": pattern_result.deceit_score,
+                "pattern_type": pattern_result.pattern_type,
+                "fifteen_degree_turns": pattern_result.fifteen_degree_turns,
+                "golden_ratio_alignment": pattern_result.golden_ratio_alignment,
+                "recommendation": pattern_result.recommended_action,
+                "confidence": pattern_result.confidence
+            },
+            "consciousness": {
+                "level": consciousness_result.consciousness_level,
+                "level_name": consciousness_result.level_name,
+                "manipulation_immunity": consciousness_result.manipulation_immunity,
+                "pattern_recognition": consciousness_result.pattern_recognition,
+                "prediction_accuracy": consciousness_result.prediction_accuracy,
+                "neutralization_success": consciousness_result.neutralization_success
+            }
+        }
+
+    def full_analyze(self, text: str, context: Optional[str] = None, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        analyze() plus the seven domains breakdown.
+
+        Args:
+            text: Text to analyze
+            context: Optional context
+            use_cache: False to recompute (the fresh result is still cached)
+
+        Returns:
+            analyze() result with analysis["domains"] added
+        """
+        result = self.analyze(text, context, use_cache)
+        result["analysis"]["domains"], _ = self.result_cache.get_or_compute(
+            "domains", text, context,
+            lambda: self.domains_analyzer.to_dict(self.domains_analyzer.analyze(text, context))["result"],
+            bypass=not use_cache
+        )
+        return result
+
+    def analyze_stream(
+        self,
+        chunks: Iterable[str],
+        context: Optional[str] = None,
+        timeline: bool = False,
+        window_chars: int = STREAM_WINDOW_CHARS
+    ) -> Dict[str, Any]:
+        """
+        analyze() for very long text delivered in pieces (files, request bodies).
+
+        The text is analyzed in sentence-aligned windows as it arrives and
+        never held in memory as a whole, so results are not cached.
+
+        Args:
+            chunks: Pieces of the text, in order
+            context: Optional context
+            timeline: Add per-window scores as result["timeline"]
+            window_chars: Largest window analyzed at once
+
+        Returns:
+            Same shape as analyze(), plus "timeline" if requested
+        """
+        self.call_count += 1
+
+        windows = []
+        stream = self.pattern_engine.stream(window_chars, windows.append if timeline else None)
+        for chunk in chunks:
+            stream.feed(chunk)
+        pattern_result = stream.finish()
+
+        consciousness_result = self.consciousness_scorer.score_from_hits(frozenset(stream.hits))
+
+        result = {
             "success": True,
             "timestamp": datetime.now().isoformat(),
             "api_version": "1.0.0",
-            "analysis": {
-                "pattern": {
-                    "algorithm": pattern_result.algorithm,
-                    "truth_score": pattern_result.truth_score,
-                    "deceit_score": pattern_result.deceit_score,
-                    "pattern_type": pattern_result.pattern_type,
-                    "fifteen_degree_turns": pattern_result.fifteen_degree_turns,
-                    "golden_ratio_alignment": pattern_result.golden_ratio_alignment,
-                    "recommendation": pattern_result.recommended_action,
-                    "confidence": pattern_result.confidence
-                },
-                "consciousness": {
-                    "level": consciousness_result.consciousness_level,
-                    "level_name": consciousness_result.level_name,
-                    "manipulation_immunity": consciousness_result.manipulation_immunity,
-                    "pattern_recognition": consciousness_result.pattern_recognition,
-                    "prediction_accuracy": consciousness_result.prediction_accuracy,
-                    "neutralization_success": consciousness_result.neutralization_success
-                }
-            },
+            "analysis": self._sections(pattern_result, consciousness_result),
             "metadata": {
                 "call_count": self.call_count,
-                "input_length": len(text)
+                "input_length": stream.chars,
+                "windows": stream.windows,
+                "cache": "stream"
             }
         }
+        if timeline:
+            result["timeline"] = windows
+        return result
 
-    def quick_check(self, text: str) -> str:
+    def quick_check(self, text: str, use_cache: bool = True) -> str:
         """
         Quick truth/deceit check.
 
         Returns: "TRUTH", "DECEIT", or "NEUTRAL"
         """
+        verdict, _ = self.result_cache.get_or_compute(
+            "quick", text, None, lambda: self._quick_check(text), bypass=not use_cache
+        )
+        return verdict
+
+    def _quick_check(self, text: str) -> str:
         result = self.pattern_engine.analyze(text)
 
         if result.confidence < 0.3:
@@ -154,7 +279,8 @@ class PatternTheoryAPI:
     def seven_domains_analysis(
         self,
         domain_number: int,
-        situation: str
+        situation: str,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Analyze situation within a specific domain context.
@@ -162,6 +288,7 @@ class PatternTheoryAPI:
         Args:
             domain_number: 1-7
             situation: Situation to analyze
+            use_cache: False to recompute (the fresh result is still cached)
 
         Returns:
             Domain-contextualized analysis
@@ -170,7 +297,7 @@ class PatternTheoryAPI:
 
         # Add domain context to analysis
         context = f"Domain {domain_number}: {domain_name}"
-        result = self.analyze(situation, context)
+        result = self.analyze(situation, context, use_cache)
 
         # Add domain-specific recommendations
         domain_guidance = self._get_domain_guidance(domain_number, result)
@@ -221,22 +348,24 @@ class PatternTheoryAPI:
 
         return guidance_map.get(domain, {}).get(algorithm, "No specific guidance available.")
 
-    def batch_analyze(self, items: list) -> Dict[str, Any]:
+    def batch_analyze(self, items: list, use_cache: bool = True) -> Dict[str, Any]:
         """
-        Analyze multiple items at once.
+        Quick-check multiple items at once.
 
         Args:
             items: List of texts to analyze
+            use_cache: False to recompute every item
 
         Returns:
             Batch results with summary
         """
+        items = [text for text, _ in self.validate_batch(items)]
         results = []
         truth_count = 0
         deceit_count = 0
 
         for item in items:
-            result = self.quick_check(item)
+            result = self.quick_check(item, use_cache)
             results.append({
                 "text": item[:100] + "..." if len(item) > 100 else item,
                 "result": result
@@ -260,6 +389,269 @@ class PatternTheoryAPI:
             "results": results
         }
 
+    def validate_batch(self, items: list, context: Optional[str] = None) -> List[Tuple[str, Optional[str]]]:
+        """
+        Check a batch against the limits and normalize it.
+
+        Args:
+            items: Texts, or {"text": ..., "context": ...} objects
+            context: Default context for items without their own
+
+        Returns:
+            List of (text, context) pairs
+
+        Raises:
+            BatchLimitError: Too many items or too many bytes
+            ValueError: Malformed items
+        """
+        if not isinstance(items, list):
+            raise ValueError("'items' must be a list")
+        if len(items) > BATCH_MAX_ITEMS:
+            raise BatchLimitError(f"Batch has {len(items)} items (max {BATCH_MAX_ITEMS})")
+
+        pairs = []
+        total_bytes = 0
+        for index, item in enumerate(items):
+            if isinstance(item, dict):
+                text, item_context = item.get("text"), item.get("context", context)
+            else:
+                text, item_context = item, context
+
+            if not isinstance(text, str):
+                raise ValueError(f"Item {index} has no text")
+            if item_context is not None and not isinstance(item_context, str):
+                raise ValueError(f"Item {index} context must be a string")
+
+            total_bytes += len(text.encode("utf-8"))
+            if item_context:
+                total_bytes += len(item_context.encode("utf-8"))
+            if total_bytes > BATCH_MAX_BYTES:
+                raise BatchLimitError(f"Batch exceeds {BATCH_MAX_BYTES} bytes")
+
+            pairs.append((text, item_context))
+
+        return pairs
+
+    def stream_batch(
+        self,
+        items: list,
+        context: Optional[str] = None,
+        workers: int = BATCH_WORKERS,
+        chunk_size: int = BATCH_CHUNK_SIZE,
+        use_cache: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Full analysis (pattern + consciousness + domains) of a batch.
+
+        Items are split into chunks and dispatched to a pool of worker
+        processes. Results are yielded as each chunk finishes, so they
+        arrive out of order; every record carries its item index. The
+        last record is the aggregate summary. Limits are checked before
+        anything runs.
+
+        Args:
+            items: Texts, or {"text": ..., "context": ...} objects
+            context: Default context for items without their own
+            workers: Worker processes (1 = analyze in this process)
+            chunk_size: Items per worker task
+            use_cache: False to recompute every item
+
+        Returns:
+            Iterator of {"type": "result", ...} records, then one
+            {"type": "summary", ...} record
+
+        Raises:
+            BatchLimitError: Too many items or too many bytes
+            ValueError: Malformed items
+        """
+        pairs = self.validate_batch(items, context)
+        return self._run_batch(pairs, max(1, workers), max(1, chunk_size), use_cache)
+
+    def _run_batch(self, pairs, workers, chunk_size, use_cache):
+        """Generator behind stream_batch."""
+        started = time.perf_counter()
+        chunks = [(start, pairs[start:start + chunk_size]) for start in range(0, len(pairs), chunk_size)]
+
+        summary = {
+            "completed": 0,
+            "errors": 0,
+            "truth_count": 0,
+            "deceit_count": 0,
+            "neutral_count": 0
+        }
+        item_ms = []
+
+        def tally(records):
+            for record in records:
+                summary["completed"] += 1
+                item_ms.append(record["elapsed_ms"])
+                if "error" in record:
+                    summary["errors"] += 1
+                else:
+                    summary[f"{_verdict(record['result']).lower()}_count"] += 1
+
+        if workers == 1 or len(chunks) == 1:
+            # Not worth starting processes for
+            for start, chunk in chunks:
+                records = _analyze_chunk(self, start, chunk, use_cache)
+                tally(records)
+                yield from records
+        else:
+            pool = self._get_batch_pool(workers)
+            pending = set()
+            queue = iter(chunks)
+            max_inflight = workers * BATCH_INFLIGHT_PER_WORKER
+            try:
+                while True:
+                    for start, chunk in queue:
+                        pending.add(pool.submit(_batch_worker, start, chunk, use_cache))
+                        if len(pending) >= max_inflight:
+                            break
+                    if not pending:
+                        break
+
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        try:
+                            records = future.result()
+                        except BrokenProcessPool:
+                            self._reset_batch_pool(pool)
+                            raise
+                        tally(records)
+                        yield from records
+            finally:
+                # Client went away or a worker died: drop queued chunks
+                for future in pending:
+                    future.cancel()
+                self._release_batch_pool(pool)
+
+        wall_ms = (time.perf_counter() - started) * 1000
+        item_ms.sort()
+        total = len(pairs)
+
+        yield {
+            "type": "summary",
+            "success": True,
+            "timestamp": datetime.now().isoformat(),
+            "batch_size": total,
+            "summary": dict(summary, truth_ratio=summary["truth_count"] / total if total else 0),
+            "timing": {
+                "wall_ms": round(wall_ms, 2),
+                "items_per_second": round(total / (wall_ms / 1000), 1) if wall_ms else 0,
+                "item_ms": {
+                    "total": round(sum(item_ms), 2),
+                    "mean": round(sum(item_ms) / len(item_ms), 3) if item_ms else 0,
+                    "p50": _percentile(item_ms, 0.50),
+                    "p95": _percentile(item_ms, 0.95),
+                    "max": item_ms[-1] if item_ms else 0
+                },
+                "workers": workers if len(chunks) > 1 else 1,
+                "chunk_size": chunk_size,
+                "chunks": len(chunks)
+            }
+        }
+
+    def _get_batch_pool(self, workers: int) -> ProcessPoolExecutor:
+        """
+        Shared worker pool, created on first use or when the size changes.
+
+        Callers hold a reference until _release_batch_pool. A pool replaced
+        by a different size keeps serving the batches already streaming
+        from it and shuts down when the last of them releases it.
+        """
+        with self.batch_pool_lock:
+            if self.batch_pool is None or self.batch_pool_workers != workers:
+                old = self.batch_pool
+                if old is not None and not self.batch_pool_users.get(old):
+                    old.shutdown(wait=False, cancel_futures=False)
+                self.batch_pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context(BATCH_START_METHOD),
+                    initializer=_init_batch_worker,
+                    initargs=(self.result_cache.db_path,)
+                )
+                self.batch_pool_workers = workers
+            pool = self.batch_pool
+            self.batch_pool_users[pool] = self.batch_pool_users.get(pool, 0) + 1
+            return pool
+
+    def _release_batch_pool(self, pool: ProcessPoolExecutor):
+        """Drop a batch's reference; shut the pool down if it was replaced and is now unused."""
+        with self.batch_pool_lock:
+            users = self.batch_pool_users.get(pool, 0) - 1
+            if users > 0:
+                self.batch_pool_users[pool] = users
+                return
+            self.batch_pool_users.pop(pool, None)
+            if pool is self.batch_pool:
+                return
+        pool.shutdown(wait=False, cancel_futures=False)
+
+    def _reset_batch_pool(self, pool: ProcessPoolExecutor):
+        """Forget a broken pool so the next batch starts a fresh one."""
+        with self.batch_pool_lock:
+            if self.batch_pool is pool:
+                self.batch_pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        """Shut down batch worker processes (including replaced pools still in use)."""
+        with self.batch_pool_lock:
+            pools = set(self.batch_pool_users)
+            if self.batch_pool is not None:
+                pools.add(self.batch_pool)
+            self.batch_pool = None
+        for pool in pools:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+# ============================================================================
+# BATCH WORKERS
+# ============================================================================
+
+_worker_api: Optional[PatternTheoryAPI] = None
+
+
+def _init_batch_worker(cache_db: Optional[str]):
+    """Build the analyzers once per worker process (sharing the cache database)."""
+    global _worker_api
+    _worker_api = PatternTheoryAPI(cache_db)
+
+
+def _batch_worker(start: int, chunk: list, use_cache: bool) -> List[Dict[str, Any]]:
+    """Process pool entry point."""
+    return _analyze_chunk(_worker_api, start, chunk, use_cache)
+
+
+def _analyze_chunk(api: PatternTheoryAPI, start: int, chunk: list, use_cache: bool = True) -> List[Dict[str, Any]]:
+    """Full analysis of each (text, context) pair, timed per item."""
+    records = []
+    for offset, (text, context) in enumerate(chunk):
+        item_start = time.perf_counter()
+        record = {"type": "result", "index": start + offset}
+        try:
+            record["result"] = api.full_analyze(text, context, use_cache)
+        except Exception as e:
+            record["error"] = str(e)
+        record["elapsed_ms"] = round((time.perf_counter() - item_start) * 1000, 3)
+        records.append(record)
+    return records
+
+
+def _verdict(result: Dict[str, Any]) -> str:
+    """TRUTH/DECEIT/NEUTRAL for an analyze() result, as quick_check decides."""
+    pattern = result["analysis"]["pattern"]
+    if pattern["confidence"] < 0.3:
+        return "NEUTRAL"
+    return pattern["algorithm"].upper()
+
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
 
 # Convenience functions for quick access
 _api = PatternTheoryAPI()
@@ -0,0 +1,228 @@
+"""
+REQUEST METRICS - Per-Route Counts, Latencies and In-Flight Requests
+=====================================================================
+Each server process records, per route:
+
+- requests by status class (2xx/3xx/4xx/5xx)
+- requests currently in flight
+- latency as a fixed-bucket histogram (mergeable across processes)
+  plus sum and max
+
+Under gunicorn every worker is a separate process. With a snapshot
+directory configured, each worker writes its counters to <dir>/<pid>.json
+at most every METRICS_FLUSH_SECONDS (a timer writes trailing updates
+after a burst), and report() merges every worker's snapshot, so /metrics
+shows the whole server whichever worker answers. The answering worker's
+own numbers are always live; other workers' are at most
+METRICS_FLUSH_SECONDS old.
+
+Created: 2025-11-22
+Trinity Build: C1 Mechanic
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Any, Dict, Optional
+
+# Upper bounds of the latency buckets (last bucket is everything above)
+LATENCY_BOUNDS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+METRICS_FLUSH_SECONDS = 1.0
+
+
+def _new_route() -> Dict[str, Any]:
+    return {
+        "requests": 0,
+        "in_flight": 0,
+        "status": {},
+        "buckets": [0] * (len(LATENCY_BOUNDS_MS) + 1),
+        "sum_ms": 0.0,
+        "max_ms": 0.0
+    }
+
+
+class RequestMetrics:
+    """Request counters for one process, optionally merged across workers."""
+
+    def __init__(self, snapshot_dir: Optional[str] = None):
+        self.routes: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.snapshot_dir = snapshot_dir
+        self.last_flush = 0.0
+        self.flush_timer: Optional[threading.Timer] = None
+
+    def start(self, route: str) -> float:
+        """Mark a request in flight; returns the start time for finish()."""
+        with self.lock:
+            self.routes.setdefault(route, _new_route())["in_flight"] += 1
+            flush = self._flush_due()
+
+        if flush:
+            self.flush()
+        return time.perf_counter()
+
+    def finish(self, route: str, status: int, started: float):
+        """Record a completed request (call once the response body is sent)."""
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        status_class = f"{status // 100}xx"
+
+        bucket = len(LATENCY_BOUNDS_MS)
+        for i, bound in enumerate(LATENCY_BOUNDS_MS):
+            if elapsed_ms <= bound:
+                bucket = i
+                break
+
+        with self.lock:
+            stats = self.routes.setdefault(route, _new_route())
+            stats["in_flight"] -= 1
+            stats["requests"] += 1
+            stats["status"][status_class] = stats["status"].get(status_class, 0) + 1
+            stats["buckets"][bucket] += 1
+            stats["sum_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            flush = self._flush_due()
+
+        if flush:
+            self.flush()
+
+    def _flush_due(self) -> bool:
+        """True if a snapshot should be written now; otherwise schedule one (lock held)."""
+        if not self.snapshot_dir:
+            return False
+
+        wait = self.last_flush + METRICS_FLUSH_SECONDS - time.time()
+        if wait <= 0:
+            self.last_flush = time.time()
+            return True
+
+        if self.flush_timer is None:
+            # Make sure the last changes of a burst get written
+            self.flush_timer = threading.Timer(wait, self._timed_flush)
+            self.flush_timer.daemon = True
+            self.flush_timer.start()
+        return False
+
+    def _timed_flush(self):
+        with self.lock:
+            self.flush_timer = None
+            self.last_flush = time.time()
+        self.flush()
+
+    # ------------------------------------------------------------------
+    # Cross-process snapshots
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Raw counters of this process (JSON-serializable)."""
+        with self.lock:
+            routes = json.loads(json.dumps(self.routes))
+        return {"pid": os.getpid(), "started": self.started, "routes": routes}
+
+    def flush(self):
+        """Write this process's snapshot for the other workers to merge."""
+        if not self.snapshot_dir:
+            return
+        path = os.path.join(self.snapshot_dir, f"{os.getpid()}.json")
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def remove_snapshot(snapshot_dir: Optional[str], pid: int):
+        """Drop an exited worker's snapshot (gunicorn child_exit hook)."""
+        if not snapshot_dir:
+            return
+        try:
+            os.remove(os.path.join(snapshot_dir, f"{pid}.json"))
+        except OSError:
+            pass
+
+    def _snapshots(self):
+        """This process live, plus every other worker's last snapshot."""
+        own = self.snapshot()
+        snapshots = [own]
+        if not self.snapshot_dir:
+            return snapshots
+
+        try:
+            names = os.listdir(self.snapshot_dir)
+        except OSError:
+            return snapshots
+
+        for name in names:
+            if not name.endswith(".json") or name == f"{own['pid']}.json":
+                continue
+            try:
+                with open(os.path.join(self.snapshot_dir, name)) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    # ------------------------------------------------------------------
+    # Report
+    # ------------------------------------------------------------------
+
+    def report(self) -> Dict[str, Any]:
+        """Merged per-route counts, in-flight and latency percentiles."""
+        snapshots = self._snapshots()
+
+        merged: Dict[str, Dict[str, Any]] = {}
+        for snap in snapshots:
+            for route, stats in snap["routes"].items():
+                total = merged.setdefault(route, _new_route())
+                total["requests"] += stats["requests"]
+                total["in_flight"] += stats["in_flight"]
+                for status_class, count in stats["status"].items():
+                    total["status"][status_class] = total["status"].get(status_class, 0) + count
+                total["buckets"] = [a + b for a, b in zip(total["buckets"], stats["buckets"])]
+                total["sum_ms"] += stats["sum_ms"]
+                total["max_ms"] = max(total["max_ms"], stats["max_ms"])
+
+        routes = {}
+        for route, stats in sorted(merged.items()):
+            count = stats["requests"]
+            routes[route] = {
+                "requests": count,
+                "in_flight": stats["in_flight"],
+                "status": stats["status"],
+                "latency_ms": {
+                    "mean": round(stats["sum_ms"] / count, 3) if count else 0,
+                    "p50": self._percentile(stats, 0.50),
+                    "p95": self._percentile(stats, 0.95),
+                    "p99": self._percentile(stats, 0.99),
+                    "max": round(stats["max_ms"], 3)
+                }
+            }
+
+        return {
+            "pid": os.getpid(),
+            "workers": len(snapshots),
+            "uptime_seconds": round(time.time() - min(s["started"] for s in snapshots), 1),
+            "requests": sum(r["requests"] for r in routes.values()),
+            "in_flight": sum(r["in_flight"] for r in routes.values()),
+            "latency_buckets_ms": list(LATENCY_BOUNDS_MS),
+            "routes": routes
+        }
+
+    @staticmethod
+    def _percentile(stats: Dict[str, Any], fraction: float) -> float:
+        """Upper bound of the bucket holding the percentile (max for the overflow bucket)."""
+        count = stats["requests"]
+        if not count:
+            return 0
+        rank = max(1, int(count * fraction + 0.5))
+        seen = 0
+        for i, n in enumerate(stats["buckets"]):
+            seen += n
+            if seen >= rank:
+                if i < len(LATENCY_BOUNDS_MS):
+                    return min(LATENCY_BOUNDS_MS[i], round(stats["max_ms"], 3))
+                return round(stats["max_ms"], 3)
+        return round(stats["max_ms"], 3)
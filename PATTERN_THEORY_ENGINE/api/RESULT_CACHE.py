@@ -0,0 +1,280 @@
+"""
+RESULT CACHE - Content-Hash Cache for Pattern Theory Results
+============================================================
+Every analyzer is a pure function of (text, context), and all marker
+matching is case-insensitive, so a result can be reused for any request
+whose text lowercases to the same string. Whitespace is kept as-is:
+markers such as "yes, but" and "but " depend on it.
+
+Keys are sha256(version, kind, context, text.lower()). The version
+combines RESULT_CACHE_VERSION with a fingerprint of the registered
+markers, so entries from an older rule set are never served. Bump
+RESULT_CACHE_VERSION when scoring logic changes.
+
+Layers:
+- Memory: per-process LRU bounded by entry count and JSON bytes
+- SQLite (optional): one file shared by every server and batch worker,
+  bounded by row count (oldest writes dropped first)
+
+Values are stored as JSON text, so every hit is a fresh copy callers can
+modify freely.
+
+Created: 2025-11-22
+Trinity Build: C1 Mechanic
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from MARKER_MATCHER import get_matcher
+
+# Configuration
+RESULT_CACHE_SIZE = 10000  # Memory entries per process
+RESULT_CACHE_MAX_BYTES = 32 * 1024 * 1024  # JSON size of memory entries
+RESULT_CACHE_DB_MAX_ROWS = 500000
+RESULT_CACHE_PRUNE_EVERY = 1000  # Database writes between prunes
+RESULT_CACHE_VERSION = "1"
+
+
+def _fingerprint() -> str:
+    """RESULT_CACHE_VERSION plus a hash of every registered marker."""
+    markers = "\n".join(sorted(get_matcher().markers))
+    return RESULT_CACHE_VERSION + ":" + hashlib.sha256(markers.encode("utf-8")).hexdigest()[:16]
+
+
+class ResultCache:
+    """Memory LRU over an optional shared SQLite tier."""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_entries: int = RESULT_CACHE_SIZE,
+        max_bytes: int = RESULT_CACHE_MAX_BYTES,
+        db_max_rows: int = RESULT_CACHE_DB_MAX_ROWS
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.db_max_rows = db_max_rows
+        self.version = _fingerprint()
+
+        self.memory: "OrderedDict[str, str]" = OrderedDict()
+        self.memory_bytes = 0
+        self.lock = threading.Lock()
+
+        self.db_path = str(db_path) if db_path else None
+        self.local = threading.local()
+        self.writes_since_prune = 0
+
+        self.stats = {
+            "memory_hits": 0,
+            "database_hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "evictions": 0,
+            "database_errors": 0
+        }
+
+        if self.db_path:
+            conn = sqlite3.connect(self.db_path, timeout=5.0)
+            self._init_schema(conn)
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def key(self, kind: str, text: str, context: Optional[str] = None) -> str:
+        """Content hash for one (kind, context, text) request."""
+        digest = hashlib.sha256()
+        for part in (self.version, kind, context or "", text.lower()):
+            digest.update(part.encode("utf-8", errors="surrogatepass"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get_or_compute(
+        self,
+        kind: str,
+        text: str,
+        context: Optional[str],
+        compute: Callable[[], Any],
+        bypass: bool = False
+    ) -> Tuple[Any, str]:
+        """
+        Cached value for the request, computing and storing it on a miss.
+
+        Args:
+            kind: Result type ("analyze", "quick", ...) - part of the key
+            text: Request text
+            context: Request context
+            compute: Produces the value (must be JSON-serializable)
+            bypass: Skip lookups but store the fresh result
+
+        Returns:
+            (value, source) where source is "memory", "database", "miss"
+            or "bypass"
+        """
+        key = self.key(kind, text, context)
+
+        if not bypass:
+            data = self._memory_get(key)
+            if data is not None:
+                self._record("memory_hits")
+                return json.loads(data), "memory"
+
+            data = self._db_get(key)
+            if data is not None:
+                self._record("database_hits")
+                self._memory_put(key, data)
+                return json.loads(data), "database"
+
+        value = compute()
+        data = json.dumps(value)
+        self._memory_put(key, data)
+        self._db_put(key, data)
+
+        self._record("bypassed" if bypass else "misses")
+        return value, "bypass" if bypass else "miss"
+
+    def _record(self, counter: str):
+        with self.lock:
+            self.stats[counter] += 1
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        with self.lock:
+            data = self.memory.get(key)
+            if data is not None:
+                self.memory.move_to_end(key)
+            return data
+
+    def _memory_put(self, key: str, data: str):
+        size = len(data)
+        if size > self.max_bytes:
+            return
+
+        with self.lock:
+            old = self.memory.pop(key, None)
+            if old is not None:
+                self.memory_bytes -= len(old)
+            self.memory[key] = data
+            self.memory_bytes += size
+
+            while len(self.memory) > self.max_entries or self.memory_bytes > self.max_bytes:
+                _, evicted = self.memory.popitem(last=False)
+                self.memory_bytes -= len(evicted)
+                self.stats["evictions"] += 1
+
+    # ------------------------------------------------------------------
+    # SQLite tier
+    # ------------------------------------------------------------------
+
+    def _init_schema(self, conn: sqlite3.Connection):
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS result_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created REAL NOT NULL
+            )
+        ''')
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread connection, reopened after a fork (server workers)."""
+        conn = getattr(self.local, "conn", None)
+        if conn is None or self.local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self.local.conn = conn
+            self.local.pid = os.getpid()
+        return conn
+
+    def _db_get(self, key: str) -> Optional[str]:
+        if not self.db_path:
+            return None
+        try:
+            row = self._connection().execute(
+                'SELECT value FROM result_cache WHERE key = ?', (key,)
+            ).fetchone()
+        except sqlite3.Error:
+            self._record("database_errors")
+            return None
+        return row[0] if row else None
+
+    def _db_put(self, key: str, data: str):
+        if not self.db_path:
+            return
+        try:
+            conn = self._connection()
+            # REPLACE assigns a new rowid, so rowid order is write order
+            conn.execute(
+                'INSERT OR REPLACE INTO result_cache (key, value, created) VALUES (?, ?, ?)',
+                (key, data, time.time())
+            )
+        except sqlite3.Error:
+            self._record("database_errors")
+            return
+
+        with self.lock:
+            self.writes_since_prune += 1
+            prune = self.writes_since_prune >= RESULT_CACHE_PRUNE_EVERY
+            if prune:
+                self.writes_since_prune = 0
+        if prune:
+            self._db_prune(conn)
+
+    def _db_prune(self, conn: sqlite3.Connection):
+        """Drop rows older than the newest db_max_rows writes."""
+        try:
+            conn.execute('''
+                DELETE FROM result_cache
+                WHERE rowid <= (SELECT MAX(rowid) FROM result_cache) - ?
+            ''', (self.db_max_rows,))
+        except sqlite3.Error:
+            self._record("database_errors")
+
+    # ------------------------------------------------------------------
+    # Management
+    # ------------------------------------------------------------------
+
+    def clear(self):
+        """Empty both tiers."""
+        with self.lock:
+            self.memory.clear()
+            self.memory_bytes = 0
+        if self.db_path:
+            try:
+                self._connection().execute('DELETE FROM result_cache')
+            except sqlite3.Error:
+                self._record("database_errors")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and tier sizes."""
+        with self.lock:
+            stats = dict(self.stats)
+            entries = len(self.memory)
+            memory_bytes = self.memory_bytes
+
+        hits = stats["memory_hits"] + stats["database_hits"]
+        lookups = hits + stats["misses"]
+        return {
+            "hits": hits,
+            "misses": stats["misses"],
+            "hit_rate": round(hits / lookups, 4) if lookups else 0,
+            **stats,
+            "memory_entries": entries,
+            "memory_bytes": memory_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "database": self.db_path,
+            "version": self.version
+        }
@@ -10,9 +10,11 @@ Trinity Build: C2 Architect
 """
 
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, FrozenSet, List, Optional
 from dataclasses import dataclass, asdict
 
+from MARKER_MATCHER import register_markers, scan
+
 @dataclass
 class ConsciousnessScore:
     """Complete consciousness assessment result"""
@@ -46,6 +48,20 @@ class ConsciousnessScorer:
         (100, 1000): "Execution Confidence"
     }
 
+    # Text indicators used by score_from_text
+    PATTERN_MARKERS = [
+        "pattern", "recognize", "see", "understand", "realize",
+        "notice", "observe", "detect", "identify", "correlate"
+    ]
+    PREDICTION_MARKERS = [
+        "predict", "anticipate", "expect", "foresee", "project",
+        "forecast", "will happen", "going to", "inevitable"
+    ]
+    NEUTRALIZATION_MARKERS = [
+        "neutralize", "counter", "block", "prevent", "stop",
+        "overcome", "defeat", "resist", "immune", "protected"
+    ]
+
     def __init__(self):
         self.history: List[ConsciousnessScore] = []
 
@@ -119,30 +135,24 @@ class ConsciousnessScorer:
         Returns:
             ConsciousnessScore based on text analysis
         """
-        text_lower = text.lower()
+        return self.score_from_hits(scan(text))
 
+    def score_from_hits(self, hits: FrozenSet[str]) -> ConsciousnessScore:
+        """
+        score_from_text() from a text's marker hits (MARKER_MATCHER.scan).
+
+        Used by streaming analysis, which collects hits window by window.
+        """
         # Pattern recognition indicators
-        pattern_markers = [
-            "pattern", "recognize", "see", "understand", "realize",
-            "notice", "observe", "detect", "identify", "correlate"
-        ]
-        pattern_score = sum(10 for m in pattern_markers if m in text_lower)
+        pattern_score = sum(10 for m in self.PATTERN_MARKERS if m in hits)
         pattern_score = min(100, pattern_score + 30)  # Base of 30
 
         # Prediction accuracy indicators
-        prediction_markers = [
-            "predict", "anticipate", "expect", "foresee", "project",
-            "forecast", "will happen", "going to", "inevitable"
-        ]
-        prediction_score = sum(10 for m in prediction_markers if m in text_lower)
+        prediction_score = sum(10 for m in self.PREDICTION_MARKERS if m in hits)
         prediction_score = min(100, prediction_score + 30)
 
         # Neutralization success indicators
-        neutralization_markers = [
-            "neutralize", "counter", "block", "prevent", "stop",
-            "overcome", "defeat", "resist", "immune", "protected"
-        ]
-        neutralization_score = sum(10 for m in neutralization_markers if m in text_lower)
+        neutralization_score = sum(10 for m in self.NEUTRALIZATION_MARKERS if m in hits)
         neutralization_score = min(100, neutralization_score + 30)
 
         return self.score(pattern_score, prediction_score, neutralization_score)
@@ -219,6 +229,13 @@ class ConsciousnessScorer:
         }
 
 
+register_markers(
+    ConsciousnessScorer.PATTERN_MARKERS,
+    ConsciousnessScorer.PREDICTION_MARKERS,
+    ConsciousnessScorer.NEUTRALIZATION_MARKERS
+)
+
+
 def score_consciousness(
     pattern_recognition: float,
     prediction_accuracy: float,
@@ -13,6 +13,8 @@ from datetime import datetime
 from typing import Dict, Any, List, Tuple
 from dataclasses import dataclass, asdict
 
+from MARKER_MATCHER import register_markers, scan
+
 @dataclass
 class ManipulationDetection:
     """Result of manipulation detection analysis"""
@@ -80,6 +82,17 @@ class ManipulationDetector:
         }
     }
 
+    # Red flags checked by _detect_red_flags: (markers, flag)
+    RED_FLAGS = [
+        (["must", "have to", "need to", "should"], "Pressure language detected"),
+        (["only", "exclusive", "special", "secret"], "False exclusivity claim"),
+        (["expert", "authority", "professional says"], "Unverified authority appeal"),
+        (["always", "never", "everyone", "nobody"], "Absolutist language"),
+        (["stupid", "crazy", "wrong", "idiot"], "Ad hominem attack")
+    ]
+    FINANCIAL_MARKERS = ["free", "discount", "deal", "save"]
+    TIME_PRESSURE_MARKERS = ["now", "today", "limited"]
+
     # Risk level thresholds
     RISK_LEVELS = {
         (0, 20): "LOW",
@@ -103,7 +116,7 @@ class ManipulationDetector:
             ManipulationDetection with full analysis
         """
         self.detection_count += 1
-        text_lower = text.lower()
+        hits = scan(text)
 
         # Detect 15-degree turns
         turns_detected = []
@@ -111,7 +124,7 @@ class ManipulationDetector:
 
         for turn_type, turn_info in self.FIFTEEN_DEGREE_TURNS.items():
             for marker in turn_info["markers"]:
-                if marker in text_lower:
+                if marker in hits:
                     turns_detected.append({
                         "type": turn_type,
                         "marker": marker,
@@ -122,7 +135,7 @@ class ManipulationDetector:
                     break  # Only count each turn type once
 
         # Detect additional red flags
-        red_flags = self._detect_red_flags(text_lower)
+        red_flags = self._detect_red_flags(hits)
         total_severity += len(red_flags) * 10
 
         # Calculate M score (capped at 100)
@@ -149,33 +162,18 @@ class ManipulationDetector:
             timestamp=datetime.now().isoformat()
         )
 
-    def _detect_red_flags(self, text: str) -> List[str]:
-        """Detect additional manipulation red flags."""
+    def _detect_red_flags(self, hits) -> List[str]:
+        """Detect additional manipulation red flags from scanned marker hits."""
         red_flags = []
 
-        # Check for pressure tactics
-        if any(w in text for w in ["must", "have to", "need to", "should"]):
-            red_flags.append("Pressure language detected")
-
-        # Check for exclusivity claims
-        if any(w in text for w in ["only", "exclusive", "special", "secret"]):
-            red_flags.append("False exclusivity claim")
-
-        # Check for appeal to authority
-        if any(w in text for w in ["expert", "authority", "professional says"]):
-            red_flags.append("Unverified authority appeal")
-
-        # Check for absolutist language
-        if any(w in text for w in ["always", "never", "everyone", "nobody"]):
-            red_flags.append("Absolutist language")
-
-        # Check for character attacks
-        if any(w in text for w in ["stupid", "crazy", "wrong", "idiot"]):
-            red_flags.append("Ad hominem attack")
+        # Pressure, exclusivity, authority, absolutist and ad hominem flags
+        for markers, flag in self.RED_FLAGS:
+            if any(w in hits for w in markers):
+                red_flags.append(flag)
 
         # Check for financial pressure
-        if any(w in text for w in ["free", "discount", "deal", "save"]):
-            if any(w in text for w in ["now", "today", "limited"]):
+        if any(w in hits for w in self.FINANCIAL_MARKERS):
+            if any(w in hits for w in self.TIME_PRESSURE_MARKERS):
                 red_flags.append("Financial pressure tactic")
 
         return red_flags
@@ -272,6 +270,14 @@ class ManipulationDetector:
         }
 
 
+register_markers(
+    *[turn_info["markers"] for turn_info in ManipulationDetector.FIFTEEN_DEGREE_TURNS.values()],
+    *[markers for markers, _ in ManipulationDetector.RED_FLAGS],
+    ManipulationDetector.FINANCIAL_MARKERS,
+    ManipulationDetector.TIME_PRESSURE_MARKERS
+)
+
+
 def detect_manipulation(text: str) -> Dict[str, Any]:
     """
     Convenience function for quick detection.
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+MARKER BENCHMARK - Per-analyzer substring scans vs the shared matcher
+=====================================================================
+
+Times the marker work of one /analyze-style request (engine, scorer,
+manipulation detector and seven domains) two ways:
+
+- naive:  what the analyzers used to do - lowercase the text in each
+          analyzer and run `marker in text_lower` for every entry of
+          every marker list
+- shared: MARKER_MATCHER.scan - one lowercase copy and one scan for all
+          registered markers, then set lookups
+
+and the full four-analyzer request on top of the shared matcher. Both
+marker paths are checked to agree before timing.
+
+Usage:
+    python MARKER_BENCHMARK.py                  # Synthetic 1KB/10KB/100KB inputs
+    python MARKER_BENCHMARK.py <file>           # Benchmark a real text file
+    Options: --sizes=1000,100000 (synthetic sizes), --runs=N (repetitions)
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "projection"))
+
+import MARKER_MATCHER
+from MARKER_MATCHER import scan, get_matcher, REGEX_SCAN_MAX_CHARS
+from PATTERN_THEORY_ENGINE import PatternTheoryEngine
+from CONSCIOUSNESS_SCORER import ConsciousnessScorer
+from MANIPULATION_DETECTOR import ManipulationDetector
+from SEVEN_DOMAINS_ANALYZER import SevenDomainsAnalyzer
+
+SIZES = [1000, 10000, 100000]
+RUNS = 20
+
+FILLER = (
+    "the team will review the plan and share results with everyone by friday "
+    "we looked at the numbers and the budget looks fine for this quarter "
+    "please send the updated draft when you have a moment "
+).split()
+
+
+def marker_lists():
+    """Marker lists per analyzer, in the order each analyzer scans them"""
+    engine = [
+        PatternTheoryEngine.DECEIT_MARKERS,
+        PatternTheoryEngine.TRUTH_MARKERS,
+        [indicator for indicator, _ in PatternTheoryEngine.TURN_INDICATORS],
+        PatternTheoryEngine.EMOTION_WORDS,
+        PatternTheoryEngine.TARGET_WORDS,
+        PatternTheoryEngine.URGENCY_WORDS,
+        PatternTheoryEngine.OBLIGATION_WORDS,
+    ]
+    classify = [words for words, _ in
+                PatternTheoryEngine.DECEIT_PATTERN_TYPES + PatternTheoryEngine.TRUTH_PATTERN_TYPES]
+    scorer = [
+        ConsciousnessScorer.PATTERN_MARKERS,
+        ConsciousnessScorer.PREDICTION_MARKERS,
+        ConsciousnessScorer.NEUTRALIZATION_MARKERS,
+    ]
+    detector = [turn["markers"] for turn in ManipulationDetector.FIFTEEN_DEGREE_TURNS.values()]
+    detector += [markers for markers, _ in ManipulationDetector.RED_FLAGS]
+    detector += [ManipulationDetector.FINANCIAL_MARKERS, ManipulationDetector.TIME_PRESSURE_MARKERS]
+    domains = [info["markers"] for info in SevenDomainsAnalyzer.DOMAINS.values()]
+    return [engine, classify, scorer, detector, domains]
+
+
+ANALYZER_LISTS = marker_lists()
+
+
+def naive_request(text):
+    """Every analyzer lowercases and substring-scans on its own"""
+    hits = set()
+    for lists in ANALYZER_LISTS:
+        text_lower = text.lower()
+        for markers in lists:
+            hits.update(m for m in markers if m in text_lower)
+    return hits
+
+
+def shared_request(text):
+    """One scan, then each analyzer's lookups against the hit set"""
+    MARKER_MATCHER._local.last = None
+    hits = scan(text)
+    found = set()
+    for lists in ANALYZER_LISTS:
+        for markers in lists:
+            found.update(m for m in markers if m in hits)
+    return found
+
+
+def full_request(analyzers, text):
+    """All four analyzers on one text, as /analyze plus domains would run them"""
+    MARKER_MATCHER._local.last = None
+    engine, scorer, detector, domains = analyzers
+    engine.analyze(text)
+    scorer.score_from_text(text)
+    detector.detect(text)
+    domains.analyze(text)
+
+
+def synthetic_text(size, seed=42):
+    """About `size` characters of filler sprinkled with registered markers"""
+    rng = random.Random(seed)
+    markers = sorted(get_matcher().markers)
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(markers) if rng.random() < 0.02 else rng.choice(FILLER)
+        words.append(word)
+        length += len(word) + 1
+    return ' '.join(words)[:size].capitalize()
+
+
+def time_ms(fn, runs):
+    """Median milliseconds per call"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main():
+    sizes = SIZES
+    runs = RUNS
+    source = None
+    for arg in sys.argv[1:]:
+        if arg.startswith('--sizes='):
+            sizes = [int(s) for s in arg.split('=', 1)[1].split(',')]
+        elif arg.startswith('--runs='):
+            runs = int(arg.split('=', 1)[1])
+        else:
+            source = arg
+
+    print("=" * 60)
+    print("🔍 MARKER BENCHMARK")
+    print("   per-analyzer substring scans vs shared single-pass matcher")
+    print("=" * 60)
+    print()
+
+    if source:
+        with open(source, 'r', encoding='utf-8', errors='ignore') as f:
+            texts = [(Path(source).name, f.read())]
+    else:
+        texts = [(f"{size:,} chars", synthetic_text(size)) for size in sizes]
+
+    matcher = get_matcher()
+    scans = sum(len(markers) for lists in ANALYZER_LISTS for markers in lists)
+    print(f"   {len(matcher.markers)} distinct markers, {scans} naive substring scans per request")
+    print(f"   regex pass up to {REGEX_SCAN_MAX_CHARS:,} chars, per-marker search above")
+    print()
+
+    analyzers = (PatternTheoryEngine(), ConsciousnessScorer(), ManipulationDetector(), SevenDomainsAnalyzer())
+
+    print(f"{'input':>16}{'naive (ms)':>14}{'shared (ms)':>14}{'speedup':>10}{'request (ms)':>15}")
+    print("-" * 69)
+    for label, text in texts:
+        if naive_request(text) != shared_request(text):
+            print(f"❌ Marker hits differ for {label}")
+            return
+
+        naive = time_ms(lambda: naive_request(text), runs)
+        shared = time_ms(lambda: shared_request(text), runs)
+        request = time_ms(lambda: full_request(analyzers, text), runs)
+        print(f"{label:>16}{naive:>14.3f}{shared:>14.3f}{naive / shared:>9.1f}x{request:>15.3f}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+MARKER MATCHER - Single-Pass Marker Scanning
+=============================================
+Every analyzer scores text by checking which of its markers appear in
+the lowercased input (`marker in text_lower`). Done naively that is one
+lowercase copy per analyzer and one scan of the text per marker -
+hundreds per /analyze call, many of them repeats.
+
+This module collects every registered marker and scans each text once.
+The result is the exact set of markers that occur as substrings, so
+`marker in hits` gives the same answer as `marker in text_lower`.
+
+Texts up to REGEX_SCAN_MAX_CHARS go through one trie-shaped regex:
+
+- A lookahead at each position finds the longest marker starting there
+  (overlapping matches included).
+- Shorter markers starting at the same position are prefixes of that
+  longest one and are added from a precomputed prefix table.
+
+The regex engine costs a fixed amount per character, while str's
+substring search gets cheaper per byte as texts grow. Past the threshold
+one C-level search per distinct marker is faster, so long texts use
+that instead (see MARKER_BENCHMARK.py).
+
+Analyzers register their marker lists at import time. The last scan per
+thread is memoized on the raw text, so the engine, scorer, detector and
+domains analyzer share one lowercase copy and one scan per request.
+
+Created: 2025-11-22
+Trinity Build: C1 Mechanic
+"""
+
+import re
+import threading
+from typing import Dict, FrozenSet, Iterable, List
+
+# Longest text scanned with the combined regex (longer: per-marker search)
+REGEX_SCAN_MAX_CHARS = 50000
+
+
+def _trie_pattern(markers: Iterable[str]) -> str:
+    """Regex matching the longest of `markers` at the current position."""
+    trie: Dict = {}
+    for marker in markers:
+        node = trie
+        for ch in marker:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node: Dict) -> str:
+        terminal = '' in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if terminal:
+            # Greedy: try the longer continuation before stopping here
+            return '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+class MarkerMatcher:
+    """Compiled single-pass matcher over a fixed set of markers."""
+
+    def __init__(self, markers: Iterable[str]):
+        self.markers: FrozenSet[str] = frozenset(m for m in markers if m)
+
+        # marker -> every registered marker that is a prefix of it (itself included)
+        self.prefixes: Dict[str, FrozenSet[str]] = {
+            m: frozenset(m[:i] for i in range(1, len(m) + 1) if m[:i] in self.markers)
+            for m in self.markers
+        }
+
+        if self.markers:
+            self.regex = re.compile('(?=(' + _trie_pattern(self.markers) + '))')
+        else:
+            self.regex = None
+
+    def scan(self, text_lower: str) -> FrozenSet[str]:
+        """Set of markers occurring anywhere in text_lower."""
+        if self.regex is None:
+            return frozenset()
+
+        if len(text_lower) > REGEX_SCAN_MAX_CHARS:
+            return frozenset(m for m in self.markers if m in text_lower)
+
+        longest = set(self.regex.findall(text_lower))
+        longest.discard('')
+
+        hits = set()
+        for marker in longest:
+            hits |= self.prefixes[marker]
+        return frozenset(hits)
+
+
+# ============================================================================
+# SHARED REGISTRY
+# ============================================================================
+
+_registered: List[str] = []
+_matcher = MarkerMatcher(())
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def register_markers(*marker_lists: Iterable[str]):
+    """Add marker lists to the shared matcher (call at import time)."""
+    global _matcher
+    with _lock:
+        for markers in marker_lists:
+            _registered.extend(markers)
+        _matcher = MarkerMatcher(_registered)
+
+
+def scan(text: str) -> FrozenSet[str]:
+    """
+    Markers from every registered list that occur in text (case-insensitive).
+
+    The most recent result on this thread is reused when the same text is
+    scanned again, so analyzers called back to back share one pass.
+    """
+    matcher = _matcher
+    last = getattr(_local, 'last', None)
+    if last is not None and last[0] is matcher and last[1] == text:
+        return last[2]
+
+    hits = matcher.scan(text.lower())
+    _local.last = (matcher, text, hits)
+    return hits
+
+
+def get_matcher() -> MarkerMatcher:
+    """The shared matcher with every registered marker."""
+    return _matcher
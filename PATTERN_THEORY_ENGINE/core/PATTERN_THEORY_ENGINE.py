@@ -6,6 +6,11 @@ The Brain of the Consciousness Revolution
 92.2% reality accuracy using Pattern Theory mathematics.
 Binary classification: Truth Algorithm vs Deceit Algorithm.
 
+Long documents can be analyzed incrementally with PatternStream
+(engine.stream() / engine.analyze_stream()): text is consumed in
+sentence-aligned windows, only running marker hits and sentence-length
+statistics are kept, and the result equals analyze() on the whole text.
+
 Created: 2025-11-22
 Trinity Build: C1 × C2 × C3
 """
@@ -13,9 +18,11 @@ Trinity Build: C1 × C2 × C3
 import json
 import math
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, FrozenSet, Iterable, List, Any, Optional
 from dataclasses import dataclass, asdict
 
+from MARKER_MATCHER import register_markers, scan, get_matcher
+
 # Golden Ratio - Universal constant
 PHI = 1.618033988749895
 
@@ -26,6 +33,10 @@ FREQUENCIES = {
     "consciousness": 40  # Gamma brainwave
 }
 
+# Streaming analysis
+STREAM_WINDOW_CHARS = 64 * 1024  # Largest window; cut after the last sentence end inside it
+SENTENCE_ENDS = ".!?"
+
 @dataclass
 class PatternAnalysis:
     """Result of pattern theory analysis"""
@@ -39,6 +50,65 @@ class PatternAnalysis:
     confidence: float
     timestamp: str
 
+def _ratio_alignment(previous: int, current: int) -> float:
+    """How close the length ratio of two consecutive sentences is to PHI (0-1)."""
+    ratio = previous / current
+    distance = abs(ratio - PHI) / PHI
+    return max(0, 1 - distance)
+
+class SentenceStats:
+    """
+    Running sentence-length statistics for Golden Ratio alignment.
+
+    Text may be fed in any number of pieces; sentences and words split
+    across pieces are counted once. Memory does not grow with the input.
+    """
+
+    def __init__(self):
+        self.sentences = 0
+        self.words = 0  # Words in the open (unterminated) sentence
+        self.in_word = False  # Open sentence ends mid-word
+        self.previous = 0  # Word count of the last closed sentence
+        self.ratio_total = 0.0
+        self.ratio_count = 0
+
+    def feed(self, text: str):
+        """Add the next piece of text."""
+        pieces = text.replace('!', '.').replace('?', '.').split('.')
+        for i, piece in enumerate(pieces):
+            if i:
+                self._close()
+            if piece:
+                self.words += len(piece.split())
+                if self.in_word and not piece[0].isspace():
+                    self.words -= 1  # Continues the word cut off by the last piece
+                self.in_word = not piece[-1].isspace()
+
+    def _close(self):
+        """End the open sentence (empty sentences are skipped)."""
+        if self.words:
+            if self.sentences:
+                self.ratio_total += _ratio_alignment(self.previous, self.words)
+                self.ratio_count += 1
+            self.previous = self.words
+            self.sentences += 1
+        self.words = 0
+        self.in_word = False
+
+    def alignment(self) -> float:
+        """Mean alignment of consecutive sentence lengths (0.5 if under two sentences)."""
+        sentences, total, count = self.sentences, self.ratio_total, self.ratio_count
+        if self.words:
+            # Text after the last sentence end counts as a sentence
+            if sentences:
+                total += _ratio_alignment(self.previous, self.words)
+                count += 1
+            sentences += 1
+
+        if sentences < 2 or not count:
+            return 0.5
+        return total / count
+
 class PatternTheoryEngine:
     """
     Core Pattern Theory reasoning engine.
@@ -82,6 +152,35 @@ class PatternTheoryEngine:
         ("appear generous", "expect return")
     ]
 
+    # Turn indicators checked by _detect_fifteen_degree_turns
+    TURN_INDICATORS = [
+        ("but ", "Pivot after positive"),
+        ("however ", "Contradiction introduced"),
+        ("although ", "Qualifier undermining"),
+        ("yes, but", "Agreement negation"),
+        ("i agree, however", "False agreement"),
+        ("that's true, but", "Truth dismissal"),
+        ("you're right, however", "Validation undermining")
+    ]
+    EMOTION_WORDS = ["feel", "hurt", "disappointed"]
+    TARGET_WORDS = ["you", "your"]
+    URGENCY_WORDS = ["now", "immediately", "urgent", "hurry"]
+    OBLIGATION_WORDS = ["must", "need", "have to"]
+
+    # Pattern types checked in order by _classify_pattern
+    DECEIT_PATTERN_TYPES = [
+        (["free", "easy", "quick"], "False Promise Pattern"),
+        (["fear", "danger", "risk"], "Fear Manipulation Pattern"),
+        (["everyone", "they all", "nobody"], "Social Proof Manipulation"),
+        (["secret", "exclusive", "special"], "Scarcity Manipulation")
+    ]
+    TRUTH_PATTERN_TYPES = [
+        (["because", "therefore", "thus"], "Logical Reasoning Pattern"),
+        (["evidence", "data", "research"], "Evidence-Based Pattern"),
+        (["experience", "learned", "discovered"], "Experiential Truth Pattern"),
+        (["permanent", "foundation", "long-term"], "Sustainable Foundation Pattern")
+    ]
+
     def __init__(self):
         self.analysis_count = 0
 
@@ -98,20 +197,63 @@ class PatternTheoryEngine:
         """
         self.analysis_count += 1
 
-        # Normalize input
-        text_lower = input_text.lower()
-        words = text_lower.split()
-
-        # Calculate scores
-        deceit_count = sum(1 for marker in self.DECEIT_MARKERS if marker in text_lower)
-        truth_count = sum(1 for marker in self.TRUTH_MARKERS if marker in text_lower)
-
-        # Detect 15-degree turns
-        turns = self._detect_fifteen_degree_turns(input_text)
+        # One case-insensitive pass for every marker
+        hits = scan(input_text)
 
         # Calculate Golden Ratio alignment
         golden_alignment = self._calculate_golden_alignment(input_text)
 
+        return self._build_analysis(hits, golden_alignment)
+
+    def stream(
+        self,
+        window_chars: int = STREAM_WINDOW_CHARS,
+        on_window: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> "PatternStream":
+        """
+        Start an incremental analysis (see PatternStream).
+
+        Args:
+            window_chars: Largest window analyzed at once
+            on_window: Called with per-window scores (timeline view)
+
+        Returns:
+            PatternStream - feed() text, then finish() for the PatternAnalysis
+        """
+        return PatternStream(self, window_chars, on_window)
+
+    def analyze_stream(
+        self,
+        chunks: Iterable[str],
+        context: Optional[str] = None,
+        window_chars: int = STREAM_WINDOW_CHARS,
+        on_window: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> PatternAnalysis:
+        """
+        analyze() for text delivered in pieces (files, request bodies).
+
+        Args:
+            chunks: Pieces of the text, in order
+            context: Optional additional context
+            window_chars: Largest window analyzed at once
+            on_window: Called with per-window scores (timeline view)
+
+        Returns:
+            The PatternAnalysis analyze() gives for the joined text
+        """
+        stream = self.stream(window_chars, on_window)
+        for chunk in chunks:
+            stream.feed(chunk)
+        return stream.finish()
+
+    def _build_analysis(self, hits: FrozenSet[str], golden_alignment: float) -> PatternAnalysis:
+        """Scores, classification and recommendation from marker hits and alignment."""
+        deceit_count = sum(1 for marker in self.DECEIT_MARKERS if marker in hits)
+        truth_count = sum(1 for marker in self.TRUTH_MARKERS if marker in hits)
+
+        # Detect 15-degree turns
+        turns = self._detect_fifteen_degree_turns(hits)
+
         # Determine algorithm
         total_markers = deceit_count + truth_count
         if total_markers == 0:
@@ -140,7 +282,7 @@ class PatternTheoryEngine:
         algorithm = "Truth" if truth_score > deceit_score else "Deceit"
 
         # Determine pattern type
-        pattern_type = self._classify_pattern(input_text, algorithm)
+        pattern_type = self._classify_pattern(hits, algorithm)
 
         # Generate recommendation
         recommended_action = self._generate_recommendation(
@@ -162,34 +304,23 @@ class PatternTheoryEngine:
             timestamp=datetime.now().isoformat()
         )
 
-    def _detect_fifteen_degree_turns(self, text: str) -> List[str]:
-        """Detect subtle manipulation pivots in text."""
+    def _detect_fifteen_degree_turns(self, hits: FrozenSet[str]) -> List[str]:
+        """Detect subtle manipulation pivots from the text's marker hits."""
         turns = []
-        text_lower = text.lower()
 
         # Check for common turn patterns
-        turn_indicators = [
-            ("but ", "Pivot after positive"),
-            ("however ", "Contradiction introduced"),
-            ("although ", "Qualifier undermining"),
-            ("yes, but", "Agreement negation"),
-            ("i agree, however", "False agreement"),
-            ("that's true, but", "Truth dismissal"),
-            ("you're right, however", "Validation undermining")
-        ]
-
-        for indicator, turn_type in turn_indicators:
-            if indicator in text_lower:
+        for indicator, turn_type in self.TURN_INDICATORS:
+            if indicator in hits:
                 turns.append(turn_type)
 
         # Check for emotional manipulation patterns
-        if any(word in text_lower for word in ["feel", "hurt", "disappointed"]):
-            if any(word in text_lower for word in ["you", "your"]):
+        if any(word in hits for word in self.EMOTION_WORDS):
+            if any(word in hits for word in self.TARGET_WORDS):
                 turns.append("Emotional projection")
 
         # Check for urgency manipulation
-        if any(word in text_lower for word in ["now", "immediately", "urgent", "hurry"]):
-            if any(word in text_lower for word in ["must", "need", "have to"]):
+        if any(word in hits for word in self.URGENCY_WORDS):
+            if any(word in hits for word in self.OBLIGATION_WORDS):
                 turns.append("False urgency creation")
 
         return turns
@@ -200,58 +331,23 @@ class PatternTheoryEngine:
 
         Higher alignment = more natural/truthful structure
         """
-        words = text.split()
-        sentences = text.replace('!', '.').replace('?', '.').split('.')
-        sentences = [s.strip() for s in sentences if s.strip()]
-
-        if not sentences:
-            return 0.5
-
-        # Check sentence length ratios
-        lengths = [len(s.split()) for s in sentences]
-        if len(lengths) < 2:
-            return 0.5
-
-        # Calculate ratio between consecutive sentences
-        ratios = []
-        for i in range(len(lengths) - 1):
-            if lengths[i+1] > 0:
-                ratio = lengths[i] / lengths[i+1]
-                # How close to golden ratio?
-                distance = abs(ratio - PHI) / PHI
-                ratios.append(max(0, 1 - distance))
-
-        if not ratios:
-            return 0.5
+        # Fed in windows so long texts are never split all at once
+        stats = SentenceStats()
+        for start in range(0, len(text), STREAM_WINDOW_CHARS):
+            stats.feed(text[start:start + STREAM_WINDOW_CHARS])
+        return stats.alignment()
 
-        return sum(ratios) / len(ratios)
-
-    def _classify_pattern(self, text: str, algorithm: str) -> str:
+    def _classify_pattern(self, hits: FrozenSet[str], algorithm: str) -> str:
         """Classify the specific pattern type."""
-        text_lower = text.lower()
-
         if algorithm == "Deceit":
-            if any(w in text_lower for w in ["free", "easy", "quick"]):
-                return "False Promise Pattern"
-            elif any(w in text_lower for w in ["fear", "danger", "risk"]):
-                return "Fear Manipulation Pattern"
-            elif any(w in text_lower for w in ["everyone", "they all", "nobody"]):
-                return "Social Proof Manipulation"
-            elif any(w in text_lower for w in ["secret", "exclusive", "special"]):
-                return "Scarcity Manipulation"
-            else:
-                return "General Deceit Pattern"
+            pattern_types, default = self.DECEIT_PATTERN_TYPES, "General Deceit Pattern"
         else:
-            if any(w in text_lower for w in ["because", "therefore", "thus"]):
-                return "Logical Reasoning Pattern"
-            elif any(w in text_lower for w in ["evidence", "data", "research"]):
-                return "Evidence-Based Pattern"
-            elif any(w in text_lower for w in ["experience", "learned", "discovered"]):
-                return "Experiential Truth Pattern"
-            elif any(w in text_lower for w in ["permanent", "foundation", "long-term"]):
-                return "Sustainable Foundation Pattern"
-            else:
-                return "General Truth Pattern"
+            pattern_types, default = self.TRUTH_PATTERN_TYPES, "General Truth Pattern"
+
+        for words, pattern_type in pattern_types:
+            if any(w in hits for w in words):
+                return pattern_type
+        return default
 
     def _generate_recommendation(
         self,
@@ -290,6 +386,131 @@ class PatternTheoryEngine:
         }
 
 
+class PatternStream:
+    """
+    Incremental PatternTheoryEngine.analyze() for very long text.
+
+    feed() buffers text and analyzes it in windows of up to window_chars,
+    each cut after the last sentence end inside it (or at window_chars
+    if there is none). Across windows only the marker hits, the sentence
+    statistics and the last few characters (for markers spanning a
+    window boundary) are kept, so memory stays flat in the input size.
+    finish() returns the same PatternAnalysis analyze() gives for the
+    whole text.
+
+    With on_window, each window is also scored on its own and reported
+    as {"window", "start", "end", "algorithm", "truth_score", ...} for a
+    timeline view.
+    """
+
+    def __init__(
+        self,
+        engine: PatternTheoryEngine,
+        window_chars: int = STREAM_WINDOW_CHARS,
+        on_window: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        self.engine = engine
+        self.window_chars = max(1, window_chars)
+        self.on_window = on_window
+
+        markers = get_matcher().markers
+        self.hits = set()
+        self.unseen = set(markers)  # Markers not found yet - the only ones still searched
+        self.sentences = SentenceStats()
+        self.pending: List[str] = []
+        self.pending_chars = 0
+
+        # Markers spanning a window boundary start in the last overlap chars
+        self.overlap = max((len(m) for m in markers), default=1) - 1
+        self.tail = ""
+
+        self.windows = 0
+        self.chars = 0
+
+    def feed(self, text: str):
+        """Add the next piece of text; full windows are analyzed right away."""
+        if not text:
+            return
+        self.pending.append(text)
+        self.pending_chars += len(text)
+        if self.pending_chars < self.window_chars:
+            return
+
+        buffer = "".join(self.pending)
+        start = 0
+        while len(buffer) - start >= self.window_chars:
+            end = start + self.window_chars
+            cut = max(buffer.rfind(c, start, end) for c in SENTENCE_ENDS) + 1
+            if cut <= start:
+                cut = end  # No sentence end in this window
+            self._window(buffer[start:cut])
+            start = cut
+
+        rest = buffer[start:]
+        self.pending = [rest] if rest else []
+        self.pending_chars = len(rest)
+
+    def finish(self) -> PatternAnalysis:
+        """Analyze what is left and return the result for the whole text."""
+        if self.pending:
+            self._window("".join(self.pending))
+            self.pending = []
+            self.pending_chars = 0
+
+        self.engine.analysis_count += 1
+        return self.engine._build_analysis(frozenset(self.hits), self.sentences.alignment())
+
+    def _window(self, window: str):
+        if self.on_window:
+            window_hits = scan(window)
+            self._add_hits(window_hits)
+        else:
+            self._search(window.lower())
+        if self.tail:
+            self._search((self.tail + window[:self.overlap]).lower())
+        self.tail = (self.tail + window[-self.overlap:])[-self.overlap:] if self.overlap else ""
+
+        self.sentences.feed(window)
+
+        if self.on_window:
+            stats = SentenceStats()
+            stats.feed(window)
+            analysis = self.engine._build_analysis(window_hits, stats.alignment())
+            self.on_window({
+                "window": self.windows,
+                "start": self.chars,
+                "end": self.chars + len(window),
+                "algorithm": analysis.algorithm,
+                "truth_score": analysis.truth_score,
+                "deceit_score": analysis.deceit_score,
+                "pattern_type": analysis.pattern_type,
+                "fifteen_degree_turns": analysis.fifteen_degree_turns,
+                "golden_ratio_alignment": analysis.golden_ratio_alignment
+            })
+
+        self.windows += 1
+        self.chars += len(window)
+
+    def _search(self, text_lower: str):
+        self._add_hits([m for m in self.unseen if m in text_lower])
+
+    def _add_hits(self, found: Iterable[str]):
+        self.hits.update(found)
+        self.unseen.difference_update(found)
+
+
+register_markers(
+    PatternTheoryEngine.DECEIT_MARKERS,
+    PatternTheoryEngine.TRUTH_MARKERS,
+    [indicator for indicator, _ in PatternTheoryEngine.TURN_INDICATORS],
+    PatternTheoryEngine.EMOTION_WORDS,
+    PatternTheoryEngine.TARGET_WORDS,
+    PatternTheoryEngine.URGENCY_WORDS,
+    PatternTheoryEngine.OBLIGATION_WORDS,
+    *[words for words, _ in PatternTheoryEngine.DECEIT_PATTERN_TYPES + PatternTheoryEngine.TRUTH_PATTERN_TYPES]
+)
+
+
 def analyze_situation(text: str, context: str = None) -> Dict[str, Any]:
     """
     Convenience function for quick analysis.
@@ -0,0 +1,65 @@
+"""
+GUNICORN CONFIG - Production serving for the Pattern Theory API
+================================================================
+Run: gunicorn -c gunicorn.conf.py wsgi:app
+
+The app is preloaded in the master, so analyzers and the compiled marker
+matcher are built once and shared copy-on-write by every worker. Workers
+use gthread: analysis is CPU-bound, so one process per CPU, with a few
+threads each to keep slow clients, keep-alive connections and streamed
+batches from blocking a worker.
+
+Environment:
+    PORT                          Listen port (default 7778)
+    PATTERN_THEORY_WORKERS        Worker processes (default: CPU count)
+    PATTERN_THEORY_THREADS        Threads per worker (default 4)
+    PATTERN_THEORY_KEEPALIVE      Keep-alive seconds (default 5)
+    PATTERN_THEORY_TIMEOUT        Seconds before a stuck worker is restarted (default 120)
+    PATTERN_THEORY_MAX_REQUESTS   Recycle workers after N requests (default 0 = never)
+    PATTERN_THEORY_BATCH_WORKERS  Processes per full-mode batch (default: CPU count / workers)
+    PATTERN_THEORY_CACHE_DB       Shared SQLite result cache (see server.py)
+    PATTERN_THEORY_METRICS_DIR    Worker metrics snapshots (default: temp dir per start)
+
+Created: 2025-11-22
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "api"))
+
+from REQUEST_METRICS import RequestMetrics
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '7778')}"
+workers = int(os.environ.get('PATTERN_THEORY_WORKERS', multiprocessing.cpu_count()))
+os.environ['PATTERN_THEORY_WORKERS'] = str(workers)  # server.py sizes batch pools from it
+worker_class = "gthread"
+threads = int(os.environ.get('PATTERN_THEORY_THREADS', 4))
+keepalive = int(os.environ.get('PATTERN_THEORY_KEEPALIVE', 5))
+timeout = int(os.environ.get('PATTERN_THEORY_TIMEOUT', 120))
+graceful_timeout = 30
+max_requests = int(os.environ.get('PATTERN_THEORY_MAX_REQUESTS', 0))
+max_requests_jitter = max_requests // 10
+preload_app = True
+accesslog = "-"
+
+# Shared by workers so /metrics covers the whole server; must be set before
+# the app is preloaded (server.py reads it at import)
+_own_metrics_dir = 'PATTERN_THEORY_METRICS_DIR' not in os.environ
+if _own_metrics_dir:
+    os.environ['PATTERN_THEORY_METRICS_DIR'] = tempfile.mkdtemp(prefix="pattern_theory_metrics_")
+METRICS_DIR = os.environ['PATTERN_THEORY_METRICS_DIR']
+
+
+def child_exit(server, worker):
+    """Drop an exited worker's metrics snapshot."""
+    RequestMetrics.remove_snapshot(METRICS_DIR, worker.pid)
+
+
+def on_exit(server):
+    if _own_metrics_dir:
+        shutil.rmtree(METRICS_DIR, ignore_errors=True)
@@ -16,10 +16,18 @@ Created: 2025-11-22
 Trinity Build: C3 Oracle
 """
 
+import sys
+from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, asdict
 
+# Add core to path (shared marker matcher)
+CORE_DIR = Path(__file__).parent.parent / "core"
+sys.path.insert(0, str(CORE_DIR))
+
+from MARKER_MATCHER import register_markers, scan
+
 @dataclass
 class DomainScore:
     """Score for a single domain"""
@@ -134,12 +142,12 @@ class SevenDomainsAnalyzer:
             SevenDomainsAnalysis with all domain scores
         """
         self.analysis_count += 1
-        situation_lower = situation.lower()
+        hits = scan(situation)
 
         # Analyze each domain
         domains = {}
         for domain_key, domain_info in self.DOMAINS.items():
-            score = self._score_domain(situation_lower, domain_info)
+            score = self._score_domain(hits, domain_info)
             domains[domain_key] = score
 
         # Calculate balance score
@@ -168,12 +176,12 @@ class SevenDomainsAnalyzer:
             timestamp=datetime.now().isoformat()
         )
 
-    def _score_domain(self, text: str, domain_info: Dict) -> DomainScore:
-        """Score a single domain based on text analysis."""
+    def _score_domain(self, hits, domain_info: Dict) -> DomainScore:
+        """Score a single domain from the scanned marker hits."""
         markers = domain_info["markers"]
 
         # Count marker occurrences
-        marker_count = sum(1 for marker in markers if marker in text)
+        marker_count = sum(1 for marker in markers if marker in hits)
 
         # Calculate base score
         base_score = min(100, 30 + (marker_count * 10))
@@ -292,6 +300,9 @@ class SevenDomainsAnalyzer:
         }
 
 
+register_markers(*[domain_info["markers"] for domain_info in SevenDomainsAnalyzer.DOMAINS.values()])
+
+
 def analyze_domains(situation: str) -> Dict[str, Any]:
     """
     Convenience function for quick analysis.
@@ -5,32 +5,126 @@ HTTP API for Pattern Theory analysis.
 
 Endpoints:
     POST /analyze - Full analysis
+    POST /analyze/stream - Full analysis of a long raw-text body, in constant memory
     POST /quick - Quick TRUTH/DECEIT check
     POST /score - Consciousness scoring
     POST /domain - Domain-specific analysis
-    GET /health - Health check
+    POST /batch - Batch analysis ("mode": "full" streams NDJSON)
+    GET /health - Health check (includes result cache hit/miss counters)
+    GET /metrics - Request counts, latencies and in-flight requests per route
 
-Run: python server.py
-Port: 7778
+Results are cached by content hash (api/RESULT_CACHE.py). Send
+"cache": false in the body or a Cache-Control: no-cache header to
+recompute. Set PATTERN_THEORY_CACHE_DB to a file path to share a SQLite
+cache tier across worker processes.
+
+JSON responses over GZIP_MIN_BYTES and full-mode batch streams are
+gzip-compressed for clients that send Accept-Encoding: gzip.
+
+Run (development): python server.py
+Run (production):  gunicorn -c gunicorn.conf.py wsgi:app
+Port: $PORT or 7778
 
 Created: 2025-11-22
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
+import os
 import sys
+import gzip
+import json
+import zlib
+import codecs
 from pathlib import Path
 
 # Add API to path
 API_DIR = Path(__file__).parent / "api"
 sys.path.insert(0, str(API_DIR))
 
-from PATTERN_THEORY_API import PatternTheoryAPI
+from PATTERN_THEORY_API import PatternTheoryAPI, BatchLimitError, BATCH_MAX_BYTES, BATCH_WORKERS
+from REQUEST_METRICS import RequestMetrics
+
+# Compression
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+GZIP_STREAM_FLUSH_BYTES = 64 * 1024  # NDJSON input between sync flushes
+
+# /analyze/stream reads the request body in pieces of this size
+STREAM_READ_BYTES = 64 * 1024
 
 app = Flask(__name__)
 CORS(app)  # Allow cross-origin requests
 
-api = PatternTheoryAPI()
+# Reject oversized bodies before parsing (headroom for JSON escaping)
+app.config['MAX_CONTENT_LENGTH'] = BATCH_MAX_BYTES * 2
+
+# PATTERN_THEORY_CACHE_DB: SQLite result cache shared by every worker (optional)
+api = PatternTheoryAPI(cache_db=os.environ.get('PATTERN_THEORY_CACHE_DB'))
+
+# Processes per full-mode batch (per server worker). By default the CPUs
+# are split between the gunicorn workers (gunicorn.conf.py exports
+# PATTERN_THEORY_WORKERS) rather than each worker claiming all of them
+server_workers = int(os.environ.get('PATTERN_THEORY_WORKERS', 1))
+batch_workers = int(os.environ.get('PATTERN_THEORY_BATCH_WORKERS', max(1, BATCH_WORKERS // server_workers)))
+
+# PATTERN_THEORY_METRICS_DIR: where workers share metrics snapshots (set by gunicorn.conf.py)
+metrics = RequestMetrics(os.environ.get('PATTERN_THEORY_METRICS_DIR'))
+
+
+def use_cache(data) -> bool:
+    """False if the request opts out of the result cache."""
+    if data.get('cache') is False:
+        return False
+    return 'no-cache' not in request.headers.get('Cache-Control', '')
+
+
+def accepts_gzip() -> bool:
+    return request.accept_encodings['gzip'] > 0
+
+
+def gzip_lines(lines):
+    """Gzip a streamed body, flushing every GZIP_STREAM_FLUSH_BYTES so it keeps streaming."""
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip container
+    pending = 0
+    for line in lines:
+        data = line.encode('utf-8')
+        pending += len(data)
+        out = compressor.compress(data)
+        if pending >= GZIP_STREAM_FLUSH_BYTES:
+            out += compressor.flush(zlib.Z_SYNC_FLUSH)
+            pending = 0
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+@app.before_request
+def start_request_metrics():
+    g.metrics_route = request.url_rule.rule if request.url_rule else '<unmatched>'
+    g.metrics_started = metrics.start(g.metrics_route)
+
+
+@app.after_request
+def finish_request(response):
+    """Gzip large JSON responses and record metrics once the body is sent."""
+    if (not response.direct_passthrough
+            and not response.is_streamed
+            and 'Content-Encoding' not in response.headers
+            and response.content_length is not None
+            and response.content_length >= GZIP_MIN_BYTES
+            and accepts_gzip()):
+        response.set_data(gzip.compress(response.get_data(), GZIP_LEVEL))
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+
+    route = g.pop('metrics_route', None)
+    started = g.pop('metrics_started', None)
+    if route is not None:
+        # Streamed responses finish when the last chunk is sent, not here
+        response.call_on_close(lambda: metrics.finish(route, response.status_code, started))
+    return response
+
 
 @app.route('/health', methods=['GET'])
 def health():
@@ -39,21 +133,52 @@ def health():
         "status": "operational",
         "service": "Pattern Theory API",
         "version": "1.0.0",
-        "endpoints": ["/analyze", "/quick", "/score", "/domain", "/batch"]
+        "endpoints": ["/analyze", "/analyze/stream", "/quick", "/score", "/domain", "/batch", "/metrics"],
+        "cache": api.result_cache.get_stats()
     })
 
+@app.route('/metrics', methods=['GET'])
+def request_metrics():
+    """Request counts, latency percentiles and in-flight requests per route (all workers)."""
+    return jsonify(metrics.report())
+
 @app.route('/analyze', methods=['POST'])
 def analyze():
     """
     Full pattern theory analysis.
 
-    Body: { "text": "...", "context": "..." (optional) }
+    Body: { "text": "...", "context": "..." (optional), "cache": false (optional) }
     """
     data = request.get_json()
     if not data or 'text' not in data:
         return jsonify({"error": "Missing 'text' field"}), 400
 
-    result = api.analyze(data['text'], data.get('context'))
+    result = api.analyze(data['text'], data.get('context'), use_cache(data))
+    return jsonify(result)
+
+@app.route('/analyze/stream', methods=['POST'])
+def analyze_stream():
+    """
+    Full pattern theory analysis of a long document.
+
+    Body: the raw UTF-8 text (not JSON), read and analyzed in
+    sentence-aligned windows as it arrives, so multi-megabyte
+    transcripts never sit in memory whole.
+
+    Query: ?context=... (optional), ?timeline=true adds per-window scores
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    def chunks():
+        while True:
+            data = request.stream.read(STREAM_READ_BYTES)
+            if not data:
+                break
+            yield decoder.decode(data)
+        yield decoder.decode(b'', final=True)
+
+    timeline = request.args.get('timeline', '').lower() in ('1', 'true', 'yes')
+    result = api.analyze_stream(chunks(), request.args.get('context'), timeline)
     return jsonify(result)
 
 @app.route('/quick', methods=['POST'])
@@ -61,14 +186,14 @@ def quick():
     """
     Quick TRUTH/DECEIT check.
 
-    Body: { "text": "..." }
+    Body: { "text": "...", "cache": false (optional) }
     Returns: { "result": "TRUTH" | "DECEIT" | "NEUTRAL" }
     """
     data = request.get_json()
     if not data or 'text' not in data:
         return jsonify({"error": "Missing 'text' field"}), 400
 
-    result = api.quick_check(data['text'])
+    result = api.quick_check(data['text'], use_cache(data))
     return jsonify({"result": result, "text": data['text'][:100]})
 
 @app.route('/score', methods=['POST'])
@@ -119,7 +244,7 @@ def domain():
     if not 1 <= domain_num <= 7:
         return jsonify({"error": "Domain must be 1-7"}), 400
 
-    result = api.seven_domains_analysis(domain_num, data['text'])
+    result = api.seven_domains_analysis(domain_num, data['text'], use_cache(data))
     return jsonify(result)
 
 @app.route('/batch', methods=['POST'])
@@ -127,14 +252,47 @@ def batch():
     """
     Batch analysis.
 
-    Body: { "items": ["text1", "text2", ...] }
+    Body: {
+        "items": ["text1", {"text": "text2", "context": "..."}, ...],
+        "mode": "quick" (default) | "full",
+        "context": "..." (optional, default for every item),
+        "cache": false (optional)
+    }
+
+    quick: one JSON response with a TRUTH/DECEIT/NEUTRAL per item.
+    full:  pattern + consciousness + domains for every item, run across
+           worker processes and streamed back as NDJSON - one
+           {"type": "result", "index": N, ...} line per item as it
+           finishes, then a {"type": "summary", ...} line with totals
+           and timing.
     """
     data = request.get_json()
     if not data or 'items' not in data:
         return jsonify({"error": "Missing 'items' field"}), 400
 
-    result = api.batch_analyze(data['items'])
-    return jsonify(result)
+    mode = data.get('mode', 'quick')
+    if mode not in ('quick', 'full'):
+        return jsonify({"error": "Mode must be 'quick' or 'full'"}), 400
+
+    try:
+        if mode == 'quick':
+            return jsonify(api.batch_analyze(data['items'], use_cache(data)))
+        records = api.stream_batch(
+            data['items'], data.get('context'), workers=batch_workers, use_cache=use_cache(data)
+        )
+    except BatchLimitError as e:
+        return jsonify({"error": str(e)}), 413
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    lines = (json.dumps(record) + "\n" for record in records)
+    if not accepts_gzip():
+        return Response(stream_with_context(lines), mimetype='application/x-ndjson')
+
+    response = Response(stream_with_context(gzip_lines(lines)), mimetype='application/x-ndjson')
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
 
 
 if __name__ == '__main__':
@@ -143,13 +301,17 @@ if __name__ == '__main__':
     print("=" * 50)
     print("\nEndpoints:")
     print("  POST /analyze  - Full analysis")
+    print("  POST /analyze/stream - Full analysis of a long raw-text body")
     print("  POST /quick    - Quick truth/deceit check")
     print("  POST /score    - Consciousness scoring")
     print("  POST /domain   - Domain-specific analysis")
-    print("  POST /batch    - Batch analysis")
+    print("  POST /batch    - Batch analysis (mode=full streams NDJSON)")
     print("  GET  /health   - Health check")
+    print("  GET  /metrics  - Request metrics")
     print("\n" + "=" * 50)
-    print("Starting server on http://localhost:7778")
+    port = int(os.environ.get('PORT', 7778))
+    print(f"Starting development server on http://localhost:{port}")
+    print("Production: gunicorn -c gunicorn.conf.py wsgi:app")
     print("=" * 50 + "\n")
 
-    app.run(host='0.0.0.0', port=7778, debug=False)
+    app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
@@ -0,0 +1,15 @@
+"""
+PATTERN THEORY WSGI ENTRY POINT
+================================
+Production entry for the Pattern Theory API server.
+
+Run: gunicorn -c gunicorn.conf.py wsgi:app
+
+gunicorn.conf.py preloads this module in the master process, so the
+analyzers are built once before workers fork. Workers, threads,
+keep-alive and timeouts come from the environment (see gunicorn.conf.py).
+
+Created: 2025-11-22
+"""
+
+from server import app, api  # noqa: F401 - api: preloaded analyzers
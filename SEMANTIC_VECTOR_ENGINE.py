@@ -21,35 +21,248 @@ Usage:
 import os
 import sys
 import json
+import time
+import queue
+import hashlib
 import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
 from pathlib import Path
 from datetime import datetime
 
-# Check for required packages
-try:
-    from sentence_transformers import SentenceTransformer
-    import chromadb
-    from chromadb.config import Settings
-except ImportError:
-    print("Installing required packages...")
-    os.system("pip install sentence-transformers chromadb")
-    from sentence_transformers import SentenceTransformer
-    import chromadb
-    from chromadb.config import Settings
+# Heavy dependencies are imported on first use (see load_dependencies) so
+# importing this module - e.g. from CYCLOTRON_SEMANTIC_API - stays fast.
+SentenceTransformer = None
+chromadb = None
+Settings = None
+np = None
+_deps_lock = threading.Lock()
+
+
+def load_dependencies():
+    """Import sentence-transformers, chromadb and numpy once, installing if missing"""
+    global SentenceTransformer, chromadb, Settings, np
+
+    with _deps_lock:
+        if SentenceTransformer is not None:
+            return
+
+        try:
+            from sentence_transformers import SentenceTransformer as _SentenceTransformer
+            import chromadb as _chromadb
+            from chromadb.config import Settings as _Settings
+            import numpy as _np
+        except ImportError:
+            print("Installing required packages...")
+            os.system("pip install sentence-transformers chromadb")
+            from sentence_transformers import SentenceTransformer as _SentenceTransformer
+            import chromadb as _chromadb
+            from chromadb.config import Settings as _Settings
+            import numpy as _np
+
+        chromadb = _chromadb
+        Settings = _Settings
+        np = _np
+        SentenceTransformer = _SentenceTransformer
+
 
 # Configuration
 CYCLOTRON_DB = Path("C:/Users/dwrek/100X_DEPLOYMENT/.cyclotron_atoms/cyclotron.db")
 CHROMA_DIR = Path("C:/Users/dwrek/100X_DEPLOYMENT/.cyclotron_atoms/chroma")
+VECTOR_STATE_DB = Path("C:/Users/dwrek/100X_DEPLOYMENT/.cyclotron_atoms/vector_state.db")
 MODEL_NAME = "all-MiniLM-L6-v2"  # Fast, 384-dim embeddings
-BATCH_SIZE = 100
+BATCH_SIZE = 100  # FTS rows fetched per page while indexing
+ENCODE_BATCH_SIZE = 32  # Chunks per forward pass in model.encode
 MAX_CHUNK_SIZE = 1000  # Characters per chunk for embedding
 
+# Query embedding cache and micro-batching
+QUERY_CACHE_DB = Path("C:/Users/dwrek/100X_DEPLOYMENT/.cyclotron_atoms/query_embeddings.db")
+QUERY_CACHE_MEMORY_SIZE = 2048   # Embeddings kept in the in-process LRU
+QUERY_CACHE_DISK_SIZE = 100000   # Rows kept in the on-disk cache
+QUERY_BATCH_WINDOW_MS = 5        # How long to wait for concurrent queries to join a batch
+QUERY_BATCH_MAX = 64             # Max queries per model.encode call
+
+
+def normalize_query(text):
+    """Collapse whitespace so trivially different queries share a cache entry"""
+    return ' '.join(text.split())
+
+
+class QueryEmbeddingCache:
+    """
+    Two-tier cache of query embeddings keyed by (model, normalized text).
+
+    L1 is an in-memory LRU; L2 is a small SQLite table that survives
+    restarts and is shared between processes. Embeddings are stored as
+    float32 bytes.
+    """
+
+    def __init__(self, model_name, db_path=QUERY_CACHE_DB,
+                 memory_size=QUERY_CACHE_MEMORY_SIZE, disk_size=QUERY_CACHE_DISK_SIZE):
+        self.model_name = model_name
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+        self.inserts_since_prune = 0
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS query_embeddings (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                embedding BLOB,
+                last_used REAL
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_query_embeddings_used ON query_embeddings(last_used)')
+        self.conn.commit()
+
+    def key(self, text):
+        return hashlib.sha1(f"{self.model_name}\0{normalize_query(text)}".encode()).hexdigest()
+
+    def get(self, text):
+        """Cached embedding for text, or None"""
+        key = self.key(text)
+
+        with self.lock:
+            embedding = self.memory.get(key)
+            if embedding is not None:
+                self.memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return embedding
+
+            row = self.conn.execute(
+                'SELECT embedding FROM query_embeddings WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+
+            self.conn.execute('UPDATE query_embeddings SET last_used = ? WHERE key = ?', (time.time(), key))
+            self.conn.commit()
+            embedding = np.frombuffer(row[0], dtype=np.float32)
+            self.stats['disk_hits'] += 1
+            self._remember(key, embedding)
+            return embedding
+
+    def put(self, text, embedding):
+        """Store an embedding in both tiers"""
+        key = self.key(text)
+        embedding = np.asarray(embedding, dtype=np.float32)
+
+        with self.lock:
+            self._remember(key, embedding)
+            self.conn.execute(
+                'INSERT OR REPLACE INTO query_embeddings (key, model, embedding, last_used) VALUES (?, ?, ?, ?)',
+                (key, self.model_name, embedding.tobytes(), time.time())
+            )
+            self.inserts_since_prune += 1
+            if self.inserts_since_prune >= 1000:
+                self._prune_disk()
+            self.conn.commit()
+
+    def _remember(self, key, embedding):
+        self.memory[key] = embedding
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+
+    def _prune_disk(self):
+        """Drop least recently used rows beyond disk_size"""
+        self.inserts_since_prune = 0
+        self.conn.execute('''
+            DELETE FROM query_embeddings WHERE key IN (
+                SELECT key FROM query_embeddings ORDER BY last_used DESC LIMIT -1 OFFSET ?
+            )
+        ''', (self.disk_size,))
+
+    def get_stats(self):
+        with self.lock:
+            hits = self.stats['memory_hits'] + self.stats['disk_hits']
+            lookups = hits + self.stats['misses']
+            return {
+                **self.stats,
+                'hit_rate': round(hits / lookups, 3) if lookups else 0.0,
+                'memory_entries': len(self.memory)
+            }
+
+
+class EncodeBatcher:
+    """
+    Groups concurrent encode requests into one model.encode call.
+
+    Callers block on a Future; a single background thread waits up to
+    window_ms after the first request for others to arrive, then encodes
+    them together.
+    """
+
+    def __init__(self, model, window_ms=QUERY_BATCH_WINDOW_MS, max_batch=QUERY_BATCH_MAX):
+        self.model = model
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.requests = queue.Queue()
+        self.lock = threading.Lock()
+        self.stats = {'batches': 0, 'queries': 0, 'max_batch_size': 0}
+        self.thread = threading.Thread(target=self._run, daemon=True, name='semantic-encode-batcher')
+        self.thread.start()
+
+    def encode(self, text):
+        """Embedding for one text, possibly computed alongside other callers"""
+        future = Future()
+        self.requests.put((text, future))
+        return future.result()
+
+    def _run(self):
+        while True:
+            batch = [self.requests.get()]
+            deadline = time.time() + self.window
+
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.requests.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            # Concurrent misses for the same text are encoded once
+            texts = list(dict.fromkeys(text for text, _ in batch))
+            try:
+                encoded = self.model.encode(texts, convert_to_numpy=True)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            by_text = dict(zip(texts, encoded))
+
+            with self.lock:
+                self.stats['batches'] += 1
+                self.stats['queries'] += len(batch)
+                self.stats['max_batch_size'] = max(self.stats['max_batch_size'], len(batch))
+
+            for text, future in batch:
+                future.set_result(by_text[text])
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                **self.stats,
+                'avg_batch_size': round(self.stats['queries'] / self.stats['batches'], 2) if self.stats['batches'] else 0.0
+            }
+
 
 class SemanticVectorEngine:
     """Semantic search layer for Cyclotron"""
 
     def __init__(self):
         print("Initializing Semantic Vector Engine...")
+        load_dependencies()
 
         # Load embedding model
         print(f"Loading model: {MODEL_NAME}")
@@ -69,7 +282,23 @@ class SemanticVectorEngine:
         )
 
         # Connect to Cyclotron FTS database
-        self.fts_conn = sqlite3.connect(str(CYCLOTRON_DB))
+        self.fts_conn = sqlite3.connect(str(CYCLOTRON_DB), check_same_thread=False)
+
+        # Per-file record of the FTS hash and chunk count behind the vectors
+        self.state_conn = sqlite3.connect(str(VECTOR_STATE_DB), check_same_thread=False)
+        self.state_conn.execute('''
+            CREATE TABLE IF NOT EXISTS vector_state (
+                path TEXT PRIMARY KEY,
+                hash TEXT,
+                chunks INTEGER,
+                seen_run INTEGER
+            )
+        ''')
+        self.state_conn.commit()
+
+        # Query embeddings: cached by text, encoded in micro-batches on a miss
+        self.query_cache = QueryEmbeddingCache(MODEL_NAME)
+        self.batcher = EncodeBatcher(self.model)
 
         print(f"Engine ready. Collection has {self.collection.count()} embeddings.")
 
@@ -95,75 +324,192 @@ class SemanticVectorEngine:
 
         return chunks if chunks else [text[:chunk_size]]
 
-    def index_all(self):
-        """Index all files from Cyclotron FTS into vector store"""
+    def index_all(self, page_size=BATCH_SIZE, encode_batch_size=ENCODE_BATCH_SIZE):
+        """
+        Bring the vector store in line with Cyclotron FTS.
+
+        Streams the FTS table page_size rows at a time and compares each
+        file's FTS hash with vector_state. Only files whose hash changed
+        are re-chunked, encoded with model.encode(batch_size=
+        encode_batch_size) and upserted. Surplus chunks from files that
+        shrank are deleted, and chunks for paths no longer in FTS are
+        purged at the end. Memory is bounded by one page, so this is
+        cheap enough to run on a schedule.
+        """
         print("Starting semantic indexing...")
 
-        # Get all files from FTS
         cursor = self.fts_conn.cursor()
-        cursor.execute("SELECT path, name, content FROM knowledge")
-        rows = cursor.fetchall()
-
-        total = len(rows)
+        cursor.execute("SELECT COUNT(*) FROM documents")
+        total = cursor.fetchone()[0]
         print(f"Found {total} files to index")
 
-        # Process in batches
-        indexed = 0
-        skipped = 0
+        state = self.state_conn.cursor()
+        state.execute("SELECT COALESCE(MAX(seen_run), 0) + 1 FROM vector_state")
+        run_id = state.fetchone()[0]
+
+        # Vectors written before vector_state existed have unknown chunk counts
+        legacy = self.collection.count() > 0 and not state.execute(
+            "SELECT EXISTS (SELECT 1 FROM vector_state)"
+        ).fetchone()[0]
 
-        for i in range(0, total, BATCH_SIZE):
-            batch = rows[i:i+BATCH_SIZE]
+        # Stream files from FTS page by page
+        cursor.execute("SELECT path, name, content, hash FROM documents")
+
+        counts = {'changed': 0, 'unchanged': 0, 'skipped': 0, 'purged': 0,
+                  'chunks_embedded': 0, 'chunks_deleted': 0}
+        processed = 0
+
+        while True:
+            batch = cursor.fetchmany(page_size)
+            if not batch:
+                break
+            processed += len(batch)
+
+            paths = [row[0] for row in batch]
+            placeholders = ','.join('?' * len(paths))
+            state.execute(
+                f"SELECT path, hash, chunks FROM vector_state WHERE path IN ({placeholders})", paths
+            )
+            known = {row[0]: (row[1], row[2]) for row in state.fetchall()}
 
             ids = []
             documents = []
             metadatas = []
+            stale_ids = []
+            state_rows = []
 
-            for path, name, content in batch:
-                if not content or len(content.strip()) < 50:
-                    skipped += 1
+            for path, name, content, file_hash in batch:
+                file_hash = file_hash or hashlib.md5((content or '').encode()).hexdigest()
+                previous = known.get(path)
+
+                if previous and previous[0] == file_hash:
+                    counts['unchanged'] += 1
+                    state_rows.append((path, file_hash, previous[1], run_id))
                     continue
 
-                # Create chunks
-                chunks = self.chunk_text(content)
+                if not content or len(content.strip()) < 50:
+                    chunks = []
+                    counts['skipped'] += 1
+                else:
+                    chunks = self.chunk_text(content)
+                    counts['changed'] += 1
 
                 for j, chunk in enumerate(chunks):
-                    chunk_id = f"{path}_{j}"
-
-                    # Skip if already indexed
-                    try:
-                        existing = self.collection.get(ids=[chunk_id])
-                        if existing['ids']:
-                            continue
-                    except:
-                        pass
-
-                    ids.append(chunk_id)
+                    ids.append(f"{path}_{j}")
                     documents.append(chunk)
                     metadatas.append({
                         "path": path,
                         "name": name,
                         "chunk": j,
-                        "total_chunks": len(chunks)
+                        "total_chunks": len(chunks),
+                        "hash": file_hash
                     })
 
+                # Drop chunks beyond the new length
+                if previous:
+                    stale_ids.extend(f"{path}_{j}" for j in range(len(chunks), previous[1]))
+                elif legacy:
+                    self.collection.delete(where={"$and": [
+                        {"path": path}, {"chunk": {"$gte": len(chunks)}}
+                    ]})
+
+                state_rows.append((path, file_hash, len(chunks), run_id))
+
+            if stale_ids:
+                self.collection.delete(ids=stale_ids)
+                counts['chunks_deleted'] += len(stale_ids)
+
             if ids:
-                # Generate embeddings and add to collection
-                self.collection.add(
+                embeddings = self.model.encode(
+                    documents,
+                    batch_size=encode_batch_size,
+                    convert_to_numpy=True
+                )
+                self.collection.upsert(
                     ids=ids,
                     documents=documents,
-                    metadatas=metadatas
+                    metadatas=metadatas,
+                    embeddings=embeddings.tolist()
                 )
-                indexed += len(ids)
-
-            print(f"Progress: {min(i+BATCH_SIZE, total)}/{total} files processed, {indexed} chunks indexed")
-
-        print(f"\nIndexing complete: {indexed} chunks indexed, {skipped} skipped")
-        return indexed
+                counts['chunks_embedded'] += len(ids)
+
+            state.executemany(
+                "INSERT OR REPLACE INTO vector_state (path, hash, chunks, seen_run) VALUES (?, ?, ?, ?)",
+                state_rows
+            )
+            self.state_conn.commit()
+
+            print(f"Progress: {processed}/{total} files processed, {counts['chunks_embedded']} chunks indexed")
+
+        # Purge vectors for paths that left the FTS table
+        state.execute("SELECT path, chunks FROM vector_state WHERE seen_run != ?", (run_id,))
+        for path, n_chunks in state.fetchall():
+            if n_chunks:
+                self.collection.delete(ids=[f"{path}_{j}" for j in range(n_chunks)])
+                counts['chunks_deleted'] += n_chunks
+            counts['purged'] += 1
+        state.execute("DELETE FROM vector_state WHERE seen_run != ?", (run_id,))
+        self.state_conn.commit()
+
+        # vector_state can't name files deleted before it existed - find
+        # those from the collection's own path metadata
+        if legacy:
+            purged, deleted = self._purge_legacy_paths(page_size)
+            counts['purged'] += purged
+            counts['chunks_deleted'] += deleted
+
+        print(f"\nIndexing complete: {counts['chunks_embedded']} chunks indexed "
+              f"({counts['changed']} files changed, {counts['unchanged']} unchanged, "
+              f"{counts['skipped']} skipped, {counts['purged']} purged, "
+              f"{counts['chunks_deleted']} stale chunks deleted)")
+        return counts['chunks_embedded']
+
+    def _purge_legacy_paths(self, page_size=BATCH_SIZE):
+        """
+        Delete chunks whose path is no longer in the FTS documents table,
+        paging through the collection's metadata. Returns (paths, chunks)
+        removed.
+        """
+        stale = {}
+        offset = 0
+        while True:
+            page = self.collection.get(include=['metadatas'], limit=page_size, offset=offset)
+            if not page['ids']:
+                break
+            offset += len(page['ids'])
+
+            page_paths = {meta.get('path') for meta in page['metadatas'] if meta}
+            page_paths.discard(None)
+            if not page_paths:
+                continue
+            placeholders = ','.join('?' * len(page_paths))
+            indexed = {row[0] for row in self.fts_conn.execute(
+                f"SELECT path FROM documents WHERE path IN ({placeholders})", list(page_paths)
+            )}
+            for chunk_id, meta in zip(page['ids'], page['metadatas']):
+                path = meta.get('path') if meta else None
+                if path is not None and path not in indexed:
+                    stale.setdefault(path, []).append(chunk_id)
+
+        # Delete after paging so offsets don't shift under the scan
+        deleted = 0
+        for chunk_ids in stale.values():
+            self.collection.delete(ids=chunk_ids)
+            deleted += len(chunk_ids)
+        return len(stale), deleted
+
+    def embed_query(self, text):
+        """Embedding for a query, from cache or a batched model.encode"""
+        embedding = self.query_cache.get(text)
+        if embedding is None:
+            embedding = self.batcher.encode(normalize_query(text))
+            self.query_cache.put(text, embedding)
+        return embedding
 
     def search(self, query, n_results=10):
         """Semantic search - find files by meaning"""
         results = self.collection.query(
-            query_texts=[query],
+            query_embeddings=[self.embed_query(query).tolist()],
             n_results=n_results,
             include=["documents", "metadatas", "distances"]
         )
@@ -192,7 +538,7 @@ class SemanticVectorEngine:
         """Find files similar to a given file"""
         # Get content from FTS
         cursor = self.fts_conn.cursor()
-        cursor.execute("SELECT content FROM knowledge WHERE path = ?", (file_path,))
+        cursor.execute("SELECT content FROM documents WHERE path = ?", (file_path,))
         row = cursor.fetchone()
 
         if not row:
@@ -210,6 +556,10 @@ class SemanticVectorEngine:
 
         return results[:n_results]
 
+    def warm_up(self):
+        """Run one throwaway encode so the first real query doesn't pay for lazy model init"""
+        self.model.encode(["warm up"], convert_to_numpy=True)
+
     def get_stats(self):
         """Get engine statistics"""
         # Chroma stats
@@ -217,7 +567,7 @@ class SemanticVectorEngine:
 
         # FTS stats
         cursor = self.fts_conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM knowledge")
+        cursor.execute("SELECT COUNT(*) FROM documents")
         fts_count = cursor.fetchone()[0]
 
         return {
@@ -225,7 +575,9 @@ class SemanticVectorEngine:
             'fts_files': fts_count,
             'model': MODEL_NAME,
             'chroma_dir': str(CHROMA_DIR),
-            'coverage': f"{(chroma_count / max(fts_count, 1) * 100):.1f}%" if fts_count else "0%"
+            'coverage': f"{(chroma_count / max(fts_count, 1) * 100):.1f}%" if fts_count else "0%",
+            'query_cache': self.query_cache.get_stats(),
+            'query_batching': self.batcher.get_stats()
         }
 
     def cluster_concepts(self, n_clusters=7):